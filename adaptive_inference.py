@@ -0,0 +1,93 @@
+"""
+Yüke Göre Uyarlanan Çıkarım Çözünürlüğü
+Ölçülen gecikmeye ve frame başına süre bütçesine göre YOLO giriş boyutunu
+yapılandırılmış seviyeler arasında değiştirir; her seviyenin kendi confidence eşiği vardır.
+"""
+
+from collections import deque
+import numpy as np
+
+# Düşük çözünürlükte nesneler daha küçük görünür ve skorlar düşer - eşik de düşürülür
+DEFAULT_LEVELS = (
+    {'imgsz': 320, 'conf': 0.35, 'plate_conf': 0.20},
+    {'imgsz': 480, 'conf': 0.45, 'plate_conf': 0.25},
+    {'imgsz': 640, 'conf': 0.50, 'plate_conf': 0.30},
+)
+
+class AdaptiveInferenceController:
+    """Gecikme bütçesine göre çıkarım seviyesi seçici"""
+
+    def __init__(self, levels=DEFAULT_LEVELS, budget_ms=120.0, smoothing=0.3,
+                 upgrade_ratio=0.6, cooldown=5, history_size=100):
+        self.levels = sorted(levels, key=lambda level: level['imgsz'])
+        self.budget_ms = budget_ms
+        self.smoothing = smoothing  # EMA katsayısı
+        self.upgrade_ratio = upgrade_ratio  # Tahmini gecikme bütçenin bu oranının altındaysa yüksel
+        self.cooldown = cooldown  # İki seviye değişimi arasındaki minimum ölçüm sayısı
+
+        self.level_index = len(self.levels) - 1  # En yüksek kaliteden başla
+        self.ema_ms = [None] * len(self.levels)
+        self.recent_ms = deque(maxlen=history_size)
+        self.samples_since_switch = 0
+        self.switches = 0
+        self.level_counts = [0] * len(self.levels)
+
+    def current(self):
+        """
+        Şu anki seviye: {'imgsz', 'conf', 'plate_conf'}
+        """
+        return self.levels[self.level_index]
+
+    def record(self, latency_ms):
+        """
+        Bir çıkarımın (frame başına) gecikmesini kaydet ve gerekirse seviye değiştir
+        """
+        index = self.level_index
+        previous = self.ema_ms[index]
+        self.ema_ms[index] = latency_ms if previous is None else (
+            self.smoothing * latency_ms + (1 - self.smoothing) * previous)
+
+        self.recent_ms.append(latency_ms)
+        self.level_counts[index] += 1
+        self.samples_since_switch += 1
+
+        if self.samples_since_switch < self.cooldown:
+            return
+
+        ema = self.ema_ms[index]
+        if ema > self.budget_ms and index > 0:
+            self._switch(index - 1)
+        elif index < len(self.levels) - 1:
+            # Üst seviyenin gecikmesini piksel sayısı oranıyla tahmin et; eski ölçüm yük
+            # azaldıktan sonra yükselmeyi engellemesin diye ikisinin küçüğü alınır
+            next_level = self.levels[index + 1]
+            estimate = ema * (next_level['imgsz'] / self.levels[index]['imgsz']) ** 2
+            if self.ema_ms[index + 1] is not None:
+                estimate = min(estimate, self.ema_ms[index + 1])
+            if estimate < self.budget_ms * self.upgrade_ratio:
+                self._switch(index + 1)
+
+    def _switch(self, new_index):
+        old_imgsz = self.levels[self.level_index]['imgsz']
+        self.level_index = new_index
+        self.samples_since_switch = 0
+        self.switches += 1
+        print(f"⚖️ Çıkarım seviyesi: {old_imgsz}px → {self.levels[new_index]['imgsz']}px "
+              f"(bütçe {self.budget_ms:.0f} ms)")
+
+    def get_stats(self):
+        """
+        Seçilen seviyeler ve gözlenen gecikme istatistikleri
+        """
+        recent = np.array(self.recent_ms) if self.recent_ms else None
+        return {
+            'imgsz': self.current()['imgsz'],
+            'conf': self.current()['conf'],
+            'budget_ms': self.budget_ms,
+            'latency_ema_ms': {level['imgsz']: (round(ema, 1) if ema is not None else None)
+                               for level, ema in zip(self.levels, self.ema_ms)},
+            'latency_p50_ms': round(float(np.percentile(recent, 50)), 1) if recent is not None else None,
+            'latency_p95_ms': round(float(np.percentile(recent, 95)), 1) if recent is not None else None,
+            'level_counts': {level['imgsz']: count for level, count in zip(self.levels, self.level_counts)},
+            'switches': self.switches
+        }
@@ -0,0 +1,152 @@
+"""
+Garson Rozetleri için Fiducial Marker (ArUco) Modu
+Garson kartları QR yerine cv2.aruco marker'ı olabilir: marker'lar gri görüntüde tek ve
+rotasyondan bağımsız bir geçişte bulunur, köşeler alt piksel hassasiyetinde ve yönelim
+ölçülür, küçük boyut ve hareket bulanıklığında QR'dan kararlıdır. Marker ID'si
+"aruco:<id>" içeriği olarak QRRegistry'den garsona çevrilir; masalar QR kodlarını korur.
+
+Rozet modunda QR kaskadı varsayılan olarak rotasyon geçişleri olmadan çalışır (eğik
+garson kartları için gerekiyorlardı; masa kodları düz durur).
+"""
+
+import argparse
+import math
+import os
+import time
+from collections import namedtuple
+import cv2
+import numpy as np
+from qr_cascade import to_gray
+
+BADGE_MODES = ('qr', 'aruco')
+MARKER_PREFIX = 'aruco:'
+DEFAULT_DICTIONARY = 'DICT_4X4_50'
+
+# corners: (4, 2) alt piksel köşeler (sol üst, sağ üst, sağ alt, sol alt)
+# orientation: üst kenarın saat yönü tersine açısı, derece [0, 360)
+BadgeMarker = namedtuple('BadgeMarker', ['data', 'marker_id', 'corners', 'center', 'orientation'])
+
+def marker_payload(marker_id):
+    """
+    Marker ID'sinin registry içeriği ("aruco:7")
+    """
+    return f"{MARKER_PREFIX}{int(marker_id)}"
+
+def marker_dictionary(name):
+    """
+    cv2.aruco ön tanımlı sözlüğü (ör. DICT_4X4_50) - bilinmeyen isimde ValueError
+    """
+    if not name.startswith('DICT_') or not hasattr(cv2.aruco, name):
+        raise ValueError(f"Bilinmeyen ArUco sözlüğü: {name} (ör. DICT_4X4_50, DICT_5X5_100, DICT_APRILTAG_36h11)")
+    return cv2.aruco.getPredefinedDictionary(getattr(cv2.aruco, name))
+
+class BadgeMarkerDetector:
+    """Frame'deki garson rozeti marker'larını tek geçişte bulur"""
+
+    def __init__(self, dictionary=DEFAULT_DICTIONARY, subpixel=True):
+        self.dictionary_name = dictionary
+        self.dictionary = marker_dictionary(dictionary)
+
+        parameters = cv2.aruco.DetectorParameters()
+        if subpixel:
+            parameters.cornerRefinementMethod = cv2.aruco.CORNER_REFINE_SUBPIX
+        self.detector = cv2.aruco.ArucoDetector(self.dictionary, parameters)
+
+    def detect(self, frame):
+        """
+        Marker'ları bul - BadgeMarker listesi (frame koordinatlarında)
+        """
+        corners, ids, _ = self.detector.detectMarkers(to_gray(frame))
+        if ids is None:
+            return []
+
+        markers = []
+        for marker_corners, marker_id in zip(corners, ids.ravel()):
+            points = marker_corners.reshape(4, 2)
+            center = points.mean(axis=0)
+            dx, dy = points[1] - points[0]
+            orientation = math.degrees(math.atan2(-dy, dx)) % 360.0  # Görüntüde y aşağı doğru
+            markers.append(BadgeMarker(marker_payload(marker_id), int(marker_id), points,
+                                       (float(center[0]), float(center[1])), orientation))
+        return markers
+
+def render_badge(marker_id, size=240, dictionary=DEFAULT_DICTIONARY, margin=0.125):
+    """
+    Yazdırılabilir rozet görüntüsü (beyaz kenar boşluklu marker, BGR)
+    """
+    inner = int(size * (1 - 2 * margin))
+    marker = cv2.aruco.generateImageMarker(marker_dictionary(dictionary), int(marker_id), inner)
+    badge = np.full((size, size), 255, dtype=np.uint8)
+    offset = (size - inner) // 2
+    badge[offset:offset + inner, offset:offset + inner] = marker
+    return cv2.cvtColor(badge, cv2.COLOR_GRAY2BGR)
+
+def write_badges(directory, marker_ids, size=600, dictionary=DEFAULT_DICTIONARY):
+    """
+    Rozetleri PNG olarak yaz (badge_<id>.png) - yazılan dosya yolları
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for marker_id in marker_ids:
+        path = os.path.join(directory, f"badge_{int(marker_id)}.png")
+        cv2.imwrite(path, render_badge(marker_id, size, dictionary))
+        paths.append(path)
+    return paths
+
+# Test fonksiyonu
+def test_badge_markers(size=64, angles=range(0, 360, 30)):
+    """
+    Eğik ve küçük rozetlerin tespiti ve yönelim hatası; QR kaskadı ile süre karşılaştırması
+    """
+    from qr_cascade import QR_VARIANTS, VARIANT_ROTATIONS, rotate_image, iter_variant_images
+    from qr_decoders import create_decoder
+    from video_sources import SyntheticRestaurantSource
+
+    detector = BadgeMarkerDetector()
+    badge = render_badge(7, size)
+
+    print(f"🧪 Rozet tespiti ({size}px, {DEFAULT_DICTIONARY}):")
+    for angle in angles:
+        frame = np.full((320, 320, 3), (70, 90, 110), dtype=np.uint8)
+        frame[128:128 + size, 128:128 + size] = badge
+        frame = rotate_image(frame, angle)
+        markers = detector.detect(frame)
+        if markers:
+            error = (markers[0].orientation - angle + 180) % 360 - 180
+            print(f"   {angle:3d}°: {markers[0].data} bulundu, yönelim hatası {error:+.2f}°")
+        else:
+            print(f"   {angle:3d}°: ❌ bulunamadı")
+
+    # Aynı sahne: QR rozetli tam kaskad vs marker rozetli rotasyonsuz kaskad + tek marker geçişi
+    decoder = create_decoder('opencv')
+    straight = [variant for variant in QR_VARIANTS if variant not in VARIANT_ROTATIONS]
+    for badges, variants in (('qr', QR_VARIANTS), ('aruco', straight)):
+        source = SyntheticRestaurantSource(duration=20, badges=badges)
+        frames = [source._frame(index) for index in range(0, 300, 15)]
+        start = time.perf_counter()
+        found = 0
+        for index, frame in zip(range(0, 300, 15), frames):
+            payloads = set()
+            for _, image, _ in iter_variant_images(frame, variants):
+                payloads.update(obj.data.decode('utf-8') for obj in decoder.decode(image))
+            if badges == 'aruco':
+                payloads.update(marker.data for marker in detector.detect(frame))
+            found += len(payloads & source.visible_codes(index))
+        elapsed = (time.perf_counter() - start) / len(frames) * 1000
+        total = sum(len(source.visible_codes(index)) for index in range(0, 300, 15))
+        print(f"   {badges:>5} rozet: {'+'.join(variants)}{' + marker' if badges == 'aruco' else ''} - "
+              f"{elapsed:.1f} ms/frame, {found}/{total} kod")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ArUco garson rozetleri: yazdırma ve tespit testi")
+    parser.add_argument("--write", metavar="KLASÖR", help="Rozet PNG'lerini yaz (verilmezse test çalışır)")
+    parser.add_argument("--ids", type=int, nargs='+', default=[1, 2], help="Marker ID'leri (registry: aruco:<id>)")
+    parser.add_argument("--size", type=int, default=600, help="Rozet boyutu, piksel")
+    parser.add_argument("--dictionary", default=DEFAULT_DICTIONARY)
+    args = parser.parse_args()
+
+    if args.write:
+        for path in write_badges(args.write, args.ids, args.size, args.dictionary):
+            print(f"💾 {path}")
+    else:
+        test_badge_markers()
@@ -0,0 +1,232 @@
+"""
+Tespit Kaydı Bellek Benchmark'ı
+Bir frame'in QR kaskadı (7 geçiş), garson ve masa bazlı yemek tespitlerini eski sözlük
+gösterimiyle (datetime.now() damgalı) ve detections.py kayıtlarıyla üretir; frame başına
+bellek tepe noktasını, tutulan tespitlerin kalıcı belleğini, süreyi ve GC toplama
+sayısını karşılaştırır
+
+Sözlük yolu eski kodun dondurulmuş kopyasıdır; kayıt yolu gerçek
+QRCodeDetector._process_decoded_objects / _remove_duplicate_qr_codes / detect_waiters ve
+YOLOFoodDetector._parse_food_detections fonksiyonlarını çalıştırır
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime
+from functools import partial
+import numpy as np
+from main import QRCodeDetector
+from yolo_food_detector import YOLOFoodDetector
+from qr_registry import QRRegistry, WAITER
+
+# pyzbar Decoded nesnesinin kullanılan alanları
+Point = namedtuple('Point', ['x', 'y'])
+Decoded = namedtuple('Decoded', ['data', 'polygon'])
+
+FOOD_CATEGORIES = {
+    52: {'name': 'Muz', 'price': 5.0, 'color': (0, 255, 255), 'category': 'banana'},
+    54: {'name': 'Sandviç', 'price': 25.0, 'color': (255, 255, 0), 'category': 'sandwich'},
+    58: {'name': 'Pizza', 'price': 45.0, 'color': (255, 0, 0), 'category': 'pizza'},
+    45: {'name': 'Kase', 'price': 0.0, 'color': (255, 0, 0), 'category': 'bowl'}
+}
+
+def make_frame_inputs(rng, tables=4, foods_per_table=6):
+    """
+    Bir frame'in ham çıktıları: pyzbar sonuçları (4 masa + 2 garson) ve masa başına backend dizisi
+    """
+    decoded = []
+    for index, payload in enumerate([b'MASA_1', b'MASA_2', b'MASA_3', b'MASA_4', b'w001', b'g002']):
+        x, y = 100 + index * 150 + int(rng.integers(0, 5)), 200 + int(rng.integers(0, 5))
+        decoded.append(Decoded(payload, [Point(x, y), Point(x + 60, y), Point(x + 60, y + 60), Point(x, y + 60)]))
+
+    class_ids = np.array(list(FOOD_CATEGORIES), dtype=np.float32)
+    food_arrays = []
+    for _ in range(tables):
+        boxes = rng.uniform(0, 300, (foods_per_table, 2)).astype(np.float32)
+        detections = np.column_stack([boxes, boxes + 80, rng.uniform(0.3, 0.9, foods_per_table),
+                                      rng.choice(class_ids, foods_per_table)]).astype(np.float32)
+        food_arrays.append(detections)
+
+    return decoded, food_arrays
+
+# --- Eski sözlük gösterimi (dondurulmuş kopya, değiştirmeyin) ---
+
+def _qr_boxes(decoded):
+    for obj in decoded:
+        points = obj.polygon
+        x = min([p.x for p in points])
+        y = min([p.y for p in points])
+        w = max([p.x for p in points]) - x
+        h = max([p.y for p in points]) - y
+        yield obj, x, y, w, h
+
+def _foods(detections):
+    for x1, y1, x2, y2, confidence, class_id in detections:
+        class_id = int(class_id)
+        if class_id in FOOD_CATEGORIES:
+            x, y, w, h = int(x1), int(y1), int(x2-x1), int(y2-y1)
+            yield class_id, FOOD_CATEGORIES[class_id], x, y, w, h, confidence
+
+def frame_with_dicts(registry, decoded, food_arrays, passes=7):
+    """
+    Eski gösterim: her tespit datetime.now() damgalı sözlük
+    """
+    qr_codes = []
+    for rotation in [0, 0, 0, 0, 90, 180, 270][:passes]:
+        for obj, x, y, w, h in _qr_boxes(decoded):
+            qr_codes.append({
+                'data': obj.data.decode('utf-8'),
+                'record': registry.lookup(obj.data),
+                'bbox': (x, y, w, h),
+                'center': (x + w//2, y + h//2),
+                'rotation': rotation,
+                'confidence': 1.0,
+                'timestamp': datetime.now()
+            })
+
+    unique, seen = [], set()
+    for qr in sorted(qr_codes, key=lambda x: x.get('confidence', 0), reverse=True):
+        if qr['data'] not in seen:
+            unique.append(qr)
+            seen.add(qr['data'])
+
+    waiters = [{'waiter_id': qr['record'].entity_id, 'original_id': qr['data'],
+                'position': qr['center'], 'timestamp': qr['timestamp']}
+               for qr in unique if qr['record'] is not None and qr['record'].kind == WAITER]
+
+    foods = {}
+    for table_index, detections in enumerate(food_arrays):
+        items = []
+        for class_id, info, x, y, w, h, confidence in _foods(detections):
+            item = {
+                'category': info['category'],
+                'class_id': class_id,
+                'bbox': (x, y, w, h),
+                'center': (x + w//2, y + h//2),
+                'area': w * h,
+                'confidence': float(confidence),
+                'name': info['name'],
+                'price': info['price'],
+                'color': info['color'],
+                'timestamp': datetime.now()
+            }
+            item['table_id'] = f"MASA_{table_index + 1}"
+            items.append(item)
+        foods[f"MASA_{table_index + 1}"] = [food for food in items if food['price'] != 0.0]
+
+    return unique, waiters, foods
+
+def create_detectors(registry):
+    """
+    Kayıt yolu için gerçek QR ve yemek detector'ları (model yüklenmez, QR çözücü kullanılmaz)
+    """
+    food_detector = YOLOFoodDetector(with_model=False)
+    food_detector.food_categories = FOOD_CATEGORIES
+    qr_detector = QRCodeDetector(food_detector=food_detector, qr_registry=registry, qr_decoder='opencv')
+    return qr_detector, food_detector
+
+def frame_with_records(qr_detector, food_detector, decoded, food_arrays, passes=7):
+    """
+    Yeni gösterim: main.py/yolo_food_detector.py'nin kayıt üreten fonksiyonları,
+    frame başına tek monotonic_ns damgası
+    """
+    timestamp = time.monotonic_ns()
+    qr_codes = []
+    for rotation in [0, 0, 0, 0, 90, 180, 270][:passes]:
+        qr_codes.extend(qr_detector._process_decoded_objects(decoded, rotation=rotation, timestamp=timestamp))
+
+    unique = qr_detector._remove_duplicate_qr_codes(qr_codes)
+    waiters = qr_detector.detect_waiters(unique)
+
+    # Ücretsiz kalemler update_table_food_status'taki gibi elenir
+    foods = {}
+    for table_index, detections in enumerate(food_arrays):
+        table_id = f"MASA_{table_index + 1}"
+        foods[table_id] = [food for food in food_detector._parse_food_detections(detections, table_id)
+                           if food.price != 0.0]
+
+    return unique, waiters, foods
+
+def check_parity(dict_result, record_result):
+    """
+    İki gösterim aynı QR, garson ve masa bazlı yemek tespitlerini üretmeli
+    """
+    dict_qr, dict_waiters, dict_foods = dict_result
+    record_qr, record_waiters, record_foods = record_result
+    assert [(qr['data'], qr['bbox']) for qr in dict_qr] == [(qr.data, qr.bbox) for qr in record_qr]
+    assert [waiter['waiter_id'] for waiter in dict_waiters] == [waiter.waiter_id for waiter in record_waiters]
+    assert ({table_id: [(food['class_id'], food['bbox']) for food in foods] for table_id, foods in dict_foods.items()} ==
+            {table_id: [(food.class_id, food.bbox) for food in foods] for table_id, foods in record_foods.items()})
+
+def measure(build, inputs, keep_frames=30):
+    """
+    build'i tüm girdilerde çalıştır: frame başına bellek tepe noktası, son keep_frames frame'in
+    tespitleri tutulurken kalıcı bellek, süre ve GC toplama sayısı
+    """
+    kept = []
+
+    # Bellek ölçümü (tracemalloc çalışırken süre ölçülmez)
+    gc.collect()
+    tracemalloc.start()
+    peak_bytes = 0
+    for decoded, food_arrays in inputs:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        kept.append(build(decoded, food_arrays))
+        peak_bytes += tracemalloc.get_traced_memory()[1] - current
+        del kept[:-keep_frames]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    kept.clear()
+
+    # Süre ve GC (tracemalloc kapalı)
+    gc.collect()
+    collections_before = sum(stat['collections'] for stat in gc.get_stats())
+    start = time.perf_counter()
+    for decoded, food_arrays in inputs:
+        kept.append(build(decoded, food_arrays))
+        del kept[:-keep_frames]
+    elapsed = time.perf_counter() - start
+    collections = sum(stat['collections'] for stat in gc.get_stats()) - collections_before
+
+    return {
+        'bytes_per_frame': peak_bytes / len(inputs),
+        'retained_kb': retained / 1024,
+        'us_per_frame': elapsed / len(inputs) * 1e6,
+        'gc_collections': collections
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sözlük ve kayıt tipli tespitlerin frame başına bellek maliyeti")
+    parser.add_argument("--frames", type=int, default=300, help="Benzetilen frame sayısı")
+    parser.add_argument("--foods-per-table", type=int, default=6)
+    parser.add_argument("--keep", type=int, default=30, help="Tutulan son frame sayısı (track/hesap geçmişi)")
+    args = parser.parse_args()
+
+    registry = QRRegistry()
+    rng = np.random.default_rng(0)
+    inputs = [make_frame_inputs(rng, foods_per_table=args.foods_per_table) for _ in range(args.frames)]
+
+    print(f"\n📊 Tespit kaydı benchmark'ı ({args.frames} frame, 7 QR geçişi, "
+          f"4 masa x {args.foods_per_table} yemek, son {args.keep} frame tutuluyor)")
+
+    qr_detector, food_detector = create_detectors(registry)
+    builds = {'dict': partial(frame_with_dicts, registry),
+              'record': partial(frame_with_records, qr_detector, food_detector)}
+    for decoded, food_arrays in inputs[:10]:
+        check_parity(builds['dict'](decoded, food_arrays), builds['record'](decoded, food_arrays))
+
+    results = {name: measure(build, inputs, args.keep) for name, build in builds.items()}
+    for name, result in results.items():
+        print(f"   {name:>6}: {result['bytes_per_frame'] / 1024:6.1f} KB/frame tepe, "
+              f"tutulan {result['retained_kb']:6.1f} KB, "
+              f"{result['us_per_frame']:6.1f} µs/frame, {result['gc_collections']} GC toplaması")
+
+    before, after = results['dict'], results['record']
+    print(f"   ➜ Frame belleği x{before['bytes_per_frame'] / after['bytes_per_frame']:.2f}, "
+          f"tutulan bellek x{before['retained_kb'] / after['retained_kb']:.2f} azaldı, "
+          f"süre x{before['us_per_frame'] / after['us_per_frame']:.2f} "
+          f"{'hızlandı' if after['us_per_frame'] < before['us_per_frame'] else 'yavaşladı'}")
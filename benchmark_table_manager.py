@@ -0,0 +1,118 @@
+"""
+TableManager Eşzamanlılık Benchmark'ı
+Birden fazla thread aynı TableManager'ı beslerken saniyedeki güncelleme sayısını,
+kilit çekişmesini ölçer ve kayıp güncelleme olmadığını (sayaç tutarlılığı) doğrular
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import threading
+import time
+from shift_analytics import ShiftAnalytics, ARRIVAL
+from table_manager import TableManager
+
+TABLE_CODES = ["MASA_1", "MASA_2", "MASA_3", "MASA_4"]
+WAITER_IDS = ["GARSON_1", "GARSON_2"]
+
+class CountingLock:
+    """Beklemeye düşen (çekişmeli) alımları sayan kilit"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+
+    def __enter__(self):
+        if not self._lock.acquire(blocking=False):
+            self._lock.acquire()
+            self.contended += 1  # Kilit altında - sayaç güvenli
+        self.acquisitions += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+
+def _feed(manager, iterations, seed, served):
+    """
+    Tek bir kamera beslemesi: QR güncellemesi, garson tespiti, uyarı kontrolü ve okuma
+    """
+    rng = random.Random(seed)
+    for _ in range(iterations):
+        visible = [code for code in TABLE_CODES if rng.random() < 0.5]
+        manager.update_table_qr_status(visible)
+
+        table_served, response_time = manager.waiter_detected(rng.choice(WAITER_IDS), (100, 100))
+        if table_served and response_time:
+            served.append(response_time)
+
+        manager.check_warnings(60)
+        manager.get_table_status_display()
+
+def run_feeds(thread_count, iterations):
+    """
+    thread_count beslemeyi eşzamanlı çalıştır, süre, çekişme ve tutarlılık sonucunu döndür
+    """
+    analytics = ShiftAnalytics()
+    manager = TableManager(analytics=analytics)
+    manager.table_locks = {name: CountingLock() for name in manager.table_locks}
+    manager.waiter_locks = {name: CountingLock() for name in manager.waiter_locks}
+
+    served = []  # list.append atomik
+    threads = [threading.Thread(target=_feed, args=(manager, iterations, seed, served))
+               for seed in range(thread_count)]
+
+    # TableManager her olayı yazdırır - ölçüme konsol çıktısını katma
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    locks = list(manager.table_locks.values()) + list(manager.waiter_locks.values())
+    acquisitions = sum(lock.acquisitions for lock in locks)
+    contended = sum(lock.contended for lock in locks)
+
+    performance = manager.get_performance_summary()
+    total_responses = sum(perf["total_services"] for perf in performance.values())
+    service_count = sum(table["service_count"] for table in manager.tables.values())
+    customer_count = sum(table["customer_count"] for table in manager.tables.values())
+    arrivals = int((analytics.events['kind'] == ARRIVAL).sum())
+    response_sum = sum(perf["total_response_time"] for perf in manager.waiter_performance.values())
+
+    consistent = (total_responses == len(served) == service_count
+                  and customer_count == arrivals
+                  and abs(response_sum - sum(served)) < 1e-6)
+
+    return {
+        'updates_per_second': thread_count * iterations / elapsed if elapsed > 0 else 0.0,
+        'contention_rate': contended / acquisitions if acquisitions else 0.0,
+        'services': len(served),
+        'customers': customer_count,
+        'consistent': consistent
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Eşzamanlı beslemelerde TableManager hızı ve tutarlılığı")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--iterations", type=int, default=5000, help="Thread başına besleme döngüsü")
+    args = parser.parse_args()
+
+    print(f"\n📊 TableManager eşzamanlılık benchmark'ı ({args.iterations} döngü/thread)")
+
+    failed = False
+    baseline = None
+    for thread_count in args.threads:
+        result = run_feeds(thread_count, args.iterations)
+        baseline = baseline or result['updates_per_second']
+        status = "✅ tutarlı" if result['consistent'] else "❌ KAYIP GÜNCELLEME"
+        failed |= not result['consistent']
+        print(f"   threads={thread_count:>2}: {result['updates_per_second']:8.0f} döngü/s "
+              f"(x{result['updates_per_second'] / baseline:.2f}), "
+              f"çekişme {result['contention_rate']:.1%}, "
+              f"{result['customers']} müşteri / {result['services']} servis - {status}")
+
+    exit(1 if failed else 0)
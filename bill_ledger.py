@@ -0,0 +1,111 @@
+"""
+Masa Hesap Defteri (Ledger)
+Her masa için sınıf ID'sine göre indekslenmiş fiyat vektörü ve adet dizisi tutar.
+Ara toplamlar ve toplam onay/sıfırlama anında artımlı güncellenir; açık hesabın eklemeleri
+geçmişte tutulur. Hesap kapanınca geçmiş silinir (satış ve kapanış olayları vardiya
+analitiğinde kalıcıdır), böylece defter vardiya boyunca sınırlı kalır.
+"""
+
+import time
+from datetime import datetime
+import numpy as np
+
+class TableLedger:
+    """Tek bir masanın hesabı"""
+
+    def __init__(self, table_id, food_categories=None):
+        self.table_id = table_id
+
+        size = max(food_categories) + 1 if food_categories else 0
+        self.prices = np.zeros(size, dtype=np.float64)
+        self.names = [None] * size
+        for class_id, info in (food_categories or {}).items():
+            self.prices[class_id] = info['price']
+            self.names[class_id] = info['name']
+
+        self.counts = np.zeros(size, dtype=np.int32)
+        self.subtotals = np.zeros(size, dtype=np.float64)
+        self.total_price = 0.0
+        self.item_count = 0
+        self.last_update = datetime.now()
+
+        # Açık hesabın eklemeleri: (zaman, 'add', class_id, fiyat, track_id) - clear() ile silinir
+        self.history = []
+
+    def _ensure_class(self, class_id, name, price):
+        """
+        Fiyat vektöründe olmayan sınıfı (ör. worker'daki farklı kategori seti) ekle
+        """
+        if class_id >= len(self.prices):
+            grow = class_id + 1 - len(self.prices)
+            self.prices = np.concatenate([self.prices, np.zeros(grow)])
+            self.counts = np.concatenate([self.counts, np.zeros(grow, dtype=np.int32)])
+            self.subtotals = np.concatenate([self.subtotals, np.zeros(grow)])
+            self.names.extend([None] * grow)
+
+        if self.names[class_id] is None:
+            self.names[class_id] = name
+            self.prices[class_id] = price
+
+    def add(self, item, timestamp=None):
+        """
+        Onaylanan yemeği hesaba ekle - item: FoodDetection (class_id, name, price, track_id)
+        timestamp: geçmiş kaydının zamanı (verilmezse şimdi)
+        """
+        class_id = item.class_id
+        self._ensure_class(class_id, item.name, item.price)
+
+        price = float(self.prices[class_id])
+        self.counts[class_id] += 1
+        self.subtotals[class_id] += price
+        self.total_price += price
+        self.item_count += 1
+        self.last_update = datetime.now()
+
+        self.history.append((time.time() if timestamp is None else timestamp, 'add', class_id, price,
+                             item.track_id))
+
+    def clear(self):
+        """
+        Hesabı kapat, önceki toplamı döndür - açık hesabın geçmişi de silinir
+        """
+        old_total = self.total_price
+
+        self.counts[:] = 0
+        self.subtotals[:] = 0.0
+        self.total_price = 0.0
+        self.item_count = 0
+        self.last_update = datetime.now()
+
+        self.history.clear()
+        return old_total
+
+    def lines(self):
+        """
+        Hesap satırları [(yemek adı, adet, ara toplam)] - sadece hesapta olan sınıflar
+        """
+        return [
+            (self.names[class_id], int(self.counts[class_id]), float(self.subtotals[class_id]))
+            for class_id in np.nonzero(self.counts)[0]
+        ]
+
+    def item_counts(self):
+        """
+        {yemek adı: adet}
+        """
+        return {name: count for name, count, _ in self.lines()}
+
+    def get_history(self):
+        """
+        Açık hesabın okunabilir işlem geçmişi
+        """
+        return [
+            {
+                'time': datetime.fromtimestamp(timestamp),
+                'action': action,
+                'name': self.names[class_id] if class_id is not None else None,
+                'amount': amount,
+                'track_id': track_id
+            }
+            for timestamp, action, class_id, amount, track_id in self.history
+        ]
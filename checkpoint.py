@@ -0,0 +1,157 @@
+"""
+Uzun Video Analizi İçin Checkpoint / Devam Etme
+Frame konumu, masa/garson durumları, yemek takipçileri, hesaplar, açık zamanlayıcılar ve
+olay günlüğü tek bir sıkıştırılmış dosyaya yazılır. Durum frame döngüsünde pickle edilir
+(tutarlı anlık görüntü, birkaç ms), sıkıştırma ve diske yazma arka plan thread'indedir.
+Dosya önce geçici dosyaya yazılıp os.replace ile değiştirilir: yarım checkpoint oluşmaz.
+"""
+
+import os
+import pickle
+import threading
+import time
+import zlib
+
+CHECKPOINT_MAGIC = b'QRCKPT02'
+
+def capture_state(detector, frame_count, video_path):
+    """
+    Dedektör durumunun pickle edilmiş anlık görüntüsü (frame döngüsünde çağrılır)
+    Bileşenler tek seferde pickle edilir: paylaşılan nesneler (ör. analitik günlüğü) tek kopya kalır
+    """
+    state = {
+        'video': str(video_path),
+        'frame_count': frame_count,
+        'saved_at': detector.clock().timestamp(),  # Zamanlayıcı saati (duvar saati veya video zamanı)
+        'saved_monotonic': time.monotonic_ns(),  # Garson konum damgaları (süreçler arası taşınmaz)
+        'analytics': detector.analytics,
+        'table_manager': detector.table_manager,
+        'waiter_tracker': detector.waiter_detector.tracker,
+        'detected_foods': detector.food_detector.detected_foods,
+        'food_trackers': detector.food_detector.food_trackers,
+        'occupancy': detector.occupancy,
+        'floor_heatmap': detector.floor_heatmap,
+        'previous_table_states': detector.previous_table_states,
+        'previous_waiter_states': detector.previous_waiter_states,
+        'table_detection_counts': detector.table_detection_counts
+    }
+    return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_checkpoint(path):
+    """
+    Checkpoint dosyasını oku - durum sözlüğü
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(CHECKPOINT_MAGIC):
+        raise ValueError(f"Checkpoint dosyası değil: {path}")
+    return pickle.loads(zlib.decompress(data[len(CHECKPOINT_MAGIC):]))
+
+def restore_state(detector, state):
+    """
+    Durumu dedektöre yükle ve açık zamanlayıcıları aradaki süre kadar kaydır
+    (kesinti süresi bekleme/yanıt sürelerine eklenmez; video saatinde kayma olmaz).
+    Dönüş: devam edilecek frame numarası
+    """
+    detector.analytics = state['analytics']
+    detector.table_manager = state['table_manager']
+    detector.clock = detector.table_manager.clock
+    detector.table_states = detector.table_manager.tables
+
+    clock_shift = detector.clock().timestamp() - state['saved_at']
+    # Monoton saat yeni süreçte farklı bir noktadan başlar: damgalar kayıt anı = şimdi olacak şekilde taşınır
+    monotonic_shift = time.monotonic_ns() - state['saved_monotonic']
+    detector.table_manager.shift_timers(clock_shift)
+
+    tracker = state['waiter_tracker']
+    for positions in tracker.waiter_positions.values():
+        for position in positions:
+            position.timestamp += monotonic_shift
+    detector.waiter_detector.tracker = tracker
+
+    detector.food_detector.detected_foods = state['detected_foods']
+    detector.food_detector.food_trackers = state['food_trackers']
+    detector.food_detector.publish_bills()
+    for food_tracker in state['food_trackers'].values():
+        food_tracker.last_seen += clock_shift
+
+    detector.occupancy = state['occupancy']
+    if detector.occupancy.last_time is not None:
+        detector.occupancy.last_time += clock_shift
+    detector.floor_heatmap = state['floor_heatmap']
+
+    detector.previous_table_states = state['previous_table_states']
+    detector.previous_waiter_states = state['previous_waiter_states']
+    detector.table_detection_counts = state['table_detection_counts']
+
+    return state['frame_count']
+
+class CheckpointWriter:
+    """Arka planda atomik checkpoint yazıcı - sadece en yeni checkpoint bekler"""
+
+    def __init__(self, path):
+        self.path = path
+        self.condition = threading.Condition()
+        self.pending = None
+        self.running = True
+        self.stats = {
+            'saved': 0,
+            'replaced': 0,  # Yazılmadan yenisi geldi (disk yavaş)
+            'bytes': 0,
+            'write_ms': 0.0
+        }
+        self.thread = threading.Thread(target=self._write_loop, name='checkpoint-writer', daemon=True)
+        self.thread.start()
+
+    def submit(self, payload):
+        """
+        capture_state() çıktısını yazma sırasına koy (beklemez)
+        """
+        with self.condition:
+            if self.pending is not None:
+                self.stats['replaced'] += 1
+            self.pending = payload
+            self.condition.notify()
+
+    def _write_loop(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None or not self.running)
+                if self.pending is None:
+                    return
+                payload, self.pending = self.pending, None
+
+            start = time.perf_counter()
+            try:
+                size = self._write(payload)
+            except OSError as e:
+                print(f"⚠️ Checkpoint yazılamadı: {e}")
+                continue
+            self.stats['saved'] += 1
+            self.stats['bytes'] = size
+            self.stats['write_ms'] = round((time.perf_counter() - start) * 1000, 1)
+
+    def _write(self, payload):
+        """
+        Geçici dosyaya yaz, diske aktar, sonra eski checkpoint'in yerine koy
+        """
+        compressed = zlib.compress(payload, 6)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(CHECKPOINT_MAGIC)
+            f.write(compressed)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        return len(CHECKPOINT_MAGIC) + len(compressed)
+
+    def close(self):
+        """
+        Bekleyen checkpoint'i yaz ve thread'i durdur
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join()
+        print(f"💾 Checkpoint: {self.stats['saved']} kez yazıldı → {self.path} "
+              f"({self.stats['bytes'] / 1024:.0f} KB, son yazma {self.stats['write_ms']} ms)")
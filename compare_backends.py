@@ -0,0 +1,135 @@
+"""
+Backend Karşılaştırma Aracı
+ONNX Runtime / OpenVINO (FP32 veya INT8) backend'lerini PyTorch referansına göre
+gecikme (latency) ve mAP sapması açısından karşılaştırır.
+
+mAP, PyTorch backend'inin tespitleri referans etiket kabul edilerek hesaplanır:
+1.0 = referans ile birebir aynı sonuç, düşüş = quantization/export kaynaklı sapma
+"""
+
+import argparse
+import time
+import numpy as np
+from inference_backends import box_iou, create_backend, load_calibration_frames
+
+def average_precision(predictions, references, iou_threshold):
+    """
+    Tek IoU eşiği için sınıf ortalamalı AP (all-point interpolation)
+    predictions / references: frame başına (N, 6) dizileri listesi
+    Referansta olmayan sınıfların tespitleri o sınıf için AP 0 sayılır (boş sahnede yanlış pozitifler
+    mükemmel skor almaz); iki tarafta da hiç tespit yoksa sonuç birebir aynıdır (1.0)
+    """
+    class_ids = set()
+    for detections in (*references, *predictions):
+        class_ids.update(detections[:, 5].astype(int).tolist())
+
+    if not class_ids:
+        return 1.0
+
+    ap_values = []
+    for class_id in sorted(class_ids):
+        scores, matches = [], []
+        total_refs = 0
+
+        for pred, ref in zip(predictions, references):
+            pred = pred[pred[:, 5].astype(int) == class_id]
+            ref = ref[ref[:, 5].astype(int) == class_id]
+            total_refs += len(ref)
+            if len(pred) == 0:
+                continue
+
+            pred = pred[np.argsort(-pred[:, 4])]
+            used = np.zeros(len(ref), dtype=bool)
+            ious = box_iou(pred[:, :4], ref[:, :4]) if len(ref) else np.zeros((len(pred), 0))
+
+            for i in range(len(pred)):
+                scores.append(pred[i, 4])
+                candidates = np.where(~used & (ious[i] >= iou_threshold))[0] if ious.shape[1] else []
+                if len(candidates):
+                    best = candidates[np.argmax(ious[i, candidates])]
+                    used[best] = True
+                    matches.append(1)
+                else:
+                    matches.append(0)
+
+        if total_refs == 0 or not scores:
+            ap_values.append(0.0)
+            continue
+
+        order = np.argsort(-np.array(scores))
+        true_positives = np.cumsum(np.array(matches)[order])
+        recall = true_positives / total_refs
+        precision = true_positives / np.arange(1, len(order) + 1)
+
+        # Precision zarfı ve recall adımları üzerinden alan
+        recall = np.concatenate([[0.0], recall, [1.0]])
+        precision = np.concatenate([[1.0], precision, [0.0]])
+        precision = np.maximum.accumulate(precision[::-1])[::-1]
+        steps = np.where(recall[1:] != recall[:-1])[0]
+        ap_values.append(float(np.sum((recall[steps + 1] - recall[steps]) * precision[steps + 1])))
+
+    return float(np.mean(ap_values))
+
+def measure_backend(backend, frames, conf, warmup=3):
+    """
+    Frame başına gecikmeyi ölç ve tespitleri döndür
+    """
+    for frame in frames[:warmup]:
+        backend.predict([frame], conf=conf)
+
+    latencies = []
+    detections = []
+    for frame in frames:
+        start = time.perf_counter()
+        detections.append(backend.predict([frame], conf=conf)[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return np.array(latencies), detections
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Çıkarım backend'lerini PyTorch ile karşılaştır")
+    parser.add_argument("source", help="Değerlendirme görüntüleri: resim klasörü veya video")
+    parser.add_argument("--model", default="models/food_detection.pt")
+    parser.add_argument("--backends", nargs="+", default=["onnx", "openvino"])
+    parser.add_argument("--int8", action="store_true", help="Aday backend'leri INT8 olarak da ölç")
+    parser.add_argument("--calibration", help="INT8 kalibrasyon kaynağı (varsayılan: source)")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    frames = load_calibration_frames(args.source, max_frames=args.frames)
+    if not frames:
+        print(f"❌ Değerlendirme frame'i okunamadı: {args.source}")
+        exit(1)
+
+    print(f"📊 {len(frames)} frame ile backend karşılaştırması ({args.imgsz}px)")
+
+    reference = create_backend("pytorch", args.model)
+    reference_latency, reference_detections = measure_backend(reference, frames, args.conf)
+
+    candidates = [(name, False) for name in args.backends]
+    if args.int8:
+        candidates += [(name, True) for name in args.backends]
+
+    print(f"\n{'backend':<16}{'ort. ms':>10}{'p95 ms':>10}{'hız':>8}{'mAP50':>9}{'mAP50-95':>10}")
+    print(f"{'pytorch':<16}{reference_latency.mean():>10.1f}{np.percentile(reference_latency, 95):>10.1f}"
+          f"{'x1.00':>8}{1.0:>9.3f}{1.0:>10.3f}")
+
+    for name, int8 in candidates:
+        label = f"{name}{'-int8' if int8 else ''}"
+        try:
+            backend = create_backend(name, args.model, imgsz=args.imgsz, int8=int8,
+                                     calibration_source=args.calibration or args.source)
+        except Exception as e:
+            print(f"{label:<16}atlandı: {e}")
+            continue
+
+        latency, detections = measure_backend(backend, frames, args.conf)
+        map50 = average_precision(detections, reference_detections, 0.5)
+        map50_95 = np.mean([average_precision(detections, reference_detections, t)
+                            for t in np.arange(0.5, 0.96, 0.05)])
+        speedup = reference_latency.mean() / latency.mean()
+
+        print(f"{label:<16}{latency.mean():>10.1f}{np.percentile(latency, 95):>10.1f}"
+              f"{f'x{speedup:.2f}':>8}{map50:>9.3f}{map50_95:>10.3f}")
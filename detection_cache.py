@@ -0,0 +1,194 @@
+"""
+İçerik Hash'li Tespit Önbelleği
+Masa bölgesinin (ROI) küçültülmüş gri tonlamalı ortalama hash'i (aHash) değişmediyse
+YOLO tekrar çalıştırılmaz, bölgenin önceki ham tespitleri kullanılır.
+
+aHash sadece ön filtredir: masaya küçük bir tabak eklenmesi ortalamaya göre birkaç biti
+değiştirebilir. Bu yüzden isabet, küçültülmüş gri görüntünün hücre bazlı farkı ile doğrulanır.
+
+Kayıtlar (bölge, hash bandı) anahtarıyla indekslenir: hash tolerance+1 banda bölünür, en fazla
+tolerance bit farklı iki hash'in en az bir bandı aynıdır. Arama sadece aynı bölgenin ortak bantlı
+kayıtlarına bakar, tüm önbelleği taramaz.
+"""
+
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+def gray_thumbnail(image, hash_size=16):
+    """
+    hash_size x hash_size gri küçültme (her hücre bölgenin ortalama parlaklığı)
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(image, (hash_size, hash_size), interpolation=cv2.INTER_AREA)
+
+def average_hash(image, hash_size=16, thumbnail=None):
+    """
+    Görüntünün ortalama hash'i: ortalamadan parlak hücreler 1
+    Dönüş: hash_size² bitlik Python int
+    """
+    small = gray_thumbnail(image, hash_size) if thumbnail is None else thumbnail
+    bits = np.packbits(small > small.mean())
+    return int.from_bytes(bits.tobytes(), 'big')
+
+def hamming_distance(hash_a, hash_b):
+    """
+    İki hash arasındaki farklı bit sayısı
+    """
+    return bin(hash_a ^ hash_b).count('1')
+
+class RegionDetectionCache:
+    """Bölge bazlı LRU tespit önbelleği"""
+
+    def __init__(self, tolerance=6, cell_tolerance=12, max_entries=256, max_reuse=50, hash_size=16):
+        self.tolerance = tolerance  # Aynı sayılacak maksimum farklı bit sayısı
+        self.cell_tolerance = cell_tolerance  # Küçültmede bir hücrenin en fazla parlaklık farkı
+        self.max_entries = max_entries
+        self.max_reuse = max_reuse  # Bir kayıt en fazla bu kadar kullanılır, sonra yeniden tespit
+        self.hash_size = hash_size
+
+        self.entries = OrderedDict()  # (bölge, hash) -> [tespitler, kullanım sayısı, küçültme, son kullanım]
+        self.buckets = {}  # (bölge, bant no, bant değeri) -> o bantta bu değeri taşıyan hash'ler
+        self.band_bits = -(-hash_size * hash_size // (tolerance + 1))
+        self.clock = 0  # Son kullanım sırası (eşleşen adaylardan en yenisi seçilir)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def signature(self, image):
+        """
+        Görüntünün önbellek imzası: (aHash, gri küçültme)
+        """
+        thumbnail = gray_thumbnail(image, self.hash_size)
+        return average_hash(image, self.hash_size, thumbnail), thumbnail
+
+    def _matches(self, entry_thumbnail, thumbnail):
+        difference = np.abs(entry_thumbnail.astype(np.int16) - thumbnail.astype(np.int16))
+        return int(difference.max()) <= self.cell_tolerance
+
+    def _bucket_keys(self, region, image_hash):
+        mask = (1 << self.band_bits) - 1
+        return [(region, band, (image_hash >> (band * self.band_bits)) & mask)
+                for band in range(self.tolerance + 1)]
+
+    def _remove(self, key):
+        del self.entries[key]
+        for bucket_key in self._bucket_keys(*key):
+            bucket = self.buckets[bucket_key]
+            bucket.discard(key[1])
+            if not bucket:
+                del self.buckets[bucket_key]
+
+    def lookup(self, region, signature):
+        """
+        Bölge için tolerans içinde eşleşen kayıt varsa ham tespitleri döndür, yoksa None
+        """
+        image_hash, thumbnail = signature
+        key = None
+
+        # Sadece aynı bölgede en az bir bandı tutan kayıtlar aday, eşleşenlerden en yenisi
+        candidates = set()
+        for bucket_key in self._bucket_keys(region, image_hash):
+            candidates.update(self.buckets.get(bucket_key, ()))
+        for entry_hash in candidates:
+            entry = self.entries[(region, entry_hash)]
+            if (hamming_distance(entry_hash, image_hash) <= self.tolerance and self._matches(entry[2], thumbnail)
+                    and (key is None or entry[3] > self.entries[key][3])):
+                key = (region, entry_hash)
+
+        if key is None:
+            self.misses += 1
+            return None
+
+        entry = self.entries[key]
+        if entry[1] >= self.max_reuse:
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self.clock += 1
+        entry[1] += 1
+        entry[3] = self.clock
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def store(self, region, signature, detections):
+        """
+        Bölgenin yeni tespitlerini kaydet, kapasite aşılırsa en eski kaydı at
+        """
+        image_hash, thumbnail = signature
+        key = (region, image_hash)
+        if key not in self.entries:
+            for bucket_key in self._bucket_keys(region, image_hash):
+                self.buckets.setdefault(bucket_key, set()).add(image_hash)
+
+        self.clock += 1
+        self.entries[key] = [detections, 0, thumbnail, self.clock]
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.buckets.clear()
+
+    def get_stats(self):
+        """
+        İsabet/ıska sayaçları
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': len(self.entries),
+            'evictions': self.evictions
+        }
+
+# Test fonksiyonu
+def test_region_index(regions=8, per_region=30):
+    """
+    Önbelleği birçok bölgeden doldur: aynı görüntü başka bölgeden aranınca isabet olmamalı,
+    aynı bölgede birkaç bit farklı görüntü isabet etmeli; taşmada indeks de temizlenmeli
+    """
+    rng = np.random.default_rng(0)
+    cache = RegionDetectionCache(max_entries=regions * per_region)
+    images = [cv2.resize(rng.integers(0, 256, (16, 16, 3), dtype=np.uint8), (64, 64), interpolation=cv2.INTER_NEAREST)
+              for _ in range(per_region)]
+    signatures = [cache.signature(image) for image in images]
+
+    for region in range(regions):
+        for index, signature in enumerate(signatures):
+            cache.store(f"MASA_{region}", signature, np.full((1, 6), region * 1000 + index, dtype=np.float32))
+
+    # Aynı içerik, kayıtlı olmayan bölge: ıska
+    for signature in signatures:
+        assert cache.lookup("MASA_yok", signature) is None
+
+    # Her bölge sadece kendi tespitlerini alır, küçük parlaklık farkı (birkaç bit) isabet sayılır
+    for region in range(regions):
+        for index, image in enumerate(images):
+            shifted = cv2.add(image, np.full_like(image, 3))
+            detections = cache.lookup(f"MASA_{region}", cache.signature(shifted))
+            assert detections is not None and detections[0, 0] == region * 1000 + index
+
+    # Taşma: atılan kayıtlar indeksten de çıkar
+    for index in range(per_region):
+        cache.store("MASA_yeni", cache.signature(rng.integers(0, 256, (64, 64, 3), dtype=np.uint8)),
+                    np.zeros((0, 6), dtype=np.float32))
+    indexed = set()
+    for region, _, _ in cache.buckets:
+        indexed.add(region)
+    assert len(cache.entries) == cache.max_entries and cache.evictions == per_region
+    assert indexed == {region for region, _ in cache.entries}
+    assert all(bucket for bucket in cache.buckets.values())
+
+    print(f"✅ Bölge indeksi: {regions + 1} bölge, {len(cache.entries)} kayıt, {len(cache.buckets)} bant kovası, "
+          f"stats {cache.get_stats()}")
+
+if __name__ == "__main__":
+    test_region_index()
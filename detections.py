@@ -0,0 +1,32 @@
+"""
+Tespit Kayıtları
+QR, garson, yemek ve tabak tespitleri için sabit alanlı namedtuple kayıtları.
+Her frame'de oluşan tespitler sözlük yerine tuple olarak tutulur (anahtar tablosu yok,
+daha az bellek ve GC yükü); zaman damgası frame başına bir kez alınan
+time.monotonic_ns() tamsayısıdır. Onay/masa ataması gibi değişiklikler _replace ile yapılır.
+"""
+
+from collections import namedtuple
+
+# QR tespiti - record: QRRegistry kaydı (bilinmeyen içerik: None), rotation: çözüldüğü açı
+QRDetection = namedtuple('QRDetection', ['data', 'record', 'bbox', 'center', 'rotation',
+                                         'confidence', 'timestamp'])
+
+# Garson görülmesi - waiter_id: kayıt kimliği, original_id: QR içeriği, position: QR merkezi
+WaiterSighting = namedtuple('WaiterSighting', ['waiter_id', 'original_id', 'position', 'timestamp'])
+
+# Yemek tespiti - table_id masa bölgesi tespitinde, track_id onay anında doldurulur
+FoodDetection = namedtuple('FoodDetection', ['class_id', 'category', 'name', 'price', 'color',
+                                             'bbox', 'center', 'area', 'confidence', 'timestamp',
+                                             'table_id', 'track_id'],
+                           defaults=(None, None))
+
+# Tabak/kase tespiti
+PlateDetection = namedtuple('PlateDetection', ['center', 'radius', 'bbox', 'area', 'confidence',
+                                               'timestamp'])
+
+def stamp_seconds(start, end):
+    """
+    İki zaman damgası arasındaki süre, saniye
+    """
+    return (end - start) / 1e9
@@ -0,0 +1,246 @@
+"""
+Masa Bazlı Yemek Takipçisi (Multi-Object Tracker)
+Tespitleri kalıcı track ID'leri ile eşleştirir, stabil olanları onaylar.
+
+Track durumu NumPy dizilerinde tutulur; eşleştirme sınıf bazlı maliyet matrisi
+(merkez mesafesi veya IoU) üzerinden greedy ya da Hungarian çözücü ile yapılır.
+"""
+
+import time
+import numpy as np
+from inference_backends import box_iou
+from detections import FoodDetection
+
+def greedy_assignment(cost, valid):
+    """
+    Geçerli (satır, sütun) çiftlerini artan maliyet sırasıyla bire bir eşleştir
+    """
+    rows, cols = np.nonzero(valid)
+    order = np.argsort(cost[rows, cols], kind='stable')
+
+    row_used = np.zeros(cost.shape[0], dtype=bool)
+    col_used = np.zeros(cost.shape[1], dtype=bool)
+    matches = []
+
+    for row, col in zip(rows[order], cols[order]):
+        if not row_used[row] and not col_used[col]:
+            row_used[row] = col_used[col] = True
+            matches.append((row, col))
+
+    return np.array(matches, dtype=np.int64).reshape(-1, 2)
+
+def hungarian_assignment(cost, valid):
+    """
+    Toplam maliyeti en aza indiren optimal eşleştirme (scipy gerekli)
+    """
+    from scipy.optimize import linear_sum_assignment
+
+    rows, cols = linear_sum_assignment(np.where(valid, cost, 1e6))
+    keep = valid[rows, cols]
+    return np.column_stack([rows[keep], cols[keep]]).astype(np.int64).reshape(-1, 2)
+
+class FoodTracker:
+    """Tek bir masanın yemek track'leri"""
+
+    def __init__(self, distance_threshold=120, stability_frames=3, metric='center',
+                 iou_threshold=0.3, solver='greedy', temp_max_age=5.0):
+        self.distance_threshold = distance_threshold
+        self.stability_frames = stability_frames
+        self.metric = metric  # 'center' (merkez mesafesi) veya 'iou'
+        self.iou_threshold = iou_threshold
+        self.solver = solver  # 'greedy' veya 'hungarian'
+        self.temp_max_age = temp_max_age  # Onaylanmamış track'in görülmeden kalabileceği süre
+        # Onaylı track'ler reset()'e (hesap kapanışı) kadar tutulur: görünmediği frame'lerden
+        # sonra tekrar görülen aynı yemek yeni track açıp ikinci kez faturalanmaz
+
+        self.next_track_id = 1
+        self.reset()
+
+    def reset(self):
+        """
+        Tüm track'leri temizle (ID sayacı devam eder)
+        """
+        self.track_ids = np.zeros(0, dtype=np.int64)
+        self.class_ids = np.zeros(0, dtype=np.int32)
+        self.boxes = np.zeros((0, 4), dtype=np.float32)  # x1, y1, x2, y2
+        self.confidences = np.zeros(0, dtype=np.float32)
+        self.hits = np.zeros(0, dtype=np.int32)
+        self.last_seen = np.zeros(0, dtype=np.float64)
+        self.confirmed = np.zeros(0, dtype=bool)
+        self.track_items = {}  # track_id -> son tespit (onay anında hesaba yazılır)
+
+    def __len__(self):
+        return len(self.track_ids)
+
+    def update(self, detections, now=None):
+        """
+        Yeni frame'in tespitlerini track'lere uygula
+        detections: FoodDetection listesi (bbox (x, y, w, h), class_id, confidence)
+        Dönüş: bu güncellemede onaylanan tespitler (track_id ve track'in en yüksek confidence'ı ile)
+        """
+        now = time.monotonic() if now is None else now
+
+        if detections:
+            det_boxes = np.array([d.bbox for d in detections], dtype=np.float32)
+            det_boxes[:, 2:] += det_boxes[:, :2]  # xywh -> xyxy
+            det_classes = np.array([d.class_id for d in detections], dtype=np.int32)
+            det_conf = np.array([d.confidence for d in detections], dtype=np.float32)
+
+            matches = self._match(det_boxes, det_classes)
+            det_rows, track_cols = matches[:, 0], matches[:, 1]
+
+            # Eşleşen track'leri güncelle (hareket takibi)
+            self.boxes[track_cols] = det_boxes[det_rows]
+            self.last_seen[track_cols] = now
+            self.hits[track_cols] += 1
+            self.confidences[track_cols] = np.maximum(self.confidences[track_cols], det_conf[det_rows])
+            for row, col in zip(det_rows, track_cols):
+                self.track_items[int(self.track_ids[col])] = detections[row]
+
+            # Eşleşmeyen tespitler yeni (onaylanmamış) track olur
+            unmatched = np.ones(len(detections), dtype=bool)
+            unmatched[det_rows] = False
+            self._add_tracks(det_boxes[unmatched], det_classes[unmatched], det_conf[unmatched],
+                             [d for d, new in zip(detections, unmatched) if new], now)
+
+        # Stability kontrolü
+        newly_confirmed = np.nonzero(~self.confirmed & (self.hits >= self.stability_frames))[0]
+        self.confirmed[newly_confirmed] = True
+
+        confirmed_items = []
+        for index in newly_confirmed:
+            track_id = int(self.track_ids[index])
+            confirmed_items.append(self.track_items[track_id]._replace(
+                track_id=track_id, confidence=float(self.confidences[index])))
+
+        # Eski onaylanmamış track'leri temizle (onaylılar hesap kapanana kadar kalır)
+        stale = ~self.confirmed & (now - self.last_seen >= self.temp_max_age)
+        if stale.any():
+            self._remove_tracks(stale)
+
+        return confirmed_items
+
+    def _match(self, det_boxes, det_classes):
+        """
+        Tespit x track maliyet matrisini kur ve çöz - (tespit indeksi, track indeksi) çiftleri
+        """
+        if len(self.track_ids) == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+
+        same_class = det_classes[:, None] == self.class_ids[None, :]
+
+        if self.metric == 'iou':
+            iou = box_iou(det_boxes, self.boxes)
+            cost = 1.0 - iou
+            valid = same_class & (iou >= self.iou_threshold)
+            preference = 1.0
+        else:
+            det_centers = (det_boxes[:, :2] + det_boxes[:, 2:]) / 2
+            track_centers = (self.boxes[:, :2] + self.boxes[:, 2:]) / 2
+            cost = np.linalg.norm(det_centers[:, None, :] - track_centers[None, :, :], axis=2)
+            valid = same_class & (cost < self.distance_threshold)
+            preference = float(self.distance_threshold)
+
+        # Onaylı track'ler önce eşleşsin (aynı yemeğin tekrar sayılmasını önler)
+        cost = cost + np.where(self.confirmed, 0.0, preference)[None, :]
+
+        if self.solver == 'hungarian':
+            return hungarian_assignment(cost, valid)
+        return greedy_assignment(cost, valid)
+
+    def _add_tracks(self, boxes, class_ids, confidences, items, now):
+        """
+        Yeni onaylanmamış track'ler ekle
+        """
+        count = len(items)
+        if count == 0:
+            return
+
+        new_ids = np.arange(self.next_track_id, self.next_track_id + count, dtype=np.int64)
+        self.next_track_id += count
+
+        self.track_ids = np.concatenate([self.track_ids, new_ids])
+        self.class_ids = np.concatenate([self.class_ids, class_ids])
+        self.boxes = np.concatenate([self.boxes, boxes])
+        self.confidences = np.concatenate([self.confidences, confidences])
+        self.hits = np.concatenate([self.hits, np.ones(count, dtype=np.int32)])
+        self.last_seen = np.concatenate([self.last_seen, np.full(count, now)])
+        self.confirmed = np.concatenate([self.confirmed, np.zeros(count, dtype=bool)])
+
+        for track_id, item in zip(new_ids, items):
+            self.track_items[int(track_id)] = item
+
+    def _remove_tracks(self, mask):
+        """
+        Maskedeki track'leri sil
+        """
+        for track_id in self.track_ids[mask]:
+            self.track_items.pop(int(track_id), None)
+
+        keep = ~mask
+        self.track_ids = self.track_ids[keep]
+        self.class_ids = self.class_ids[keep]
+        self.boxes = self.boxes[keep]
+        self.confidences = self.confidences[keep]
+        self.hits = self.hits[keep]
+        self.last_seen = self.last_seen[keep]
+        self.confirmed = self.confirmed[keep]
+
+# Test fonksiyonu
+def test_food_tracker():
+    """
+    Kalabalık bir açık büfe masasını simüle et (60 yemek, titreşimli tespitler)
+    """
+    print("🧪 FoodTracker Test Ediliyor...")
+
+    rng = np.random.default_rng(0)
+    grid = np.stack(np.meshgrid(np.arange(10) * 130 + 50, np.arange(6) * 130 + 50), axis=2).reshape(-1, 2)
+    tracker = FoodTracker()
+
+    confirmed_total = 0
+    start = time.perf_counter()
+    for frame in range(20):
+        jitter = rng.normal(0, 8, grid.shape)
+        detections = [
+            FoodDetection(1, 'pastry', 'Pogaca', 15.0, (0, 165, 255), (int(x) - 40, int(y) - 40, 80, 80),
+                          (int(x), int(y)), 6400, 0.8, 0)
+            for x, y in grid + jitter
+        ]
+        confirmed_total += len(tracker.update(detections, now=frame * 0.3))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"   Track sayısı: {len(tracker)} | Onaylanan: {confirmed_total} (beklenen: {len(grid)})")
+    print(f"   20 güncelleme: {elapsed:.1f} ms ({elapsed / 20:.2f} ms/güncelleme)")
+
+def test_bill_after_unpriced_frames():
+    """
+    Yemek -> sadece kase görülen frame'ler -> aynı yemek tekrar: hesap değişmemeli
+    """
+    from yolo_food_detector import YOLOFoodDetector
+
+    print("🧪 Fiyatsız frame'lerden sonra tekrar faturalama testi...")
+    detector = YOLOFoodDetector(with_model=False)
+    dish = FoodDetection(54, 'sandwich', 'Sandviç', 25.0, (255, 255, 0), (100, 100, 80, 80), (140, 140), 6400, 0.8, 0)
+    bowl = FoodDetection(51, 'bowl', 'Kase', 0.0, (255, 0, 0), (300, 100, 80, 80), (340, 140), 6400, 0.8, 0)
+
+    t = 0.0
+    for _ in range(detector.stability_frames):
+        t += 0.5
+        detector.update_table_food_status('MASA_1', [dish], t)
+    billed = detector.update_table_food_status('MASA_1', [dish], t)
+
+    # Yemek uzun süre (onaylı track yaşından fazla) görünmez, masada sadece kase var
+    for _ in range(60):
+        t += 0.5
+        detector.update_table_food_status('MASA_1', [bowl], t)
+    for _ in range(detector.stability_frames + 2):
+        t += 0.5
+        after = detector.update_table_food_status('MASA_1', [dish], t)
+
+    print(f"   Hesap: {billed} -> {after}")
+    assert billed == (1, 25.0) and after == billed, "aynı yemek ikinci kez faturalandı"
+    print("   ✅ Hesap değişmedi")
+
+if __name__ == "__main__":
+    test_food_tracker()
+    test_bill_after_unpriced_frames()
@@ -0,0 +1,170 @@
+"""
+Canlı Yayın İçin En Yeni Frame Yakalayıcı
+Ayrı bir thread kaynağı kendi hızında okur ve sadece en yeni frame'i tutar; işleme
+yavaş kalırsa eski frame'ler atlanır (sayılır), kuyruk ve gecikme birikmez.
+cv2.VideoCapture ile aynı arayüz (read/get/set/isOpened/release) sunulur.
+
+Kameralar ve yayınlar için okuma hatası video sonu sayılmaz: okuma artan bekleme ile
+tekrarlanır, art arda hatalarda kaynak yeniden açılır. read() zaman aşımında "yeni frame
+yok" (None, None) döner; (False, None) sadece dosya sonunda veya kapatıldıktan sonra döner.
+"""
+
+import threading
+import time
+import cv2
+from video_sources import open_video_source
+
+# Canlı kaynakta okuma hatası: bu kadar art arda hatadan sonra kaynak yeniden açılır
+REOPEN_AFTER_FAILURES = 3
+RETRY_BACKOFF = (0.1, 10.0)  # Bekleme her hatada ikiye katlanır (en az, en çok saniye)
+
+class LatestFrameCapture:
+    """Sadece en yeni frame'i tutan arka plan okuyucu"""
+
+    def __init__(self, source, realtime=None, reconnect=None):
+        # source: open_video_source tanımı (kamera indeksi, URL, dosya, synthetic, .raw) veya açılmış kaynak
+        self.source = source
+        self.capture = open_video_source(source) if isinstance(source, (str, int)) else source
+
+        # Dosyalar kaynak FPS'inde okunur (canlı yayın taklidi); kameralar ve yayınlar zaten kendi hızındadır
+        stream = str(source).isdigit() or str(source).startswith(('rtsp://', 'http://', 'https://'))
+        self.realtime = not stream if realtime is None else realtime
+        # Kamera/yayın kesintisi video sonu değildir: tekrar dene, gerekirse yeniden aç
+        self.reconnect = stream if reconnect is None else reconnect
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.frame_interval = 1.0 / fps if fps and fps > 0 else 1.0 / 30
+
+        self.condition = threading.Condition()
+        self.frame = None
+        self.frame_number = 0      # Kaynaktan okunan son frame'in numarası
+        self.delivered_number = 0  # read() ile verilen son frame'in numarası
+        self.finished = False
+        self.pending_seek = None
+
+        self.stats = {
+            'grabbed': 0,
+            'delivered': 0,
+            'dropped': 0,  # Okundu ama işlenmeden yenisi geldi
+            'read_failures': 0,
+            'reopened': 0
+        }
+
+        self.running = self.capture.isOpened()
+        self.thread = threading.Thread(target=self._grab_loop, name='frame-grabber', daemon=True)
+        if self.running:
+            self.thread.start()
+
+    def _reopen(self):
+        """
+        Kaynağı tanımından yeniden aç - açıldı mı
+        """
+        self.capture.release()
+        self.capture = open_video_source(self.source)
+        with self.condition:
+            self.stats['reopened'] += 1
+        return self.capture.isOpened()
+
+    def _grab_loop(self):
+        next_time = time.perf_counter()
+        failures = 0
+
+        while self.running:
+            with self.condition:
+                if self.pending_seek is not None:
+                    self.capture.set(cv2.CAP_PROP_POS_FRAMES, self.pending_seek)
+                    self.pending_seek = None
+                    self.finished = False
+                    next_time = time.perf_counter()
+
+            if self.finished:
+                time.sleep(0.05)  # Dosya sonu - başa sarılmayı bekle
+                continue
+
+            ret, frame = self.capture.read()
+
+            if not ret and self.reconnect:
+                failures += 1
+                with self.condition:
+                    self.stats['read_failures'] += 1
+                if failures == REOPEN_AFTER_FAILURES:
+                    print(f"📡 Kaynaktan okunamıyor, yeniden bağlanılıyor: {self.source}")
+                time.sleep(min(RETRY_BACKOFF[0] * 2 ** (failures - 1), RETRY_BACKOFF[1]))
+                # Dışarıdan verilen açılmış kaynak yeniden açılamaz, sadece okuma tekrarlanır
+                reopenable = isinstance(self.source, (str, int))
+                if failures >= REOPEN_AFTER_FAILURES and reopenable and self.running and self._reopen():
+                    print(f"📡 Kaynak yeniden açıldı: {self.source}")
+                next_time = time.perf_counter()
+                continue
+            failures = 0
+
+            with self.condition:
+                if not ret:
+                    self.finished = True
+                else:
+                    # Önceki frame hiç verilmediyse atlanmış sayılır
+                    if self.frame_number > self.delivered_number:
+                        self.stats['dropped'] += 1
+                    self.frame = frame
+                    self.frame_number += 1
+                    self.stats['grabbed'] += 1
+                self.condition.notify_all()
+
+            if self.realtime and ret:
+                next_time += self.frame_interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_time = time.perf_counter()  # Okuma yavaş kaldı - tempoyu yeniden başlat
+
+    def read(self, timeout=5.0):
+        """
+        Henüz verilmemiş en yeni frame'i bekle ve döndür: (ret, frame)
+        Kaynak bitti veya kapatıldıysa (False, None); zaman aşımında yeni frame yok: (None, None)
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.frame_number > self.delivered_number
+                                    or self.finished or not self.running, timeout)
+            if self.frame_number <= self.delivered_number:
+                if self.finished or not self.running:
+                    return False, None
+                return None, None
+
+            self.delivered_number = self.frame_number
+            self.stats['delivered'] += 1
+            return True, self.frame
+
+    def get(self, prop):
+        return self.capture.get(prop)
+
+    def set(self, prop, value):
+        """
+        Sadece başa/konuma sarma desteklenir (okuyucu thread'de uygulanır)
+        """
+        if prop != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        with self.condition:
+            self.pending_seek = value
+            self.frame = None
+            self.delivered_number = self.frame_number
+        return True
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def get_stats(self):
+        """
+        Okunan / işlenen / atlanan frame sayıları
+        """
+        with self.condition:
+            stats = dict(self.stats)
+        stats['drop_rate'] = round(stats['dropped'] / stats['grabbed'], 3) if stats['grabbed'] else 0.0
+        return stats
+
+    def release(self):
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread.is_alive():
+            self.thread.join(timeout=2.0)
+        self.capture.release()
@@ -0,0 +1,345 @@
+"""
+CPU Çıkarım Backend'leri
+YOLO modelini PyTorch (ultralytics), ONNX Runtime veya OpenVINO ile çalıştırır.
+Export edilen modeller models/cache altında saklanır ve sonraki açılışlarda tekrar kullanılır.
+
+Tüm backend'ler aynı çıktıyı üretir: her frame için (N, 6) dizisi
+[x1, y1, x2, y2, confidence, class_id] (orijinal frame koordinatlarında)
+"""
+
+import os
+import shutil
+import cv2
+import numpy as np
+
+BACKEND_NAMES = ('pytorch', 'onnx', 'openvino')
+DEFAULT_CACHE_DIR = os.path.join('models', 'cache')
+EMPTY_DETECTIONS = np.zeros((0, 6), dtype=np.float32)
+
+def letterbox(image, new_shape=640, pad_value=114):
+    """
+    Görüntüyü en-boy oranını koruyarak new_shape x new_shape kareye yerleştir
+    Dönüş: (kare görüntü, ölçek oranı, (pad_x, pad_y))
+    """
+    height, width = image.shape[:2]
+    ratio = min(new_shape / height, new_shape / width)
+    resized_w, resized_h = int(round(width * ratio)), int(round(height * ratio))
+
+    if (resized_w, resized_h) != (width, height):
+        image = cv2.resize(image, (resized_w, resized_h), interpolation=cv2.INTER_LINEAR)
+
+    pad_x = (new_shape - resized_w) / 2
+    pad_y = (new_shape - resized_h) / 2
+    top, left = int(round(pad_y - 0.1)), int(round(pad_x - 0.1))
+
+    canvas = np.full((new_shape, new_shape, 3), pad_value, dtype=np.uint8)
+    canvas[top:top + resized_h, left:left + resized_w] = image
+    return canvas, ratio, (left, top)
+
+def preprocess_batch(frames, imgsz):
+    """
+    BGR frame listesini modele uygun NCHW float32 tensörüne çevir
+    """
+    batch = np.empty((len(frames), 3, imgsz, imgsz), dtype=np.float32)
+    transforms = []
+
+    for i, frame in enumerate(frames):
+        boxed, ratio, pad = letterbox(frame, imgsz)
+        # BGR -> RGB, HWC -> CHW, 0-1 aralığı
+        batch[i] = boxed[:, :, ::-1].transpose(2, 0, 1) * (1.0 / 255.0)
+        transforms.append((ratio, pad, frame.shape[:2]))
+
+    return batch, transforms
+
+def box_iou(boxes_a, boxes_b):
+    """
+    İki xyxy kutu kümesi arasındaki IoU matrisi (len(a) x len(b))
+    """
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:4], boxes_b[None, :, 2:4])
+    inter = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+def non_max_suppression(boxes, scores, iou_threshold=0.7):
+    """
+    Klasik greedy NMS - tutulan kutuların indekslerini döndürür (skora göre azalan)
+    """
+    order = np.argsort(-scores)
+    keep = []
+
+    while order.size > 0:
+        best = order[0]
+        keep.append(best)
+        if order.size == 1:
+            break
+        overlaps = box_iou(boxes[best:best + 1], boxes[order[1:]])[0]
+        order = order[1:][overlaps <= iou_threshold]
+
+    return np.array(keep, dtype=np.int64)
+
+def postprocess_predictions(raw_output, transforms, conf_threshold, iou_threshold=0.7, max_det=300):
+    """
+    YOLOv8/YOLO11 ham çıktısını (B, 4 + sınıf sayısı, N) frame koordinatlarında
+    tespitlere çevir - sınıf bazlı NMS ile
+    """
+    detections = []
+    predictions = raw_output.transpose(0, 2, 1)  # (B, N, 4 + nc)
+
+    for pred, (ratio, (pad_x, pad_y), (height, width)) in zip(predictions, transforms):
+        class_scores = pred[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(class_ids)), class_ids]
+
+        mask = scores >= conf_threshold
+        if not mask.any():
+            detections.append(EMPTY_DETECTIONS)
+            continue
+
+        cx, cy, w, h = pred[mask, :4].T
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        scores, class_ids = scores[mask], class_ids[mask]
+
+        # Sınıf bazlı NMS: her sınıfı ayrı bir koordinat bölgesine kaydır
+        offsets = class_ids[:, None].astype(np.float32) * 7680.0
+        keep = non_max_suppression(boxes + offsets, scores, iou_threshold)[:max_det]
+        boxes, scores, class_ids = boxes[keep], scores[keep], class_ids[keep]
+
+        # Letterbox dönüşümünü geri al
+        boxes[:, [0, 2]] = np.clip((boxes[:, [0, 2]] - pad_x) / ratio, 0, width)
+        boxes[:, [1, 3]] = np.clip((boxes[:, [1, 3]] - pad_y) / ratio, 0, height)
+
+        detections.append(np.column_stack([boxes, scores, class_ids]).astype(np.float32))
+
+    return detections
+
+class InferenceBackend:
+    """Tüm backend'lerin ortak arayüzü"""
+    name = 'base'
+
+    def __init__(self, imgsz=640):
+        self.imgsz = imgsz
+
+    def predict(self, frames, conf=0.25, imgsz=None):
+        """
+        Frame listesi için tespit yap - her frame için (N, 6) dizisi döner
+        """
+        raise NotImplementedError
+
+class PyTorchBackend(InferenceBackend):
+    """ultralytics YOLO (PyTorch) - referans backend"""
+    name = 'pytorch'
+
+    def __init__(self, model_path, imgsz=None):
+        super().__init__(imgsz)
+        from ultralytics import YOLO
+        self.model = YOLO(model_path)
+
+    def predict(self, frames, conf=0.25, imgsz=None):
+        options = {'conf': conf, 'verbose': False}
+        if imgsz or self.imgsz:
+            options['imgsz'] = imgsz or self.imgsz
+
+        results = self.model(list(frames), **options)
+        return [
+            result.boxes.data.cpu().numpy()[:, :6] if result.boxes is not None else EMPTY_DETECTIONS
+            for result in results
+        ]
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """ONNX Runtime CPU backend - letterbox ve NMS NumPy ile yapılır"""
+    name = 'onnx'
+
+    def __init__(self, onnx_path, imgsz=640, threads=None):
+        super().__init__(imgsz)
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+
+        self.session = ort.InferenceSession(onnx_path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, frames, conf=0.25, imgsz=None):
+        batch, transforms = preprocess_batch(frames, imgsz or self.imgsz)
+        raw_output = self.session.run(None, {self.input_name: batch})[0]
+        return postprocess_predictions(raw_output, transforms, conf)
+
+class OpenVinoBackend(InferenceBackend):
+    """OpenVINO CPU backend - letterbox ve NMS NumPy ile yapılır"""
+    name = 'openvino'
+
+    def __init__(self, model_xml, imgsz=640):
+        super().__init__(imgsz)
+        import openvino as ov
+
+        core = ov.Core()
+        self.compiled_model = core.compile_model(core.read_model(model_xml), 'CPU',
+                                                 {'PERFORMANCE_HINT': 'LATENCY'})
+        self.output = self.compiled_model.output(0)
+
+    def predict(self, frames, conf=0.25, imgsz=None):
+        batch, transforms = preprocess_batch(frames, imgsz or self.imgsz)
+        raw_output = self.compiled_model(batch)[self.output]
+        return postprocess_predictions(raw_output, transforms, conf)
+
+def load_calibration_frames(source, max_frames=200, sample_every=30):
+    """
+    INT8 kalibrasyonu için kendi görüntülerimizden frame topla
+    source: resim klasörü veya video dosyası
+    """
+    frames = []
+
+    if os.path.isdir(source):
+        for file_name in sorted(os.listdir(source)):
+            if file_name.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp')):
+                frame = cv2.imread(os.path.join(source, file_name))
+                if frame is not None:
+                    frames.append(frame)
+            if len(frames) >= max_frames:
+                break
+        return frames
+
+    cap = cv2.VideoCapture(source)
+    frame_count = 0
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if frame_count % sample_every == 0:
+            frames.append(frame)
+        frame_count += 1
+    cap.release()
+    return frames
+
+def _artifact_path(model_path, backend, imgsz, int8, cache_dir):
+    """
+    Cache'deki export dosyasının yolu (ONNX: .onnx dosyası, OpenVINO: .xml)
+    """
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    tag = f"{stem}_{imgsz}{'_int8' if int8 else ''}"
+    if backend == 'onnx':
+        return os.path.join(cache_dir, f"{tag}.onnx")
+    return os.path.join(cache_dir, f"{tag}_openvino", f"{stem}.xml")
+
+def _is_fresh(artifact, model_path):
+    """
+    Cache'deki dosya var ve kaynak modelden daha yeni mi?
+    """
+    if not os.path.exists(artifact):
+        return False
+    return not os.path.exists(model_path) or os.path.getmtime(artifact) >= os.path.getmtime(model_path)
+
+def _export_fp32(model_path, backend, imgsz, cache_dir):
+    """
+    ultralytics ile modeli bir kez export et ve cache klasörüne taşı
+    """
+    target = _artifact_path(model_path, backend, imgsz, False, cache_dir)
+    if _is_fresh(target, model_path):
+        return target
+
+    from ultralytics import YOLO
+    os.makedirs(cache_dir, exist_ok=True)
+    print(f"📦 Model export ediliyor: {model_path} → {backend} ({imgsz}px)")
+
+    exported = YOLO(model_path).export(format=backend, imgsz=imgsz, dynamic=True, verbose=False)
+
+    if backend == 'onnx':
+        shutil.move(exported, target)
+    else:
+        target_dir = os.path.dirname(target)
+        if os.path.exists(target_dir):
+            shutil.rmtree(target_dir)
+        shutil.move(exported, target_dir)
+
+    return target
+
+def _quantize_onnx(fp32_path, int8_path, calibration_frames, imgsz):
+    """
+    ONNX Runtime statik INT8 post-training quantization
+    """
+    from onnxruntime.quantization import (CalibrationDataReader, QuantFormat, QuantType,
+                                          quantize_static)
+    import onnxruntime as ort
+
+    input_name = ort.InferenceSession(fp32_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self.frames = iter(calibration_frames)
+
+        def get_next(self):
+            frame = next(self.frames, None)
+            if frame is None:
+                return None
+            return {input_name: preprocess_batch([frame], imgsz)[0]}
+
+    quantize_static(fp32_path, int8_path, FrameReader(),
+                    quant_format=QuantFormat.QDQ, per_channel=True,
+                    activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8)
+
+def _quantize_openvino(fp32_xml, int8_xml, calibration_frames, imgsz):
+    """
+    OpenVINO + NNCF INT8 post-training quantization
+    """
+    import nncf
+    import openvino as ov
+
+    core = ov.Core()
+    dataset = nncf.Dataset(calibration_frames, lambda frame: preprocess_batch([frame], imgsz)[0])
+    quantized = nncf.quantize(core.read_model(fp32_xml), dataset,
+                              preset=nncf.QuantizationPreset.MIXED,
+                              subset_size=len(calibration_frames))
+
+    os.makedirs(os.path.dirname(int8_xml), exist_ok=True)
+    ov.save_model(quantized, int8_xml)
+
+def prepare_artifact(model_path, backend, imgsz=640, int8=False, calibration_source=None,
+                     cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Backend için export edilmiş (ve istenirse INT8) model dosyasını hazırla
+    Dosya cache'de güncel ise tekrar export edilmez
+    """
+    fp32_path = _export_fp32(model_path, backend, imgsz, cache_dir)
+    if not int8:
+        return fp32_path
+
+    int8_path = _artifact_path(model_path, backend, imgsz, True, cache_dir)
+    if _is_fresh(int8_path, fp32_path):
+        return int8_path
+
+    if not calibration_source:
+        raise ValueError("INT8 quantization için kalibrasyon kaynağı (klasör veya video) gerekli")
+
+    calibration_frames = load_calibration_frames(calibration_source)
+    if not calibration_frames:
+        raise ValueError(f"Kalibrasyon frame'i okunamadı: {calibration_source}")
+
+    print(f"🧮 INT8 quantization: {len(calibration_frames)} kalibrasyon frame'i")
+    if backend == 'onnx':
+        _quantize_onnx(fp32_path, int8_path, calibration_frames, imgsz)
+    else:
+        _quantize_openvino(fp32_path, int8_path, calibration_frames, imgsz)
+
+    return int8_path
+
+def create_backend(backend, model_path, imgsz=640, int8=False, calibration_source=None,
+                   cache_dir=DEFAULT_CACHE_DIR):
+    """
+    İsme göre çıkarım backend'i oluştur ('pytorch', 'onnx', 'openvino')
+    """
+    if backend not in BACKEND_NAMES:
+        raise ValueError(f"Bilinmeyen backend: {backend} (seçenekler: {', '.join(BACKEND_NAMES)})")
+
+    if backend == 'pytorch':
+        return PyTorchBackend(model_path)
+
+    artifact = prepare_artifact(model_path, backend, imgsz, int8, calibration_source, cache_dir)
+    if backend == 'onnx':
+        return OnnxRuntimeBackend(artifact, imgsz)
+    return OpenVinoBackend(artifact, imgsz)
@@ -0,0 +1,204 @@
+"""
+Ayrı Süreçte Asenkron YOLO Çıkarımı
+Frame'ler multiprocessing.shared_memory üzerindeki halka (ring) slotlarına kopyalanır,
+worker sürecine sadece (frame_id, slot) gönderilir - frame pickle edilmez.
+Ana döngü QR takibi ve görüntülemeye devam eder, sonuçlar geldikçe uygulanır.
+
+Worker yemek tespitine ek olarak tabak/kase tespitini de yapar. Model yüklenemezse
+('error') veya süreç beklenmedik şekilde sonlanırsa InferenceWorker.error dolar; ana süreç
+buna bakıp yerel tespite geçer. Tek bir frame'deki hata slotu geri verir ('failed').
+"""
+
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+def _worker_main(request_queue, result_queue, detector_options, table_areas):
+    """
+    Worker süreci: modeli yükler, istekleri sırayla işler
+    Geride kalırsa kuyruktaki eski istekleri atlayıp en yenisini işler
+    """
+    from yolo_food_detector import YOLOFoodDetector
+
+    try:
+        detector = YOLOFoodDetector(**detector_options)
+    except Exception as e:
+        print(f"❌ YOLO worker modeli yükleyemedi: {e}")
+        result_queue.put(('error', None, None, f"model yüklenemedi: {e}"))
+        return
+    result_queue.put(('ready', None, None, None))
+
+    attached = None
+    stopping = False
+
+    while not stopping:
+        request = request_queue.get()
+        if request is None:
+            break
+
+        # Kuyrukta daha yeni istek varsa eskileri düşür (slotlarını geri ver)
+        while True:
+            try:
+                newer = request_queue.get_nowait()
+            except queue.Empty:
+                break
+            if newer is None:
+                stopping = True
+                break
+            result_queue.put(('dropped', request[0], request[1], None))
+            request = newer
+
+        frame_id, slot, shm_name, shape = request
+        frame = None
+        try:
+            if attached is None or attached.name != shm_name:
+                if attached is not None:
+                    attached.close()
+                # spawn ile başlatılan süreç ana sürecin resource tracker'ını paylaşır,
+                # unlink ana sürecin sorumluluğunda
+                attached = shared_memory.SharedMemory(name=shm_name)
+
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=attached.buf, offset=slot * int(np.prod(shape)))
+
+            start = time.perf_counter()
+            foods_by_table = detector.detect_food_by_table([frame], table_areas)[0]
+            plates = detector.detect_plates_and_bowls(frame)
+            latency = time.perf_counter() - start
+        except Exception as e:
+            # Tek frame'in hatası worker'ı durdurmaz, slot geri verilir
+            result_queue.put(('failed', frame_id, slot, f"{type(e).__name__}: {e}"))
+            continue
+        finally:
+            del frame  # Buffer referansını bırak (slot ana sürece geri veriliyor)
+
+        result_queue.put(('result', frame_id, slot, (foods_by_table, plates, latency, detector.get_inference_stats())))
+
+    if attached is not None:
+        attached.close()
+
+class InferenceWorker:
+    """Ana süreç tarafı: shared memory halkası ve worker süreci yönetimi"""
+
+    def __init__(self, detector_options=None, table_areas=None, slot_count=3):
+        context = mp.get_context('spawn')
+        self.request_queue = context.Queue()
+        self.result_queue = context.Queue()
+
+        self.slot_count = slot_count
+        self.free_slots = list(range(slot_count))
+        self.shared_memory = None
+        self.frame_shape = None
+
+        self.ready = False
+        self.error = None  # Model yüklenemedi veya süreç öldü - ana süreç yerel tespite geçer
+        self.last_latency = None
+        self.inference_stats = {}  # Worker'daki detector'ın get_inference_stats() çıktısı
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'dropped_busy': 0,   # Boş slot yoktu, frame gönderilmedi
+            'dropped_stale': 0,  # Worker geride kaldı, eski istek atlandı
+            'failed': 0          # Çıkarım hata verdi, frame atlandı
+        }
+
+        self.process = context.Process(
+            target=_worker_main,
+            args=(self.request_queue, self.result_queue, detector_options or {}, table_areas or {}),
+            name='yolo-worker',
+            daemon=True
+        )
+        self.process.start()
+        print(f"🧵 YOLO worker süreci başlatıldı (PID: {self.process.pid}, {slot_count} slot)")
+
+    def _allocate(self, frame_shape):
+        """
+        Frame boyutuna göre shared memory halkasını oluştur
+        """
+        self.frame_shape = frame_shape
+        slot_bytes = int(np.prod(frame_shape))
+        self.shared_memory = shared_memory.SharedMemory(create=True, size=slot_bytes * self.slot_count)
+
+    def _slot_view(self, slot):
+        """
+        Slotun NumPy görünümü (kopyasız)
+        """
+        return np.ndarray(self.frame_shape, dtype=np.uint8, buffer=self.shared_memory.buf,
+                          offset=slot * int(np.prod(self.frame_shape)))
+
+    def submit(self, frame, frame_id):
+        """
+        Frame'i boş bir slota kopyala ve worker'a gönder
+        Boş slot yoksa (worker meşgul) frame atlanır - ana döngü beklemez
+        """
+        if self.shared_memory is None:
+            self._allocate(frame.shape)
+        elif frame.shape != self.frame_shape:
+            print(f"⚠️ Worker frame boyutu değişti ({self.frame_shape} → {frame.shape}), frame atlandı")
+            return False
+
+        if not self.free_slots:
+            self.stats['dropped_busy'] += 1
+            return False
+
+        slot = self.free_slots.pop(0)
+        self._slot_view(slot)[...] = frame
+        self.request_queue.put((frame_id, slot, self.shared_memory.name, frame.shape))
+        self.stats['submitted'] += 1
+        return True
+
+    def poll_results(self):
+        """
+        Gelen sonuçları beklemeden topla - [(frame_id, {table_id: [tespitler]}, tabaklar), ...]
+        Worker süreci beklenmedik şekilde sonlandıysa self.error doldurulur
+        """
+        results = []
+
+        while True:
+            try:
+                kind, frame_id, slot, payload = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if slot is not None:
+                self.free_slots.append(slot)
+
+            if kind == 'ready':
+                self.ready = True
+                print("✅ YOLO worker hazır - yemek tespiti aktif")
+            elif kind == 'error':
+                self.error = payload
+            elif kind == 'dropped':
+                self.stats['dropped_stale'] += 1
+            elif kind == 'failed':
+                self.stats['failed'] += 1
+                print(f"⚠️ Worker frame {frame_id} çıkarımı başarısız: {payload}")
+            elif kind == 'result':
+                foods_by_table, plates, self.last_latency, self.inference_stats = payload
+                self.stats['completed'] += 1
+                results.append((frame_id, foods_by_table, plates))
+
+        # Süreç öldüyse bekleyen slotların sonucu hiç gelmez
+        if self.error is None and not self.process.is_alive():
+            self.error = f"worker süreci beklenmedik şekilde sonlandı (çıkış kodu {self.process.exitcode})"
+        if self.error is not None:
+            self.free_slots = list(range(self.slot_count))
+
+        return results
+
+    def stop(self, timeout=5.0):
+        """
+        Worker'ı durdur ve shared memory'yi serbest bırak
+        """
+        self.request_queue.put(None)
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+
+        if self.shared_memory is not None:
+            self.shared_memory.close()
+            self.shared_memory.unlink()
+            self.shared_memory = None
+
+        print(f"🧵 YOLO worker durduruldu: {self.stats}")
@@ -1,795 +1,1391 @@
-"""
-Yemek Fiyatı ve Garson Performansı Ölçme Sistemi
-Adım 1-2: Video Analizi, QR Kod Tespiti ve Zamanlayıcı Sistemi
-"""
-
-import cv2
-import numpy as np
-from pyzbar import pyzbar
-import time
-from datetime import datetime
-import json
-from table_manager import TableManager, TableStatus
-from waiter_detector import EnhancedWaiterDetector
-from yolo_food_detector import YOLOFoodDetector
-
-class QRCodeDetector:
-    def __init__(self):
-        # TableManager entegrasyonu
-        self.table_manager = TableManager()
-        self.waiter_detector = EnhancedWaiterDetector()
-        self.food_detector = YOLOFoodDetector()
-        
-        # QR kod tipleri - Demo video uyumlu
-        self.table_qr_codes = [
-            "MASA_1", "MASA_2", "MASA_3", "MASA_4",  # Standart format
-            "m001", "m002", "m003", "m004"  # Demo video formatı (masa kodları)
-        ]
-        self.waiter_qr_codes = [
-            "GARSON_1", "GARSON_2",  # Standart format
-            "w001", "w002", "g001", "g002"  # Demo video formatı (garson kodları)
-        ]
-        
-        # QR kod çeviri haritası
-        self.qr_translation = {
-            "m001": "MASA_1",
-            "m002": "MASA_2", 
-            "m003": "MASA_3",
-            "m004": "MASA_4",
-            "w001": "GARSON_1",
-            "w002": "GARSON_2",
-            "g001": "GARSON_1",  # garson 1
-            "g002": "GARSON_2"   # garson 2
-        }
-        
-        # QR detection counters
-        self.table_detection_counts = {
-            "MASA_1": 0,
-            "MASA_2": 0,
-            "MASA_3": 0,
-            "MASA_4": 0
-        }
-        
-        # Previous states for change detection
-        self.previous_table_states = {}
-        self.previous_waiter_states = {}
-        
-        # Eski sistem uyumluluğu için
-        self.table_states = self.table_manager.tables
-        
-    def detect_qr_codes(self, frame):
-        """
-        Frame'de QR kodları tespit et - Gelişmiş versiyon
-        Farklı açılardan ve rotasyonlarda QR kodları okuyabilir
-        """
-        qr_codes = []
-        
-        # Orijinal frame'i dene
-        decoded_objects = pyzbar.decode(frame)
-        qr_codes.extend(self._process_decoded_objects(decoded_objects))
-        
-        # Gri tonlamaya çevir (daha iyi tespit için)
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        decoded_objects = pyzbar.decode(gray)
-        qr_codes.extend(self._process_decoded_objects(decoded_objects))
-        
-        # Kontrast artırma
-        enhanced = cv2.convertScaleAbs(gray, alpha=1.5, beta=30)
-        decoded_objects = pyzbar.decode(enhanced)
-        qr_codes.extend(self._process_decoded_objects(decoded_objects))
-        
-        # Gaussian blur (gürültü azaltma)
-        blurred = cv2.GaussianBlur(gray, (3, 3), 0)
-        decoded_objects = pyzbar.decode(blurred)
-        qr_codes.extend(self._process_decoded_objects(decoded_objects))
-        
-        # Farklı rotasyonları dene (garson QR kodları için)
-        for angle in [90, 180, 270]:
-            rotated = self._rotate_image(gray, angle)
-            decoded_objects = pyzbar.decode(rotated)
-            rotated_qr_codes = self._process_decoded_objects(decoded_objects, rotation=angle)
-            qr_codes.extend(rotated_qr_codes)
-        
-        # Duplikasyonları temizle (aynı QR kod farklı yöntemlerle tespit edilebilir)
-        unique_qr_codes = self._remove_duplicate_qr_codes(qr_codes)
-        
-        return unique_qr_codes
-    
-    def _process_decoded_objects(self, decoded_objects, rotation=0):
-        """
-        Decode edilmiş QR objelerini işle
-        """
-        qr_codes = []
-        
-        for obj in decoded_objects:
-            try:
-                # QR kod verisi
-                qr_data = obj.data.decode('utf-8')
-                
-                # QR kod pozisyonu
-                points = obj.polygon
-                if len(points) == 4:
-                    # Bounding box koordinatları
-                    x = min([p.x for p in points])
-                    y = min([p.y for p in points])
-                    w = max([p.x for p in points]) - x
-                    h = max([p.y for p in points]) - y
-                    
-                    qr_codes.append({
-                        'data': qr_data,
-                        'bbox': (x, y, w, h),
-                        'center': (x + w//2, y + h//2),
-                        'rotation': rotation,
-                        'confidence': 1.0,  # pyzbar her zaman 1.0 döner
-                        'timestamp': datetime.now()
-                    })
-                    
-            except Exception as e:
-                print(f"⚠️ QR kod işleme hatası: {e}")
-                continue
-        
-        return qr_codes
-    
-    def _rotate_image(self, image, angle):
-        """
-        Görüntüyü belirtilen açıda döndür
-        """
-        if angle == 0:
-            return image
-            
-        (h, w) = image.shape[:2]
-        center = (w // 2, h // 2)
-        
-        # Rotasyon matrisini oluştur
-        M = cv2.getRotationMatrix2D(center, angle, 1.0)
-        
-        # Yeni boyutları hesapla
-        cos = np.abs(M[0, 0])
-        sin = np.abs(M[0, 1])
-        
-        new_w = int((h * sin) + (w * cos))
-        new_h = int((h * cos) + (w * sin))
-        
-        # Çeviri değerlerini ayarla
-        M[0, 2] += (new_w / 2) - center[0]
-        M[1, 2] += (new_h / 2) - center[1]
-        
-        # Döndürülmüş görüntüyü döndür
-        rotated = cv2.warpAffine(image, M, (new_w, new_h))
-        return rotated
-    
-    def _remove_duplicate_qr_codes(self, qr_codes):
-        """
-        Aynı QR kodun farklı yöntemlerle tespit edildiği duplikasyonları temizle
-        """
-        unique_codes = []
-        seen_data = set()
-        
-        # En yüksek confidence'a sahip olanları tercih et
-        sorted_codes = sorted(qr_codes, key=lambda x: x.get('confidence', 0), reverse=True)
-        
-        for qr in sorted_codes:
-            if qr['data'] not in seen_data:
-                unique_codes.append(qr)
-                seen_data.add(qr['data'])
-        
-        return unique_codes
-    
-    def draw_qr_codes(self, frame, qr_codes):
-        """
-        QR kodları frame üzerine çiz - Demo video uyumlu
-        """
-        for qr in qr_codes:
-            x, y, w, h = qr['bbox']
-            qr_data = qr['data']
-            translated = self._translate_qr_code(qr_data)
-            
-            # QR kod tipine göre renk ve stil seç
-            if self._is_table_qr(qr_data):
-                color = (0, 255, 0)  # Yeşil - Masa QR
-                label = f"MASA: {translated}"
-                thickness = 3
-            elif self._is_waiter_qr(qr_data):
-                color = (0, 0, 255)  # Kırmızı - Garson QR  
-                label = f"GARSON: {translated}"
-                thickness = 4
-                
-                # Garson QR kod için özel işaretleme
-                cv2.circle(frame, qr['center'], 10, (0, 255, 255), -1)  # Merkez nokta
-            else:
-                color = (255, 255, 255)  # Beyaz - Bilinmeyen QR
-                label = f"UNKNOWN: {qr_data[:10]}"
-                thickness = 2
-            
-            # Bounding box çiz
-            cv2.rectangle(frame, (x, y), (x + w, y + h), color, thickness)
-            
-            # Rotasyon bilgisi varsa göster
-            if qr.get('rotation', 0) != 0:
-                label += f" (Rot:{qr['rotation']}°)"
-            
-            # Label için arka plan
-            label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
-            cv2.rectangle(frame, (x, y - label_size[1] - 10), 
-                         (x + label_size[0] + 10, y), color, -1)
-            
-            # Label yazısı
-            cv2.putText(frame, label, (x + 5, y - 5), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-            
-            # Merkez çizgisi
-            cv2.line(frame, (qr['center'][0] - 10, qr['center'][1]), 
-                    (qr['center'][0] + 10, qr['center'][1]), color, 2)
-            cv2.line(frame, (qr['center'][0], qr['center'][1] - 10), 
-                    (qr['center'][0], qr['center'][1] + 10), color, 2)
-        
-        return frame
-    
-    def update_table_states(self, qr_codes):
-        """
-        Tespit edilen QR kodlara göre masa durumlarını güncelle - Demo video uyumlu
-        """
-        # Reset detection counts
-        for table in self.table_detection_counts:
-            self.table_detection_counts[table] = 0
-        
-        # QR kod verilerini çıkar ve çevir
-        table_qr_data = []
-        waiter_detections = []
-        
-        for qr in qr_codes:
-            qr_data = qr['data']
-            translated = self._translate_qr_code(qr_data)
-            
-            if self._is_table_qr(qr_data):
-                table_qr_data.append(translated)  # Çevrilmiş versiyonu kullan
-                if translated in self.table_detection_counts:
-                    self.table_detection_counts[translated] += 1
-                
-                # Only print if this is a state change (check after table manager update)
-                table_key = f"qr_detected_{translated}"
-                if table_key not in self.previous_table_states:
-                    print(f"🔍 Masa QR tespit edildi: {qr_data} → {translated}")
-                    self.previous_table_states[table_key] = True
-                    
-                    # Masa QR kodu tekrar okunursa hesabı sıfırla
-                    if translated in self.food_detector.detected_foods:
-                        self.food_detector.clear_table_bill(translated)
-                    
-            elif self._is_waiter_qr(qr_data):
-                waiter_detections.append({
-                    'waiter_id': translated,  # Çevrilmiş versiyonu kullan
-                    'original_id': qr_data,
-                    'position': qr['center'],
-                    'timestamp': qr['timestamp']
-                })
-                
-                # Only print waiter detection if it's a new detection or position change
-                waiter_key = f"{translated}_{qr['center']}"
-                if waiter_key not in self.previous_waiter_states:
-                    print(f"👨‍💼 Garson QR tespit edildi: {qr_data} → {translated}")
-                    self.previous_waiter_states[waiter_key] = True
-        
-        # TableManager ile masa durumlarını güncelle
-        previous_table_states_snapshot = {}
-        for table_name, table_data in self.table_manager.tables.items():
-            previous_table_states_snapshot[table_name] = table_data["status"]
-        
-        self.table_manager.update_table_qr_status(table_qr_data)
-        
-        # Masa durumu değişimlerini kontrol et - yeni müşteri geldiğinde hesap sıfırla
-        for table_name, table_data in self.table_manager.tables.items():
-            current_status = table_data["status"]
-            previous_status = previous_table_states_snapshot.get(table_name)
-            
-            # Müşteri geldi durumu: EMPTY -> WAITING
-            if previous_status == TableStatus.EMPTY and current_status == TableStatus.WAITING:
-                table_id = table_name.replace("table_", "MASA_")  # table_1 -> MASA_1
-                if table_id in self.food_detector.detected_foods:
-                    old_total = self.food_detector.clear_table_bill(table_id)
-                    if old_total > 0:
-                        print(f"🧾 {table_id}: Yeni müşteri - hesap sıfırlandı (Önceki: {old_total:.0f} TL)")
-        
-        # Garson tespitlerini işle - Enhanced Waiter Detector kullan
-        for waiter in waiter_detections:
-            # Enhanced waiter detector ile işle
-            detected_waiter = self.waiter_detector.process_waiter_qr(
-                waiter['original_id'], 
-                waiter['position'], 
-                waiter['timestamp']
-            )
-            
-            # Eski sistem uyumluluğu için TableManager'a da bildir
-            table_served, response_time = self.table_manager.waiter_detected(
-                waiter['waiter_id'], 
-                waiter['position']
-            )
-            if table_served:
-                print(f"✅ {waiter['original_id']} ({waiter['waiter_id']}) → {table_served.upper()}: {response_time:.1f}s")
-        
-        # Uyarı kontrolü (60 saniye) - sadece yeni uyarılar için
-        warnings = self.table_manager.check_warnings(60)
-        # Uyarılar zaten TableManager tarafından yazdırılıyor
-    
-    def detect_waiters(self, qr_codes):
-        """
-        Garson QR kodlarını tespit et
-        """
-        waiters_detected = []
-        
-        for qr in qr_codes:
-            if qr['data'] in self.waiter_qr_codes:
-                waiters_detected.append({
-                    'waiter_id': qr['data'],
-                    'position': qr['center'],
-                    'timestamp': qr['timestamp']
-                })
-        
-        return waiters_detected
-    
-    def draw_table_status(self, frame):
-        """
-        Masa durumlarını frame üzerine yazdır - Demo video uyumlu
-        """
-        y_offset = 30
-        
-        # Masa durumları - tüm masaları göster
-        cv2.putText(frame, "MASA DURUMU:", (10, y_offset), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        y_offset += 25
-        
-        # MASA_1 için gerçek durum bilgisi al
-        status_list = self.table_manager.get_table_status_display()
-        table1_status = None
-        for status in status_list:
-            if status['table'] == 'MASA_1':
-                table1_status = status
-                break
-        
-        # MASA_1 durumunu göster
-        if table1_status:
-            table_name = table1_status['table']
-            table_status = table1_status['status']
-            waiting_time = table1_status['waiting_time']
-            assigned_waiter = table1_status['assigned_waiter']
-            
-            # Durum metnini oluştur
-            if table_status == "empty":
-                status_text = f"{table_name}: BOS"
-                color = (0, 255, 0)  # Yeşil
-            elif table_status == "waiting":
-                status_text = f"{table_name}: BEKLIYOR ({waiting_time:.0f}s)"
-                color = (0, 255, 255)  # Sarı
-                if waiting_time > 60:
-                    color = (0, 0, 255)  # Kırmızı (60s+)
-            elif table_status == "served":
-                status_text = f"{table_name}: SERVIS"
-                color = (255, 0, 255)  # Magenta
-            else:  # occupied
-                status_text = f"{table_name}: DOLU"
-                color = (0, 0, 255)  # Kırmızı
-            
-            # Garson bilgisi ekle
-            if assigned_waiter:
-                status_text += f" ({assigned_waiter})"
-        else:
-            # MASA_1 için varsayılan
-            count = self.table_detection_counts.get("MASA_1", 0)
-            if count > 0:
-                status_text = f"MASA_1: Detected ({count})"
-                color = (0, 255, 0)  # Yeşil
-            else:
-                status_text = f"MASA_1: Tespit Edilmedi"
-                color = (0, 0, 255)  # Kırmızı
-        
-        cv2.putText(frame, status_text, (10, y_offset), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-        y_offset += 25
-        
-        # MASA_2, MASA_3, MASA_4 için Unknown durumu
-        for table_id in ["MASA_2", "MASA_3", "MASA_4"]:
-            status_text = f"{table_id}: Bilinmiyor"
-            color = (128, 128, 128)  # Gri - Unknown
-            
-            cv2.putText(frame, status_text, (10, y_offset), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-            y_offset += 25
-        
-        # Garson performans özeti - sadece aktif garsonlar
-        y_offset += 10
-        cv2.putText(frame, "GARSON PERFORMANSI:", (10, y_offset), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-        y_offset += 20
-        
-        performance = self.table_manager.get_performance_summary()
-        for waiter_id, perf in performance.items():
-            # Sadece servis yapmış garsonları göster
-            if perf['total_services'] > 0:
-                perf_text = f"{waiter_id}: Score:{perf['performance_score']} Avg:{perf['avg_response']}s"
-                
-                # Performans rengini belirle
-                score = perf['performance_score']
-                if score >= 80:
-                    perf_color = (0, 255, 0)  # Yeşil - İyi
-                elif score >= 60:
-                    perf_color = (0, 255, 255)  # Sarı - Orta
-                else:
-                    perf_color = (0, 0, 255)  # Kırmızı - Kötü
-                
-                cv2.putText(frame, perf_text, (10, y_offset), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, perf_color, 1)
-                y_offset += 20
-        
-        return frame
-    
-    def process_video(self, video_path):
-        """
-        Video dosyasını işle - Gelişmiş sürüm
-        """
-        # Video dosyasının varlığını kontrol et
-        import os
-        if not os.path.exists(video_path):
-            print(f"❌ Video dosyası bulunamadı: {video_path}")
-            print(f"💡 Lütfen video dosyasını '{video_path}' konumuna yerleştirin")
-            return None
-        
-        cap = cv2.VideoCapture(video_path)
-        
-        if not cap.isOpened():
-            print(f"❌ Video dosyası açılamadı: {video_path}")
-            print("💡 Video formatının desteklendiğinden emin olun (mp4, avi, mov)")
-            return None
-        
-        # Video bilgilerini al
-        fps = int(cap.get(cv2.CAP_PROP_FPS))
-        frame_count_total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        duration = frame_count_total / fps if fps > 0 else 0
-        
-        # Ekran boyutuna uygun olarak yeniden boyutlandırma
-        max_width = 1200
-        max_height = 800
-        scale_factor = min(max_width/width, max_height/height, 1.0)
-        new_width = int(width * scale_factor)
-        new_height = int(height * scale_factor)
-        
-        print(f"🎥 Video Bilgileri:")
-        print(f"   📁 Dosya: {video_path}")
-        print(f"   📐 Orijinal Boyut: {width}x{height}")
-        print(f"   📐 Görüntüleme Boyutu: {new_width}x{new_height}")
-        print(f"   ⏱️ FPS: {fps}")
-        print(f"   🎬 Toplam Frame: {frame_count_total}")
-        print(f"   ⏰ Süre: {duration:.1f} saniye")
-        print(f"\n🔍 QR kod tespiti başlatıldı...")
-        print(f"🍽️ Yemek tespit sistemi aktif...")
-        print(f"📋 Masa durumları takip ediliyor...")
-        print(f"\n[ESC] ile çıkış, [SPACE] ile duraklat/devam et, [R] ile başa dön, [C] ile hesap sıfırla\n")
-        
-        frame_count = 0
-        paused = False
-        qr_codes = []  # QR kodları için başlangıç değeri
-        
-        # OpenCV pencere ayarları
-        window_name = 'Restaurant QR Detection System'
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(window_name, new_width, new_height)
-        
-        # Ekran ortasına konumlandır
-        screen_width = 1920  # Varsayılan ekran genişliği
-        screen_height = 1080  # Varsayılan ekran yüksekliği
-        x_pos = (screen_width - new_width) // 2
-        y_pos = (screen_height - new_height) // 2
-        cv2.moveWindow(window_name, x_pos, y_pos)
-        
-        # Pencere her zaman görünür olsun
-        cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1)
-        
-        # FPS kontrolü için zamanlayıcı
-        import time
-        frame_delay = 1.0 / fps if fps > 0 else 1.0 / 30  # Minimum 30 FPS
-        last_frame_time = time.time()
-        
-        while True:
-            current_time = time.time()
-            
-            if not paused and (current_time - last_frame_time) >= frame_delay:
-                ret, frame = cap.read()
-                
-                if not ret:
-                    print("📹 Video sonu ulaşıldı - başa dönmek için [R] tuşuna basın")
-                    paused = True
-                    continue
-                
-                frame_count += 1
-                last_frame_time = current_time
-                
-                # Frame'i yeniden boyutlandır
-                if scale_factor < 1.0:
-                    frame = cv2.resize(frame, (new_width, new_height))
-                
-                # Her 2 frame'de bir QR kod tespiti yap (daha sık kontrol)
-                if frame_count % 2 == 0:
-                    # QR kodları tespit et
-                    qr_codes = self.detect_qr_codes(frame)
-                    
-                    # Masa durumlarını güncelle
-                    self.update_table_states(qr_codes)
-                    
-                    # Yemek tespiti yap (her 5 frame'de bir)
-                    if frame_count % 10 == 0:
-                        detected_foods = self.food_detector.detect_food_on_frame(frame)
-                        plates = self.food_detector.detect_plates_and_bowls(frame)
-                        
-                        # MASA_1 için yemek durumunu güncelle
-                        if detected_foods:
-                            food_count, total_price = self.food_detector.update_table_food_status('MASA_1', detected_foods)
-                    
-                    # Garsonları tespit et
-                    waiters = self.detect_waiters(qr_codes)
-                    if waiters:
-                        # Only print if it's a new waiter detection at a different position
-                        for waiter in waiters:
-                            waiter_pos_key = f"{waiter['waiter_id']}_{waiter['position'][0]}_{waiter['position'][1]}"
-                            if waiter_pos_key not in self.previous_waiter_states:
-                                print(f"👨‍💼 {waiter['waiter_id']} tespit edildi! Pozisyon: {waiter['position']}")
-                                self.previous_waiter_states[waiter_pos_key] = True
-                                
-                                # Clear old position states for this waiter (keep only recent ones)
-                                keys_to_remove = []
-                                for key in self.previous_waiter_states:
-                                    if key.startswith(waiter['waiter_id']) and key != waiter_pos_key:
-                                        keys_to_remove.append(key)
-                                
-                                # Keep only the last 5 positions to prevent memory issues
-                                if len(keys_to_remove) > 5:
-                                    for key in keys_to_remove[:-5]:
-                                        del self.previous_waiter_states[key]
-            
-            # Her durumda görselleştirme (frame varsa)
-            if 'frame' in locals() and frame is not None:
-                # QR kodları çiz
-                if qr_codes:
-                    frame = self.draw_qr_codes(frame, qr_codes)
-                
-                # Yemek tespitlerini çiz (eğer varsa)
-                if 'detected_foods' in locals() and detected_foods:
-                    plates_to_draw = plates if 'plates' in locals() else None
-                    frame = self.food_detector.draw_food_detections(frame, detected_foods, plates_to_draw)
-                
-                # Masa durumlarını çiz
-                frame = self.draw_table_status(frame)
-                
-                # Masa hesabını çiz (MASA_1 için)
-                frame = self.food_detector.draw_table_bill(frame, 'MASA_1', (frame.shape[1] - 300, 50))
-                
-                # Video bilgilerini çiz (yeni boyuta göre ayarlanmış)
-                info_text = f"Frame: {frame_count}/{frame_count_total} | {frame_count/fps:.1f}s/{duration:.1f}s"
-                if paused:
-                    info_text += " | DURAKLADI"
-                
-                cv2.putText(frame, info_text, (10, new_height - 20), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                
-                # QR kod sayısını göster
-                qr_count_text = f"QR Codes: {len(qr_codes) if qr_codes else 0}"
-                cv2.putText(frame, qr_count_text, (new_width - 150, new_height - 20), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
-                
-                # Enhanced waiter tracking görselleştirmesi kaldırıldı (çok karmaşa yapıyor)
-                
-                # Kontrol bilgilerini göster
-                control_text = "ESC:Cikis SPACE:Duraklat R:Baslat C:Hesap_Sifirla"
-                cv2.putText(frame, control_text, (10, 25), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
-                
-                # Ekranda göster
-                cv2.imshow(window_name, frame)
-            
-            # Klavye kontrolü - daha düşük bekleme süresi
-            key = cv2.waitKey(1) & 0xFF
-            
-            if key == 27:  # ESC - Çıkış
-                print("\n👋 Sistem kapatılıyor...")
-                break
-            elif key == ord(' '):  # SPACE - Duraklat/Devam et
-                paused = not paused
-                print(f"⏸️ {'Duraklatıldı' if paused else '▶️ Devam ediliyor'}")
-                if not paused:
-                    last_frame_time = time.time()  # Zamanlayıcıyı sıfırla
-            elif key == ord('r') or key == ord('R'):  # R - Başa dön
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                frame_count = 0
-                paused = False
-                last_frame_time = time.time()
-                print("🔄 Video başa döndürüldü")
-            elif key == ord('q') or key == ord('Q'):  # Q - Hızlı çıkış
-                break
-            elif key == ord('f') or key == ord('F'):  # F - Tam ekran toggle
-                # Pencere modunu değiştir
-                cv2.destroyWindow(window_name)
-                cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-                cv2.resizeWindow(window_name, new_width, new_height)
-                print("🖥️ Pencere boyutu yenilendi")
-            elif key == ord('c') or key == ord('C'):  # C - Hesap sıfırla
-                # MASA_1 hesabını manuel sıfırla
-                old_total = self.food_detector.clear_table_bill('MASA_1')
-                print(f"🧾 MASA_1 hesabı manuel olarak sıfırlandı (Önceki: {old_total:.0f} TL)")
-        
-        cap.release()
-        cv2.destroyAllWindows()
-        
-        # Son durum raporu
-        print(f"\n📊 Son Durum Raporu:")
-        
-        # Masa durumları
-        print("📋 Masa Durumları:")
-        status_list = self.table_manager.get_table_status_display()
-        for status in status_list:
-            table = status['table']
-            table_status = status['status']
-            customer_count = status['customer_count']
-            
-            if table_status == "empty":
-                status_emoji = "✅"
-            elif table_status == "waiting":
-                status_emoji = "⏰"
-            elif table_status == "served":
-                status_emoji = "🍽️"
-            else:
-                status_emoji = "👥"
-            
-            print(f"   {table}: {table_status.upper()} {status_emoji} (Müşteri sayısı: {customer_count})")
-        
-        # Garson performansı
-        print("\n👨‍💼 Garson Performansı:")
-        performance = self.table_manager.get_performance_summary()
-        for waiter_id, perf in performance.items():
-            print(f"   {waiter_id}:")
-            print(f"     • Performans Skoru: {perf['performance_score']}/100")
-            print(f"     • Ortalama Yanıt: {perf['avg_response']}s")
-            print(f"     • Toplam Servis: {perf['total_services']}")
-            print(f"     • Uyarı Sayısı: {perf['warnings']}")
-        
-        # Yemek tespiti raporu
-        print("\n🍽️ Yemek Tespiti Raporu:")
-        food_summaries = self.food_detector.get_all_tables_summary()
-        if food_summaries:
-            for summary in food_summaries:
-                table_id = summary['table_id']
-                items = summary['items']
-                total_price = summary['total_price']
-                print(f"   {table_id}:")
-                print(f"     • Toplam Tutar: {total_price:.0f} TL")
-                print(f"     • Yemek Sayısı: {summary['total_items']}")
-                if items:
-                    print("     • Siparişler:")
-                    for food_name, count in items.items():
-                        print(f"       - {count}x {food_name}")
-        else:
-            print("   Henüz yemek tespiti yapılmadı.")
-        
-        return self.table_states
-
-    def _translate_qr_code(self, qr_data):
-        """
-        Demo video QR kodlarını standart formata çevir
-        """
-        return self.qr_translation.get(qr_data, qr_data)
-    
-    def _is_table_qr(self, qr_data):
-        """
-        QR kodun masa kodu olup olmadığını kontrol et
-        """
-        translated = self._translate_qr_code(qr_data)
-        return translated.startswith("TABLE_") or qr_data in ["m001", "m002", "m003", "m004"]
-    
-    def _is_waiter_qr(self, qr_data):
-        """
-        QR kodun garson kodu olup olmadığını kontrol et
-        """
-        translated = self._translate_qr_code(qr_data)
-        return translated.startswith("WAITER_") or qr_data in ["w001", "w002", "g001", "g002"]
-    
-# Test fonksiyonu
-def test_qr_detector():
-    """
-    QR tespit sistemini test et
-    """
-    detector = QRCodeDetector()
-    
-    print("🧪 QR Kod Tespit Sistemi Test Ediliyor...")
-    print("📝 Masa durumları:")
-    
-    for table, state in detector.table_states.items():
-        print(f"   {table}: {state['status']}")
-    
-    print("\n🎯 Test tamamlandı!")
-    
-    # Eğer test videosu varsa işle
-    test_video = "test_video.mp4"  # Bu dosyayı sonra ekleyeceğiz
-    
-    print(f"\n📹 Test videosu aranıyor: {test_video}")
-    print("💡 Test videosu yoksa, önce örnek video dosyası eklemeniz gerekir.")
-    
-    return detector
-
-if __name__ == "__main__":
-    # Test çalıştır
-    detector = test_qr_detector()
-    
-    # Kullanıcıdan video seçimi iste
-    print("\n" + "="*60)
-    print("🎬 DEMO VIDEO SECIMI")
-    print("="*60)
-    print("Hangi demo videoyu kullanmak istiyorsunuz?")
-    print("1. demo_video.mp4 (Birinci aci)")
-    print("2. demo_video2.mp4 (Ikinci aci)")
-    print("3. Kendi video dosyanizi belirtin")
-    
-    while True:
-        choice = input("\nSeciminizi yapin (1/2/3): ").strip()
-        
-        if choice == "1":
-            video_file = "demo/demo_video.mp4"
-            print(f"✅ Secildi: {video_file}")
-            break
-        elif choice == "2":
-            video_file = "demo/demo_video2.mp4"
-            print(f"✅ Secildi: {video_file}")
-            break
-        elif choice == "3":
-            print("\n📁 Kendi video dosyanizi belirtin:")
-            print("Video dosyanizi proje klasorune koyun ve adini girin:")
-            print("Onerilen format: .mp4, .avi, .mov")
-            print("Ornek: demo/my_video.mp4")
-            
-            video_file = input("\n📹 Video dosya adi: ").strip()
-            
-            if not video_file:
-                print("❌ Lutfen bir dosya adi girin!")
-                continue
-                
-            # Dosya uzantısı kontrolü
-            if not any(video_file.lower().endswith(ext) for ext in ['.mp4', '.avi', '.mov', '.mkv', '.wmv']):
-                print("⚠️ Video dosya uzantisi eklemeyi unutmayin (.mp4, .avi, vb.)")
-                continue
-            
-            print(f"✅ Secildi: {video_file}")
-            break
-        else:
-            print("❌ Lutfen 1, 2 veya 3 secin!")
-            continue
-    
-    # Video dosyasının varlığını kontrol et
-    import os
-    if not os.path.exists(video_file):
-        print(f"\n❌ Video dosyasi bulunamadi: {video_file}")
-        print("💡 Lutfen dosyanin dogru konumda oldugunu emin olun.")
-        exit(1)
-    
-    try:
-        print(f"\n🚀 Video isleme baslatiliyor: {video_file}")
-        print("💡 Kontroller:")
-        print("   [ESC] - Cikis")
-        print("   [SPACE] - Duraklat/Devam et") 
-        print("   [R] - Basa don")
-        print("   [Q] - Hizli cikis")
-        print("   [F] - Pencere boyutunu yenile")
-        print("   [C] - Hesap sifirla")
-        print("\n⚠️ Video cok buyukse otomatik olarak kucultulecek")
-        print("⏳ Video aciliyor...")
-        
-        final_states = detector.process_video(video_file)
-        
-        if final_states:
-            print(f"\n✅ Video isleme tamamlandi!")
-            print(f"🎯 Sistem hazir, video dosyasi basariyla islendi.")
-        else:
-            print(f"\n❌ Video islenemedi!")
-            
-    except KeyboardInterrupt:
-        print(f"\n⏹️ Kullanici tarafindan durduruldu")
-    except Exception as e:
-        print(f"❌ Beklenmeyen hata: {e}")
-        print("🔄 Lutfen video dosyasinin dogru formatta oldugunu emin olun.")
+"""
+Yemek Fiyatı ve Garson Performansı Ölçme Sistemi
+Adım 1-2: Video Analizi, QR Kod Tespiti ve Zamanlayıcı Sistemi
+"""
+
+import time
+_import_start = time.perf_counter()
+
+import cv2
+import numpy as np
+from datetime import datetime
+import json
+import os
+from operator import attrgetter
+from table_manager import TableManager, TableStatus, VideoClock
+from waiter_detector import EnhancedWaiterDetector
+from yolo_food_detector import YOLOFoodDetector
+from inference_worker import InferenceWorker
+from shift_analytics import ShiftAnalytics, SALE, BILL_CLOSED, print_report
+from occupancy_heatmap import OccupancyTimeline, FloorHeatmap
+from frame_grabber import LatestFrameCapture
+from video_sources import open_video_source, source_exists
+from state_api import StateServer
+from qr_registry import QRRegistry, TABLE, WAITER
+from checkpoint import CheckpointWriter, capture_state, load_checkpoint, restore_state
+from detections import QRDetection, WaiterSighting
+from qr_cascade import QR_VARIANTS, VARIANT_ROTATIONS, iter_variant_images, validate_variants, load_cascade_profile
+from qr_decoders import DECODER_NAMES, create_decoder, sample_frames, calibrate_decoders, print_calibration
+from badge_markers import BADGE_MODES, DEFAULT_DICTIONARY, BadgeMarkerDetector
+from runtime_profiler import RuntimeProfiler, PROFILE_MODES, parse_profile_seconds
+
+# Başlangıç süresi raporu için (ultralytics/torch burada yüklenmez, model yüklenirken gelir)
+IMPORT_TIME = time.perf_counter() - _import_start
+
+class QRCodeDetector:
+    def __init__(self, food_detector=None, table_areas=None, inference_worker=None, analytics=None,
+                 qr_registry=None, qr_cascade=None, qr_decoder=None, badge_mode='qr',
+                 marker_dictionary=DEFAULT_DICTIONARY):
+        # Masa/garson QR kodları (varsayılan: MASA_1-4, GARSON_1-2 ve demo video kodları)
+        self.qr_registry = qr_registry if qr_registry is not None else QRRegistry()
+        
+        # Garson rozetleri: QR kodu veya ArUco marker'ı (marker'lar tek, rotasyondan bağımsız geçişte bulunur)
+        self.badge_mode = badge_mode
+        self.marker_dictionary = marker_dictionary
+        self.badge_detector = BadgeMarkerDetector(marker_dictionary) if badge_mode == 'aruco' else None
+        
+        # QR çözme varyantları (qr_cascade.py analiz aracının yazdığı profilden yüklenebilir)
+        # Rozet modunda rotasyon geçişleri varsayılan olarak çalışmaz (sadece eğik garson kartları içindi)
+        if qr_cascade:
+            self.qr_cascade = validate_variants(qr_cascade)
+        elif self.badge_detector is not None:
+            self.qr_cascade = [variant for variant in QR_VARIANTS if variant not in VARIANT_ROTATIONS]
+        else:
+            self.qr_cascade = list(QR_VARIANTS)
+        
+        # Varyantları çözen backend (varsayılan: sadece QR taranan pyzbar, calibrate_qr_decoder ile seçilebilir)
+        self.qr_decoder = create_decoder(qr_decoder or 'pyzbar')
+        
+        # Vardiya olay günlüğü (geliş/servis/uyarı/hesap olayları, kolon bazlı)
+        self.analytics = analytics if analytics is not None else ShiftAnalytics()
+        
+        # Zaman kaynağı: canlı modda duvar saati, offline analizde video zamanı (use_video_clock)
+        self.clock = datetime.now
+        
+        # TableManager entegrasyonu - masalar ve garson atamaları registry'den (--qr-config)
+        self.table_manager = TableManager(analytics=self.analytics, waiter_assignments={
+            table_id.replace("MASA_", "table_"): waiter_id
+            for table_id, waiter_id in self.qr_registry.waiter_assignments().items()
+        })
+        self.waiter_detector = EnhancedWaiterDetector(self.qr_registry)
+        self.food_detector = food_detector if food_detector is not None else YOLOFoodDetector()
+        
+        # QR detection counters
+        self.table_detection_counts = dict.fromkeys(self.qr_registry.entity_ids(TABLE), 0)
+        
+        # Previous states for change detection
+        self.previous_table_states = {}
+        self.previous_waiter_states = {}
+        
+        # Eski sistem uyumluluğu için
+        self.table_states = self.table_manager.tables
+        
+        # Masa durum sürelerinin zaman serisi ve garson konum ısı haritası (sabit bellek)
+        self.occupancy = OccupancyTimeline(name.replace("table_", "MASA_") for name in self.table_manager.tables)
+        self.floor_heatmap = None  # Video boyutu bilinince oluşturulur
+        self.show_heatmap = False
+        
+        # Masa bölgeleri {MASA_x: (x, y, w, h)} - verilirse yemekler masa bazlı faturalanır,
+        # verilmezse tüm frame MASA_1'e faturalanır
+        self.table_areas = table_areas or {}
+        
+        # Ayrı süreçte YOLO çıkarımı (verilirse ana döngü çıkarımı beklemez)
+        self.inference_worker = inference_worker
+        self.food_status = 'loading'  # 'loading' / 'ready' / 'disabled' - yükleme bitince bir daha sorulmaz
+        
+        # Uzun kayıtlar için periyodik checkpoint (enable_checkpoints ile açılır)
+        self.checkpoint_writer = None
+        self.checkpoint_interval = 300.0  # Video saniyesi
+        self.resume_frame = 0
+        self.resume_video = None
+        
+        # İstek üzerine frame döngüsü profili ([P] tuşu, SIGUSR1 veya POST /api/profile)
+        self.profiler = RuntimeProfiler()
+        
+    def detect_qr_codes(self, frame):
+        """
+        Frame'de QR kodları tespit et - Gelişmiş versiyon
+        Kaskad profilindeki ön işleme varyantlarında (varsayılan: ham, gri, kontrast, blur,
+        90/180/270 derece rotasyon) çözer; farklı açılardaki QR kodları okuyabilir
+        """
+        qr_codes = []
+        timestamp = time.monotonic_ns()  # Tüm geçişlerin tespitleri aynı frame zamanını taşır
+        
+        # Rozet marker'ları önce: aynı içerik QR olarak da okunursa alt piksel konumlu marker kalır
+        if self.badge_detector is not None:
+            qr_codes.extend(self._process_badge_markers(self.badge_detector.detect(frame), timestamp))
+        
+        for variant, image, rotation in iter_variant_images(frame, self.qr_cascade):
+            decoded_objects = self.qr_decoder.decode(image)
+            qr_codes.extend(self._process_decoded_objects(decoded_objects, rotation=rotation, timestamp=timestamp))
+        
+        # Duplikasyonları temizle (aynı QR kod farklı yöntemlerle tespit edilebilir)
+        unique_qr_codes = self._remove_duplicate_qr_codes(qr_codes)
+        
+        return unique_qr_codes
+    
+    def _process_decoded_objects(self, decoded_objects, rotation=0, timestamp=None):
+        """
+        Decode edilmiş QR objelerini QRDetection kayıtlarına çevir
+        timestamp: frame zamanı, time.monotonic_ns() (verilmezse şimdi)
+        """
+        qr_codes = []
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+        
+        for obj in decoded_objects:
+            try:
+                # QR kod verisi
+                qr_data = obj.data.decode('utf-8')
+                
+                # QR kod pozisyonu
+                points = obj.polygon
+                if len(points) == 4:
+                    # Bounding box koordinatları
+                    x = min([p.x for p in points])
+                    y = min([p.y for p in points])
+                    w = max([p.x for p in points]) - x
+                    h = max([p.y for p in points]) - y
+                    
+                    qr_codes.append(QRDetection(
+                        qr_data,
+                        self.qr_registry.lookup(obj.data),  # Bilinmeyen içerik: None
+                        (x, y, w, h),
+                        (x + w//2, y + h//2),
+                        rotation,
+                        1.0,  # Çözücüler güven skoru vermez
+                        timestamp
+                    ))
+                    
+            except Exception as e:
+                print(f"⚠️ QR kod işleme hatası: {e}")
+                continue
+        
+        return qr_codes
+    
+    def _process_badge_markers(self, markers, timestamp):
+        """
+        Rozet marker'larını QRDetection kayıtlarına çevir - merkez alt piksel köşelerin ortalaması,
+        rotation ölçülen yönelim (derece)
+        """
+        qr_codes = []
+        for marker in markers:
+            x, y = np.floor(marker.corners.min(axis=0)).astype(int)
+            x2, y2 = np.ceil(marker.corners.max(axis=0)).astype(int)
+            qr_codes.append(QRDetection(
+                marker.data,
+                self.qr_registry.lookup(marker.data),  # Tanımsız marker ID'si: None
+                (int(x), int(y), int(x2 - x), int(y2 - y)),
+                (int(round(marker.center[0])), int(round(marker.center[1]))),
+                int(round(marker.orientation)) % 360,
+                1.0,
+                timestamp
+            ))
+        return qr_codes
+    
+    def _remove_duplicate_qr_codes(self, qr_codes):
+        """
+        Aynı QR kodun farklı yöntemlerle tespit edildiği duplikasyonları temizle
+        """
+        unique_codes = []
+        seen_data = set()
+        
+        # En yüksek confidence'a sahip olanları tercih et
+        sorted_codes = sorted(qr_codes, key=attrgetter('confidence'), reverse=True)
+        
+        for qr in sorted_codes:
+            if qr.data not in seen_data:
+                unique_codes.append(qr)
+                seen_data.add(qr.data)
+        
+        return unique_codes
+    
+    def draw_qr_codes(self, frame, qr_codes):
+        """
+        QR kodları frame üzerine çiz - Demo video uyumlu
+        """
+        for qr in qr_codes:
+            x, y, w, h = qr.bbox
+            qr_data = qr.data
+            record = qr.record
+            
+            # QR kod tipine göre renk ve stil seç
+            if record is not None and record.kind == TABLE:
+                color = (0, 255, 0)  # Yeşil - Masa QR
+                label = f"MASA: {record.entity_id}"
+                thickness = 3
+            elif record is not None and record.kind == WAITER:
+                color = (0, 0, 255)  # Kırmızı - Garson QR  
+                label = f"GARSON: {record.entity_id}"
+                thickness = 4
+                
+                # Garson QR kod için özel işaretleme
+                cv2.circle(frame, qr.center, 10, (0, 255, 255), -1)  # Merkez nokta
+            else:
+                color = (255, 255, 255)  # Beyaz - Bilinmeyen QR
+                label = f"UNKNOWN: {qr_data[:10]}"
+                thickness = 2
+            
+            # Bounding box çiz
+            cv2.rectangle(frame, (x, y), (x + w, y + h), color, thickness)
+            
+            # Rotasyon bilgisi varsa göster
+            if qr.rotation != 0:
+                label += f" (Rot:{qr.rotation}°)"
+            
+            # Label için arka plan
+            label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+            cv2.rectangle(frame, (x, y - label_size[1] - 10), 
+                         (x + label_size[0] + 10, y), color, -1)
+            
+            # Label yazısı
+            cv2.putText(frame, label, (x + 5, y - 5), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            
+            # Merkez çizgisi
+            center_x, center_y = qr.center
+            cv2.line(frame, (center_x - 10, center_y), 
+                    (center_x + 10, center_y), color, 2)
+            cv2.line(frame, (center_x, center_y - 10), 
+                    (center_x, center_y + 10), color, 2)
+        
+        return frame
+    
+    def update_table_states(self, qr_codes):
+        """
+        Tespit edilen QR kodlara göre masa durumlarını güncelle - Demo video uyumlu
+        """
+        # Reset detection counts
+        for table in self.table_detection_counts:
+            self.table_detection_counts[table] = 0
+        
+        # QR kod verilerini çıkar ve çevir
+        table_qr_data = []
+        waiter_detections = []
+        
+        for qr in qr_codes:
+            record = qr.record
+            if record is None:
+                continue  # Bilinmeyen QR kodu
+            qr_data = qr.data
+            translated = record.entity_id
+            
+            if record.kind == TABLE:
+                table_qr_data.append(translated)  # Çevrilmiş versiyonu kullan
+                if translated in self.table_detection_counts:
+                    self.table_detection_counts[translated] += 1
+                
+                # Only print if this is a state change (check after table manager update)
+                table_key = f"qr_detected_{translated}"
+                if table_key not in self.previous_table_states:
+                    print(f"🔍 Masa QR tespit edildi: {qr_data} → {translated}")
+                    self.previous_table_states[table_key] = True
+                    
+                    # Masa QR kodu tekrar okunursa hesabı sıfırla
+                    if translated in self.food_detector.detected_foods:
+                        self._clear_table_bill(translated)
+                    
+            elif record.kind == WAITER:
+                # Çevrilmiş versiyonu kullan
+                waiter_detections.append(WaiterSighting(translated, qr_data, qr.center, qr.timestamp))
+                
+                # Only print waiter detection if it's a new detection or position change
+                # (garson başına son konum tutulur - vardiya boyunca sınırlı)
+                if self.previous_waiter_states.get(translated) != qr.center:
+                    print(f"👨‍💼 Garson QR tespit edildi: {qr_data} → {translated} Pozisyon: {qr.center}")
+                    self.previous_waiter_states[translated] = qr.center
+        
+        # TableManager ile masa durumlarını güncelle
+        previous_table_states_snapshot = {}
+        for table_name, table_data in self.table_manager.tables.items():
+            previous_table_states_snapshot[table_name] = table_data["status"]
+        
+        self.table_manager.update_table_qr_status(table_qr_data)
+        
+        # Masa durumu değişimlerini kontrol et - yeni müşteri geldiğinde hesap sıfırla
+        for table_name, table_data in self.table_manager.tables.items():
+            current_status = table_data["status"]
+            previous_status = previous_table_states_snapshot.get(table_name)
+            
+            # Müşteri geldi durumu: EMPTY -> WAITING
+            if previous_status == TableStatus.EMPTY and current_status == TableStatus.WAITING:
+                table_id = table_name.replace("table_", "MASA_")  # table_1 -> MASA_1
+                if table_id in self.food_detector.detected_foods:
+                    old_total = self._clear_table_bill(table_id)
+                    if old_total > 0:
+                        print(f"🧾 {table_id}: Yeni müşteri - hesap sıfırlandı (Önceki: {old_total:.0f} TL)")
+        
+        # Garson tespitlerini işle - Enhanced Waiter Detector kullan
+        for waiter in waiter_detections:
+            # Enhanced waiter detector ile işle
+            detected_waiter = self.waiter_detector.process_waiter_qr(
+                waiter.original_id, 
+                waiter.position, 
+                waiter.timestamp
+            )
+            
+            # Eski sistem uyumluluğu için TableManager'a da bildir
+            table_served, response_time = self.table_manager.waiter_detected(
+                waiter.waiter_id, 
+                waiter.position
+            )
+            if table_served:
+                print(f"✅ {waiter.original_id} ({waiter.waiter_id}) → {table_served.upper()}: {response_time:.1f}s")
+        
+        # Uyarı kontrolü (60 saniye) - sadece yeni uyarılar için
+        warnings = self.table_manager.check_warnings(60)
+        # Uyarılar zaten TableManager tarafından yazdırılıyor
+        
+        # Doluluk zaman serisi ve garson ısı haritası
+        self.occupancy.update([table_data["status"] for table_data in self.table_manager.tables.values()],
+                              self.clock().timestamp())
+        if self.floor_heatmap is not None and waiter_detections:
+            self.floor_heatmap.add([waiter.position for waiter in waiter_detections])
+    
+    def detect_waiters(self, qr_codes):
+        """
+        Garson QR kodlarını tespit et
+        """
+        waiters_detected = []
+        
+        for qr in qr_codes:
+            record = qr.record
+            if record is not None and record.kind == WAITER:
+                waiters_detected.append(WaiterSighting(record.entity_id, qr.data, qr.center, qr.timestamp))
+        
+        return waiters_detected
+    
+    def draw_table_status(self, frame):
+        """
+        Masa durumlarını frame üzerine yazdır - Demo video uyumlu
+        """
+        y_offset = 30
+        
+        # Masa durumları - tüm masaları göster
+        cv2.putText(frame, "MASA DURUMU:", (10, y_offset), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        y_offset += 25
+        
+        # MASA_1 için gerçek durum bilgisi al
+        status_list = self.table_manager.get_table_status_display()
+        table1_status = None
+        for status in status_list:
+            if status['table'] == 'MASA_1':
+                table1_status = status
+                break
+        
+        # MASA_1 durumunu göster
+        if table1_status:
+            table_name = table1_status['table']
+            table_status = table1_status['status']
+            waiting_time = table1_status['waiting_time']
+            assigned_waiter = table1_status['assigned_waiter']
+            
+            # Durum metnini oluştur
+            if table_status == "empty":
+                status_text = f"{table_name}: BOS"
+                color = (0, 255, 0)  # Yeşil
+            elif table_status == "waiting":
+                status_text = f"{table_name}: BEKLIYOR ({waiting_time:.0f}s)"
+                color = (0, 255, 255)  # Sarı
+                if waiting_time > 60:
+                    color = (0, 0, 255)  # Kırmızı (60s+)
+            elif table_status == "served":
+                status_text = f"{table_name}: SERVIS"
+                color = (255, 0, 255)  # Magenta
+            else:  # occupied
+                status_text = f"{table_name}: DOLU"
+                color = (0, 0, 255)  # Kırmızı
+            
+            # Garson bilgisi ekle
+            if assigned_waiter:
+                status_text += f" ({assigned_waiter})"
+        else:
+            # MASA_1 için varsayılan
+            count = self.table_detection_counts.get("MASA_1", 0)
+            if count > 0:
+                status_text = f"MASA_1: Detected ({count})"
+                color = (0, 255, 0)  # Yeşil
+            else:
+                status_text = f"MASA_1: Tespit Edilmedi"
+                color = (0, 0, 255)  # Kırmızı
+        
+        cv2.putText(frame, status_text, (10, y_offset), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+        y_offset += 25
+        
+        # MASA_2, MASA_3, MASA_4 için Unknown durumu
+        for table_id in ["MASA_2", "MASA_3", "MASA_4"]:
+            status_text = f"{table_id}: Bilinmiyor"
+            color = (128, 128, 128)  # Gri - Unknown
+            
+            cv2.putText(frame, status_text, (10, y_offset), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            y_offset += 25
+        
+        # Garson performans özeti - sadece aktif garsonlar
+        y_offset += 10
+        cv2.putText(frame, "GARSON PERFORMANSI:", (10, y_offset), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        y_offset += 20
+        
+        performance = self.table_manager.get_performance_summary()
+        for waiter_id, perf in performance.items():
+            # Sadece servis yapmış garsonları göster
+            if perf['total_services'] > 0:
+                perf_text = f"{waiter_id}: Score:{perf['performance_score']} Avg:{perf['avg_response']}s"
+                
+                # Performans rengini belirle
+                score = perf['performance_score']
+                if score >= 80:
+                    perf_color = (0, 255, 0)  # Yeşil - İyi
+                elif score >= 60:
+                    perf_color = (0, 255, 255)  # Sarı - Orta
+                else:
+                    perf_color = (0, 0, 255)  # Kırmızı - Kötü
+                
+                cv2.putText(frame, perf_text, (10, y_offset), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, perf_color, 1)
+                y_offset += 20
+        
+        return frame
+    
+    def process_video(self, video_path, live=False):
+        """
+        Video dosyasını işle - Gelişmiş sürüm
+        video_path: video dosyası, resim klasörü, .raw ham frame dosyası, kamera indeksi veya synthetic[:saniye]
+        live=True: kaynak (kamera indeksi, yayın URL'si veya dosya) ayrı thread'de okunur,
+        her zaman en yeni frame işlenir, yetişilemeyen frame'ler atlanır
+        """
+        # Video dosyasının varlığını kontrol et
+        if not live and not source_exists(video_path):
+            print(f"❌ Video dosyası bulunamadı: {video_path}")
+            print(f"💡 Lütfen video dosyasını '{video_path}' konumuna yerleştirin")
+            return None
+        
+        if live:
+            cap = LatestFrameCapture(video_path)
+            print("📡 Canlı mod: en yeni frame işlenir, geride kalınca eski frame'ler atlanır")
+        else:
+            cap = open_video_source(video_path)
+        
+        if not cap.isOpened():
+            print(f"❌ Video dosyası açılamadı: {video_path}")
+            print("💡 Video formatının desteklendiğinden emin olun (mp4, avi, mov)")
+            return None
+        
+        # Video bilgilerini al
+        fps = int(cap.get(cv2.CAP_PROP_FPS))
+        frame_count_total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        duration = frame_count_total / fps if fps > 0 else 0
+        
+        # Ekran boyutuna uygun olarak yeniden boyutlandırma
+        max_width = 1200
+        max_height = 800
+        scale_factor = min(max_width/width, max_height/height, 1.0)
+        new_width = int(width * scale_factor)
+        new_height = int(height * scale_factor)
+        
+        print(f"🎥 Video Bilgileri:")
+        print(f"   📁 Dosya: {video_path}")
+        print(f"   📐 Orijinal Boyut: {width}x{height}")
+        print(f"   📐 Görüntüleme Boyutu: {new_width}x{new_height}")
+        print(f"   ⏱️ FPS: {fps}")
+        print(f"   🎬 Toplam Frame: {frame_count_total}")
+        print(f"   ⏰ Süre: {duration:.1f} saniye")
+        print(f"\n🔍 QR kod tespiti başlatıldı...")
+        print(f"🍽️ Yemek tespit sistemi aktif...")
+        print(f"📋 Masa durumları takip ediliyor...")
+        print(f"\n[ESC] ile çıkış, [SPACE] ile duraklat/devam et, [R] ile başa dön, [C] ile hesap sıfırla, "
+              f"[H] ile ısı haritası, [P] ile {self.profiler.seconds:g} saniyelik profil\n")
+        
+        if self.floor_heatmap is None:
+            self.floor_heatmap = FloorHeatmap((new_height, new_width))
+        
+        frame_count = self._seek_to_resume_frame(cap, video_path)
+        last_checkpoint = frame_count
+        checkpoint_frames = max(1, int(self.checkpoint_interval * (fps or 30)))
+        paused = False
+        qr_codes = []  # QR kodları için başlangıç değeri
+        
+        # OpenCV pencere ayarları
+        window_name = 'Restaurant QR Detection System'
+        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(window_name, new_width, new_height)
+        
+        # Ekran ortasına konumlandır
+        screen_width = 1920  # Varsayılan ekran genişliği
+        screen_height = 1080  # Varsayılan ekran yüksekliği
+        x_pos = (screen_width - new_width) // 2
+        y_pos = (screen_height - new_height) // 2
+        cv2.moveWindow(window_name, x_pos, y_pos)
+        
+        # Pencere her zaman görünür olsun
+        cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1)
+        
+        # FPS kontrolü için zamanlayıcı
+        import time
+        frame_delay = 1.0 / fps if fps > 0 else 1.0 / 30  # Minimum 30 FPS
+        last_frame_time = time.time()
+        profile_tags = lambda: self._profile_tags('live' if live else 'video', fps)
+        
+        while True:
+            current_time = time.time()
+            self.profiler.poll(frame_count, profile_tags)
+            
+            # Canlı modda tempo kaynağa aittir: read() yeni frame gelene kadar bekler
+            if not paused and (live or (current_time - last_frame_time) >= frame_delay):
+                ret, frame = cap.read()
+                
+                if ret is None:
+                    # Canlı kaynakta zaman aşımı: yeni frame yok (yakalayıcı yeniden bağlanıyor olabilir)
+                    if cv2.waitKey(1) & 0xFF == 27:
+                        break
+                    continue
+                
+                if not ret:
+                    print("📹 Video sonu ulaşıldı - başa dönmek için [R] tuşuna basın")
+                    paused = True
+                    continue
+                
+                frame_count += 1
+                last_frame_time = current_time
+                
+                # Frame'i yeniden boyutlandır
+                if scale_factor < 1.0:
+                    frame = cv2.resize(frame, (new_width, new_height))
+                elif not frame.flags.writeable:
+                    frame = frame.copy()  # Salt okunur kaynak (.raw mmap) - üzerine çizim yapılacak
+                
+                # Her 2 frame'de bir QR kod tespiti yap (daha sık kontrol)
+                if frame_count % 2 == 0:
+                    # QR kodları tespit et
+                    qr_codes = self.detect_qr_codes(frame)
+                    
+                    # Masa durumlarını güncelle
+                    self.update_table_states(qr_codes)
+                    
+                    # Yemek tespiti yap (her 5 frame'de bir)
+                    if frame_count % 10 == 0 and self.inference_worker:
+                        # Frame worker'a gönderilir, sonuç geldiğinde uygulanır
+                        self.inference_worker.submit(frame, frame_count)
+                    elif frame_count % 10 == 0:
+                        foods_by_table = self.food_detector.detect_food_by_table([frame], self.table_areas)[0]
+                        detected_foods = [food for foods in foods_by_table.values() for food in foods]
+                        plates = self.food_detector.detect_plates_and_bowls(frame)
+                        
+                        # Masa bazlı yemek durumunu güncelle
+                        self._update_food_status(foods_by_table)
+                    
+                # Periyodik checkpoint (worker'da sonucu bekleyen frame varken ertelenir)
+                if self.checkpoint_writer and frame_count - last_checkpoint >= checkpoint_frames \
+                        and self._worker_idle():
+                    self._save_checkpoint(frame_count, video_path)
+                    last_checkpoint = frame_count
+                
+                # Isı haritası yeni frame'e bir kez bindirilir (duraklatınca üst üste binmesin)
+                if self.show_heatmap:
+                    frame = self.floor_heatmap.render(frame)
+                    strip = self.occupancy.render(bins=min(120, (new_width - 20) // 4))
+                    frame[new_height - 70 - strip.shape[0]:new_height - 70, 10:10 + strip.shape[1]] = strip
+            
+            # Worker'dan gelen yemek tespitlerini uygula (frame sırasıyla gelir)
+            if self.inference_worker:
+                for result_frame_id, foods_by_table, plates in self.inference_worker.poll_results():
+                    detected_foods = [food for foods in foods_by_table.values() for food in foods]
+                    self._update_food_status(foods_by_table)
+                if self.inference_worker.error:
+                    self._fall_back_to_local_inference()
+            
+            # Her durumda görselleştirme (frame varsa)
+            if 'frame' in locals() and frame is not None:
+                # QR kodları çiz
+                if qr_codes:
+                    frame = self.draw_qr_codes(frame, qr_codes)
+                
+                # Yemek tespitlerini çiz (eğer varsa)
+                if 'detected_foods' in locals() and detected_foods:
+                    plates_to_draw = plates if 'plates' in locals() else None
+                    frame = self.food_detector.draw_food_detections(frame, detected_foods, plates_to_draw)
+                
+                # Masa durumlarını çiz
+                frame = self.draw_table_status(frame)
+                
+                # Masa bölgelerini ve hesaplarını çiz
+                if self.table_areas:
+                    frame = self.food_detector.draw_table_areas(frame, self.table_areas)
+                bill_y = 50
+                for table_id in self._billed_tables():
+                    frame = self.food_detector.draw_table_bill(frame, table_id, (frame.shape[1] - 300, bill_y))
+                    if table_id in self.food_detector.detected_foods:
+                        bill_y += 140
+                
+                # Video bilgilerini çiz (yeni boyuta göre ayarlanmış)
+                if live:
+                    info_text = f"Frame: {frame_count} | Atlanan: {cap.get_stats()['dropped']}"
+                else:
+                    info_text = f"Frame: {frame_count}/{frame_count_total} | {frame_count/fps:.1f}s/{duration:.1f}s"
+                if paused:
+                    info_text += " | DURAKLADI"
+                
+                adaptive_stats = self.get_inference_stats().get('adaptive')
+                if adaptive_stats:
+                    info_text += f" | YOLO {adaptive_stats['imgsz']}px"
+                
+                cv2.putText(frame, info_text, (10, new_height - 20), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                
+                # QR kod sayısını göster
+                qr_count_text = f"QR Codes: {len(qr_codes) if qr_codes else 0}"
+                cv2.putText(frame, qr_count_text, (new_width - 150, new_height - 20), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+                
+                # Enhanced waiter tracking görselleştirmesi kaldırıldı (çok karmaşa yapıyor)
+                
+                # Model arka planda yükleniyorsa veya yüklenemediyse göster (QR takibi bu sırada çalışır)
+                if self.food_status == 'loading':
+                    self.food_status = self._food_detection_status()
+                if self.food_status == 'loading':
+                    cv2.putText(frame, "Yemek modeli yukleniyor...", (10, new_height - 45),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 165, 255), 1)
+                elif self.food_status == 'disabled':
+                    cv2.putText(frame, "Yemek tespiti kapali (model yuklenemedi)", (10, new_height - 45),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+                
+                # Kontrol bilgilerini göster
+                control_text = "ESC:Cikis SPACE:Duraklat R:Baslat C:Hesap_Sifirla H:Isi_Haritasi P:Profil"
+                cv2.putText(frame, control_text, (10, 25), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+                
+                # Ekranda göster
+                cv2.imshow(window_name, frame)
+            
+            # Klavye kontrolü - daha düşük bekleme süresi
+            key = cv2.waitKey(1) & 0xFF
+            
+            if key == 27:  # ESC - Çıkış
+                print("\n👋 Sistem kapatılıyor...")
+                break
+            elif key == ord(' '):  # SPACE - Duraklat/Devam et
+                paused = not paused
+                print(f"⏸️ {'Duraklatıldı' if paused else '▶️ Devam ediliyor'}")
+                if not paused:
+                    last_frame_time = time.time()  # Zamanlayıcıyı sıfırla
+            elif key == ord('r') or key == ord('R'):  # R - Başa dön
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                frame_count = 0
+                last_checkpoint = 0
+                paused = False
+                last_frame_time = time.time()
+                print("🔄 Video başa döndürüldü")
+            elif key == ord('q') or key == ord('Q'):  # Q - Hızlı çıkış
+                break
+            elif key == ord('f') or key == ord('F'):  # F - Tam ekran toggle
+                # Pencere modunu değiştir
+                cv2.destroyWindow(window_name)
+                cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+                cv2.resizeWindow(window_name, new_width, new_height)
+                print("🖥️ Pencere boyutu yenilendi")
+            elif key == ord('h') or key == ord('H'):  # H - Isı haritası
+                self.show_heatmap = not self.show_heatmap
+                print(f"🌡️ Isı haritası {'açık' if self.show_heatmap else 'kapalı'}")
+            elif key == ord('p') or key == ord('P'):  # P - Profil al
+                print(f"🔬 Profil isteği: {self.profiler.request()}")
+            elif key == ord('c') or key == ord('C'):  # C - Hesap sıfırla
+                # Faturalanan masaların hesabını manuel sıfırla
+                for table_id in self._billed_tables():
+                    old_total = self._clear_table_bill(table_id)
+                    print(f"🧾 {table_id} hesabı manuel olarak sıfırlandı (Önceki: {old_total:.0f} TL)")
+        
+        if live:
+            capture_stats = cap.get_stats()
+            print(f"📡 Canlı yakalama: {capture_stats['grabbed']} frame okundu, {capture_stats['delivered']} işlendi, "
+                  f"{capture_stats['dropped']} atlandı (%{capture_stats['drop_rate'] * 100:.1f})")
+            if capture_stats['read_failures']:
+                print(f"   ⚠️ {capture_stats['read_failures']} okuma hatası, kaynak {capture_stats['reopened']} kez yeniden açıldı")
+        
+        cap.release()
+        cv2.destroyAllWindows()
+        self.profiler.close()
+        
+        if self.inference_worker:
+            self.inference_worker.stop()
+        
+        # Çıkıştaki konum da kaydedilir (--resume ile buradan devam edilir)
+        self._close_checkpoints(frame_count, video_path)
+        
+        # Son durum raporu
+        self.print_final_report()
+        
+        return self.table_states
+
+    def analyze_video_offline(self, video_path, batch_size=8):
+        """
+        Kayıtlı videoyu pencere açmadan analiz et - Batch YOLO çıkarımı
+        Yemek tespiti yapılacak frame'ler batch_size'lık gruplar halinde tek seferde
+        modele verilir, sonuçlar frame sırasıyla masa durumlarına uygulanır
+        """
+        if not source_exists(video_path):
+            print(f"❌ Video dosyası bulunamadı: {video_path}")
+            return None
+        
+        cap = open_video_source(video_path)
+        
+        if not cap.isOpened():
+            print(f"❌ Video dosyası açılamadı: {video_path}")
+            return None
+        
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        
+        # Canlı mod ile aynı boyutlandırma (aynı tespit sonuçları için)
+        scale_factor = min(1200/width, 800/height, 1.0)
+        new_width = int(width * scale_factor)
+        new_height = int(height * scale_factor)
+        
+        print(f"🎞️ Offline analiz başlatıldı: {video_path} (batch boyutu: {batch_size})")
+        
+        # Süreler video zamanından ölçülür (batch işleme hızından bağımsız, tekrarlanabilir)
+        if not isinstance(self.clock, VideoClock):
+            self.use_video_clock(video_path, cap)
+        
+        if self.floor_heatmap is None:
+            self.floor_heatmap = FloorHeatmap((new_height, new_width))
+        
+        # Offline sonuçların canlı mod ile aynı olması için model hazır olmalı
+        self.food_detector.model_ready.wait()
+        if self.food_detector.model_error:
+            print(f"⚠️ Yemek tespiti kapalı, analiz sadece QR/garson takibiyle yapılacak ({self.food_detector.model_error})")
+        
+        frame_count = self._seek_to_resume_frame(cap, video_path)
+        last_checkpoint = frame_count
+        checkpoint_frames = max(1, int(self.checkpoint_interval * (cap.get(cv2.CAP_PROP_FPS) or 30)))
+        pending_steps = []  # (frame_no, qr_codes, yemek frame'i mi) - frame sırasıyla
+        pending_food_frames = []
+        start_time = time.time()
+        source_fps = cap.get(cv2.CAP_PROP_FPS)
+        profile_tags = lambda: self._profile_tags('offline', source_fps)
+        
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            
+            frame_count += 1
+            self.profiler.poll(frame_count, profile_tags)
+            
+            # Canlı mod ile aynı örnekleme: her 2 frame'de QR, her 10 frame'de yemek
+            if frame_count % 2 != 0:
+                continue
+            
+            if scale_factor < 1.0:
+                frame = cv2.resize(frame, (new_width, new_height))
+            
+            is_food_frame = frame_count % 10 == 0
+            pending_steps.append((frame_count, self.detect_qr_codes(frame), is_food_frame))
+            
+            if is_food_frame:
+                pending_food_frames.append(frame)
+                if len(pending_food_frames) >= batch_size:
+                    self._apply_offline_batch(pending_steps, pending_food_frames)
+                    
+                    # Batch sınırında tüm frame'ler uygulanmış olur - checkpoint tutarlıdır
+                    if self.checkpoint_writer and frame_count - last_checkpoint >= checkpoint_frames:
+                        self._save_checkpoint(frame_count, video_path)
+                        last_checkpoint = frame_count
+        
+        # Kalan yarım batch'i işle
+        self._apply_offline_batch(pending_steps, pending_food_frames)
+        cap.release()
+        self.profiler.close()
+        self._close_checkpoints(frame_count, video_path)
+        
+        elapsed = time.time() - start_time
+        print(f"✅ Offline analiz tamamlandı: {frame_count} frame, {elapsed:.1f}s "
+              f"({frame_count / elapsed if elapsed > 0 else 0:.1f} FPS)")
+        
+        self.print_final_report()
+        
+        return self.table_states
+    
+    def _apply_offline_batch(self, pending_steps, pending_food_frames):
+        """
+        Bekleyen frame'lerin yemek tespitini tek batch'te yap ve
+        QR/yemek güncellemelerini canlı moddaki sırayla uygula
+        """
+        batch_results = iter(self.food_detector.detect_food_by_table(pending_food_frames, self.table_areas))
+        
+        for frame_no, qr_codes, is_food_frame in pending_steps:
+            self.apply_observation(frame_no, qr_codes, next(batch_results) if is_food_frame else None)
+        
+        pending_steps.clear()
+        pending_food_frames.clear()
+    
+    def apply_observation(self, frame_no, qr_codes, foods_by_table=None):
+        """
+        Tek frame'in tespitlerini video saatinde durumlara uygula (offline ve paralel segment analizi)
+        """
+        self.clock.set_frame(frame_no)
+        self.update_table_states(qr_codes)
+        if foods_by_table is not None:
+            self._update_food_status(foods_by_table)
+    
+    def use_video_clock(self, video_path, cap):
+        """
+        Zamanlayıcıları video zamanına geçir - başlangıç: dosya ise kaydın başlangıcı (değişiklik zamanı - süre)
+        """
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        start = None
+        if os.path.isfile(str(video_path)):
+            duration = cap.get(cv2.CAP_PROP_FRAME_COUNT) / fps
+            start = datetime.fromtimestamp(os.path.getmtime(video_path) - duration)
+        self.clock = VideoClock(fps, start)
+        self.table_manager.set_clock(self.clock)
+    
+    def calibrate_qr_decoder(self, video_path, recall_target=0.98, max_frames=30, sample_every=15):
+        """
+        Kaynaktan örnek frame'lerde QR çözücüleri kaskadla ölç, recall hedefini sağlayan en hızlısını kullan
+        """
+        source = open_video_source(video_path)
+        frames, truth = sample_frames(source, max_frames, sample_every)
+        source.release()
+        if not frames:
+            print(f"⚠️ QR çözücü kalibrasyonu için frame okunamadı, {self.qr_decoder.name} kullanılıyor")
+            return self.qr_decoder.name
+        
+        print(f"\n📊 QR çözücü kalibrasyonu ({len(frames)} frame, kaskad {'+'.join(self.qr_cascade)}):")
+        chosen, results = calibrate_decoders(frames, self.qr_cascade, truth, recall_target)
+        print_calibration(chosen, results, recall_target)
+        self.qr_decoder = create_decoder(chosen)
+        return chosen
+    
+    def enable_checkpoints(self, path, interval_seconds=300.0):
+        """
+        Her interval_seconds video saniyesinde durumu path'e kaydet (arka planda, atomik)
+        """
+        self.checkpoint_writer = CheckpointWriter(path)
+        self.checkpoint_interval = interval_seconds
+    
+    def resume_from_checkpoint(self, path):
+        """
+        Checkpoint'teki durumu yükle - video işleme kaydedilen frame'den devam eder
+        """
+        state = load_checkpoint(path)
+        self.resume_frame = restore_state(self, state)
+        self.resume_video = state['video']
+        print(f"⏩ Checkpoint yüklendi: {path} ({state['video']}, frame {self.resume_frame}, "
+              f"{datetime.fromtimestamp(state['saved_at']).strftime('%H:%M:%S')} kaydı)")
+        return self.resume_frame
+    
+    def _seek_to_resume_frame(self, cap, video_path):
+        """
+        Checkpoint'ten devam ediliyorsa kaynağı kaydedilen frame'e sar - başlangıç frame sayacı
+        """
+        frame_count, self.resume_frame = self.resume_frame, 0
+        if frame_count:
+            if self.resume_video != str(video_path):
+                print(f"⚠️ Checkpoint başka bir kaynağa ait: {self.resume_video}")
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_count)
+            print(f"⏩ Frame {frame_count}'den devam ediliyor")
+        return frame_count
+    
+    def _fall_back_to_local_inference(self):
+        """
+        Worker modeli yükleyemedi veya süreç öldü: worker'ı kapat, yemek tespitine bu süreçte devam et
+        (model arka planda yüklenir, QR takibi beklemez)
+        """
+        print(f"⚠️ YOLO worker kullanılamıyor ({self.inference_worker.error}) - yemek tespiti bu süreçte yapılacak")
+        self.inference_worker.stop()
+        self.inference_worker = None
+        if self.food_detector.model is None:
+            self.food_detector.start_background_load()
+            self.food_status = 'loading'
+    
+    def _worker_idle(self):
+        """
+        Worker'da sonucu beklenen frame yok mu (checkpoint o frame'in yemeklerini kaçırmasın)
+        """
+        return not self.inference_worker or len(self.inference_worker.free_slots) == self.inference_worker.slot_count
+    
+    def _save_checkpoint(self, frame_count, video_path):
+        """
+        Durumu pickle et (frame döngüsünde, tutarlı) ve yazıcıya ver (sıkıştırma/disk arka planda)
+        """
+        self.checkpoint_writer.submit(capture_state(self, frame_count, video_path))
+    
+    def _profile_tags(self, run_mode, source_fps):
+        """
+        Profil etiketleri: çalışma modu, kaynak FPS'i, QR/yemek örnekleme aralıkları ve o anki seviyeler
+        """
+        inference_stats = self.get_inference_stats()
+        adaptive_stats = inference_stats.get('adaptive') or {}
+        return {
+            'run_mode': run_mode,
+            'source_fps': source_fps,
+            'qr_every': 2,
+            'food_every': 10,
+            'qr_cascade': '+'.join(self.qr_cascade),
+            'qr_decoder': self.qr_decoder.name,
+            'badge_mode': self.badge_mode,
+            'inference_worker': self.inference_worker is not None,
+            'yolo_imgsz': adaptive_stats.get('imgsz'),
+            'yolo_conf': adaptive_stats.get('conf'),
+            'avg_ms_per_frame': inference_stats.get('avg_ms_per_frame')
+        }
+    
+    def _close_checkpoints(self, frame_count, video_path):
+        """
+        Son konumu kaydet ve yazıcıyı kapat
+        """
+        if self.checkpoint_writer:
+            self._save_checkpoint(frame_count, video_path)
+            self.checkpoint_writer.close()
+            self.checkpoint_writer = None
+    
+    def _billed_tables(self):
+        """
+        Yemek hesabı tutulan masalar (masa bölgesi yoksa sadece MASA_1)
+        """
+        return list(self.table_areas) if self.table_areas else ['MASA_1']
+    
+    def get_inference_stats(self):
+        """
+        Yemek tespiti çıkarım istatistikleri (worker modunda worker sürecinden gelen son değer)
+        """
+        if self.inference_worker:
+            return self.inference_worker.inference_stats
+        return self.food_detector.get_inference_stats()
+    
+    def _food_detection_status(self):
+        """
+        Yemek modelinin (yerel veya worker sürecinde) durumu: 'ready', 'loading' veya
+        'disabled' (arka plan yüklemesi başarısız - yemek tespiti kapalı, QR takibi sürer)
+        """
+        if self.inference_worker:
+            return 'ready' if self.inference_worker.ready else 'loading'
+        if self.food_detector.model is not None:
+            return 'ready'
+        if self.food_detector.model_error:
+            return 'disabled'
+        return 'loading'
+    
+    def _update_food_status(self, foods_by_table):
+        """
+        Masa bazlı tespitleri ilgili masanın hesabına uygula
+        """
+        for table_id, detected_foods in foods_by_table.items():
+            if detected_foods:
+                ledger = self.food_detector.detected_foods.get(table_id)
+                seen = len(ledger.history) if ledger else 0
+                
+                self.food_detector.update_table_food_status(table_id, detected_foods, self.clock().timestamp())
+                
+                # Onaylanan yemekleri satış olayı olarak analitiğe yaz
+                ledger = self.food_detector.detected_foods[table_id]
+                for timestamp, action, class_id, amount, track_id in ledger.history[seen:]:
+                    if action == 'add':
+                        self.analytics.record(SALE, table_id, value=amount, timestamp=timestamp)
+    
+    def _clear_table_bill(self, table_id):
+        """
+        Masanın hesabını sıfırla ve kapanan hesabı analitiğe yaz
+        """
+        old_total = self.food_detector.clear_table_bill(table_id)
+        if old_total > 0:
+            self.analytics.record(BILL_CLOSED, table_id, value=old_total, timestamp=self.clock().timestamp())
+        return old_total
+    
+    def print_final_report(self):
+        """
+        Masa, garson ve yemek tespiti son durum raporunu yazdır
+        """
+        print(f"\n📊 Son Durum Raporu:")
+        
+        # Masa durumları
+        print("📋 Masa Durumları:")
+        status_list = self.table_manager.get_table_status_display()
+        for status in status_list:
+            table = status['table']
+            table_status = status['status']
+            customer_count = status['customer_count']
+            
+            if table_status == "empty":
+                status_emoji = "✅"
+            elif table_status == "waiting":
+                status_emoji = "⏰"
+            elif table_status == "served":
+                status_emoji = "🍽️"
+            else:
+                status_emoji = "👥"
+            
+            print(f"   {table}: {table_status.upper()} {status_emoji} (Müşteri sayısı: {customer_count})")
+        
+        # Garson performansı
+        print("\n👨‍💼 Garson Performansı:")
+        performance = self.table_manager.get_performance_summary()
+        for waiter_id, perf in performance.items():
+            print(f"   {waiter_id}:")
+            print(f"     • Performans Skoru: {perf['performance_score']}/100")
+            print(f"     • Ortalama Yanıt: {perf['avg_response']}s")
+            print(f"     • Toplam Servis: {perf['total_services']}")
+            print(f"     • Uyarı Sayısı: {perf['warnings']}")
+        
+        # Yemek tespiti raporu
+        print("\n🍽️ Yemek Tespiti Raporu:")
+        food_summaries = self.food_detector.get_all_tables_summary()
+        if food_summaries:
+            for summary in food_summaries:
+                table_id = summary['table_id']
+                items = summary['items']
+                total_price = summary['total_price']
+                print(f"   {table_id}:")
+                print(f"     • Toplam Tutar: {total_price:.0f} TL")
+                print(f"     • Yemek Sayısı: {summary['total_items']}")
+                if items:
+                    print("     • Siparişler:")
+                    for food_name, count in items.items():
+                        print(f"       - {count}x {food_name}")
+        else:
+            print("   Henüz yemek tespiti yapılmadı.")
+        
+        # Çıkarım istatistikleri
+        inference_stats = self.get_inference_stats()
+        if inference_stats.get('frames') or inference_stats.get('cache'):
+            print("\n⚙️ Çıkarım İstatistikleri:")
+            print(f"   • Çağrı / Frame: {inference_stats['calls']} / {inference_stats['frames']}")
+            print(f"   • Ortalama Gecikme: {inference_stats['avg_ms_per_frame']} ms/frame")
+            adaptive_stats = inference_stats.get('adaptive')
+            if adaptive_stats:
+                print(f"   • Adaptive Seviye: {adaptive_stats['imgsz']}px (conf {adaptive_stats['conf']}), "
+                      f"{adaptive_stats['switches']} değişim")
+                print(f"   • Gecikme p50/p95: {adaptive_stats['latency_p50_ms']} / {adaptive_stats['latency_p95_ms']} ms "
+                      f"(bütçe {adaptive_stats['budget_ms']:.0f} ms)")
+                print(f"   • Seviye Kullanımı: {adaptive_stats['level_counts']}")
+            cache_stats = inference_stats.get('cache')
+            if cache_stats:
+                print(f"   • Önbellek: {cache_stats['hits']} isabet / {cache_stats['misses']} ıska "
+                      f"(oran {cache_stats['hit_rate']:.0%})")
+        
+        # Masa bazlı bekleme süreleri ve garsonların en çok bulunduğu bölgeler
+        print("\n🌡️ Doluluk:")
+        for table_id, totals in self.occupancy.totals().items():
+            print(f"   {table_id}: bekleme {totals['waiting']:.0f}s, servis {totals['served']:.0f}s, "
+                  f"boş {totals['empty']:.0f}s")
+        if self.floor_heatmap is not None and self.floor_heatmap.counts.any():
+            hotspots = ", ".join(f"{position}" for position, _ in self.floor_heatmap.hotspots(3))
+            print(f"   Garson yoğun bölgeler: {hotspots}")
+        
+        # Vardiya analitiği (yüzdelikler ve ciro olay günlüğünden vektörel hesaplanır)
+        analytics = self.analytics.full_log()
+        if analytics.size:
+            print_report(analytics)
+    
+    def save_events(self, path):
+        """
+        Olay günlüğünü kaydet: .npz ham günlük (shift_analytics.py ile birleştirilebilir),
+        .csv/.parquet okunabilir tablo
+        """
+        analytics = self.analytics.full_log()
+        if path.lower().endswith('.npz'):
+            analytics.save(path)
+        else:
+            analytics.export(path)
+        print(f"💾 Olay günlüğü kaydedildi: {path} ({analytics.size} olay)")
+    
+# Test fonksiyonu
+def test_qr_detector(food_detector=None, table_areas=None, inference_worker=None, qr_registry=None,
+                     qr_cascade=None, qr_decoder=None, badge_mode='qr', marker_dictionary=DEFAULT_DICTIONARY):
+    """
+    QR tespit sistemini test et
+    """
+    detector = QRCodeDetector(food_detector, table_areas, inference_worker, qr_registry=qr_registry,
+                              qr_cascade=qr_cascade, qr_decoder=qr_decoder, badge_mode=badge_mode,
+                              marker_dictionary=marker_dictionary)
+    
+    print("🧪 QR Kod Tespit Sistemi Test Ediliyor...")
+    print("📝 Masa durumları:")
+    
+    for table, state in detector.table_states.items():
+        print(f"   {table}: {state['status']}")
+    
+    print("\n🎯 Test tamamlandı!")
+    
+    # Eğer test videosu varsa işle
+    test_video = "test_video.mp4"  # Bu dosyayı sonra ekleyeceğiz
+    
+    print(f"\n📹 Test videosu aranıyor: {test_video}")
+    print("💡 Test videosu yoksa, önce örnek video dosyası eklemeniz gerekir.")
+    
+    return detector
+
+def parse_args():
+    """
+    Komut satırı argümanlarını oku (video verilmezse etkileşimli menü açılır)
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Restoran QR / Yemek / Garson analiz sistemi")
+    parser.add_argument("video", nargs="?",
+                        help="İşlenecek video dosyası, resim klasörü, .raw ham frame dosyası, kamera indeksi "
+                             "veya synthetic[:saniye] (verilmezse menü açılır)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Pencere açmadan analiz et ve yemek tespitini batch olarak çalıştır")
+    parser.add_argument("--batch-size", type=int, default=8,
+                        help="Offline modda tek YOLO çağrısındaki frame sayısı (varsayılan: 8)")
+    parser.add_argument("--backend", choices=["pytorch", "onnx", "openvino"], default="pytorch",
+                        help="Yemek tespiti çıkarım backend'i (ONNX/OpenVINO modeli bir kez export edilip cache'lenir)")
+    parser.add_argument("--imgsz", type=int, default=640, help="ONNX/OpenVINO export giriş boyutu")
+    parser.add_argument("--int8", action="store_true", help="ONNX/OpenVINO için INT8 quantization uygula")
+    parser.add_argument("--calibration", help="INT8 kalibrasyon görüntüleri (klasör veya video)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Yük altında YOLO giriş boyutunu (320/480/640) ve eşiğini gecikmeye göre ayarla")
+    parser.add_argument("--budget-ms", type=float, default=120.0,
+                        help="Adaptive mod için frame başına çıkarım süre bütçesi (ms)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Görüntüsü değişmeyen masa bölgelerinde önceki tespitleri tekrar kullan (aHash önbelleği)")
+    parser.add_argument("--cache-tolerance", type=int, default=6,
+                        help="Önbellek için aynı sayılacak maksimum hash bit farkı")
+    parser.add_argument("--fast-start", action="store_true",
+                        help="Modeli arka planda yükle, QR takibi hemen başlasın (yemek tespiti model hazır olunca açılır)")
+    parser.add_argument("--live", action="store_true",
+                        help="Canlı kaynak modu: kamera indeksi/yayın URL'si/dosya ayrı thread'de okunur, "
+                             "her zaman en yeni frame işlenir (geride kalınan frame'ler atlanır)")
+    parser.add_argument("--worker", action="store_true",
+                        help="YOLO çıkarımını (yemek ve tabak/kase tespiti) ayrı süreçte yap (frame'ler shared memory "
+                             "ile aktarılır, döngü beklemez); worker düşerse bu sürece geçilir")
+    parser.add_argument("--events",
+                        help="Vardiya olay günlüğünü kaydet (.npz ham günlük, .csv veya .parquet tablo)")
+    parser.add_argument("--events-spill", metavar="KLASÖR",
+                        help="Olay günlüğünü her saat (olay saatiyle) bu klasöre .npz parçası olarak boşalt - "
+                             "uzun vardiyada bellek sınırlı kalır, son rapor ve --events tüm parçaları birleştirir")
+    parser.add_argument("--api", action="store_true",
+                        help="Masa/garson/hesap durumlarını yerel HTTP + SSE API'si ile yayınla")
+    parser.add_argument("--api-port", type=int, default=8765, help="Durum API'si portu (varsayılan: 8765)")
+    parser.add_argument("--parallel", type=int, metavar="N",
+                        help="Offline modda kaydı N segmente bölüp N süreçte analiz et (rapor sıralı analizle aynı)")
+    parser.add_argument("--segment-overlap", type=float, default=2.0,
+                        help="Paralel modda segmentler arası örtüşme, saniye (sınır kontrolü için)")
+    parser.add_argument("--checkpoint",
+                        help="Uzun kayıtlar için durum checkpoint dosyası (periyodik, atomik yazılır)")
+    parser.add_argument("--checkpoint-every", type=float, default=300.0,
+                        help="Checkpoint aralığı, video saniyesi (varsayılan: 300)")
+    parser.add_argument("--resume", action="store_true",
+                        help="--checkpoint dosyasından devam et (kaydedilen frame'e sarar)")
+    parser.add_argument("--qr-config",
+                        help="QR kod yapılandırması JSON: {\"tables\": {\"MASA_1\": [\"m001\", ...]}, \"waiters\": {...}} "
+                             "(birden fazla mekân için {\"venues\": {...}}, masa-garson atamaları: \"assignments\")")
+    parser.add_argument("--qr-cascade",
+                        help="QR kaskad profili JSON (qr_cascade.py --write-profile çıktısı): çalışacak çözme varyantları")
+    parser.add_argument("--qr-decoder", choices=DECODER_NAMES + ('auto',), default="pyzbar",
+                        help="QR çözücü backend'i (auto: kaynaktan örnek frame'lerle kalibre edilip "
+                             "recall hedefini sağlayan en hızlısı seçilir)")
+    parser.add_argument("--qr-recall-target", type=float, default=0.98,
+                        help="--qr-decoder auto için recall hedefi (varsayılan: 0.98)")
+    parser.add_argument("--badge-mode", choices=BADGE_MODES, default="qr",
+                        help="Garson rozetleri: qr (QR kodu) veya aruco (marker - tek geçiş, rotasyon kaskadı gerekmez)")
+    parser.add_argument("--marker-dictionary", default=DEFAULT_DICTIONARY,
+                        help="aruco rozetleri için cv2.aruco sözlüğü (ör. DICT_4X4_50, DICT_APRILTAG_36h11)")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="İstek üzerine alınan profillerin klasörü ([P], SIGUSR1 veya POST /api/profile)")
+    parser.add_argument("--profile-seconds", type=float, default=30.0, help="Profil süresi, saniye (varsayılan: 30, en fazla 600)")
+    parser.add_argument("--profile-mode", choices=PROFILE_MODES, default="sampling",
+                        help="sampling: düşük ek yüklü yığın örnekleme, deterministic: ek olarak cProfile (.pstats)")
+    parser.add_argument("--table-areas",
+                        help="Masa bölgeleri JSON dosyası: {\"MASA_1\": [x, y, w, h], ...} (görüntüleme boyutunda)")
+    args = parser.parse_args()
+    
+    if args.worker and args.offline:
+        parser.error("--worker sadece canlı modda kullanılabilir (offline mod batch çıkarım yapar)")
+    if args.live and args.offline:
+        parser.error("--live ve --offline birlikte kullanılamaz")
+    if args.parallel and not args.offline:
+        parser.error("--parallel sadece --offline ile kullanılabilir")
+    if args.parallel and (args.checkpoint or args.adaptive):
+        parser.error("--parallel ile --checkpoint/--adaptive kullanılamaz (segmentler bağımsız süreçlerde işlenir)")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume için --checkpoint dosyası gerekli")
+    if args.checkpoint and args.live:
+        parser.error("--checkpoint canlı modda kullanılamaz (frame konumu yok)")
+    try:
+        args.profile_seconds = parse_profile_seconds(args.profile_seconds)
+    except ValueError as e:
+        parser.error(f"--profile-seconds: {e}")
+    
+    return args
+
+def load_table_areas(path):
+    """
+    Masa bölgelerini JSON dosyasından oku: {"MASA_1": [x, y, w, h], ...}
+    """
+    with open(path, encoding='utf-8') as f:
+        areas = json.load(f)
+    
+    return {table_id: tuple(int(v) for v in area) for table_id, area in areas.items()}
+
+def select_video_file():
+    """
+    Kullanıcıya demo video seçim menüsünü göster ve seçilen dosya yolunu döndür
+    """
+    print("\n" + "="*60)
+    print("🎬 DEMO VIDEO SECIMI")
+    print("="*60)
+    print("Hangi demo videoyu kullanmak istiyorsunuz?")
+    print("1. demo_video.mp4 (Birinci aci)")
+    print("2. demo_video2.mp4 (Ikinci aci)")
+    print("3. Kendi video dosyanizi belirtin")
+    
+    while True:
+        choice = input("\nSeciminizi yapin (1/2/3): ").strip()
+        
+        if choice == "1":
+            video_file = "demo/demo_video.mp4"
+            print(f"✅ Secildi: {video_file}")
+            break
+        elif choice == "2":
+            video_file = "demo/demo_video2.mp4"
+            print(f"✅ Secildi: {video_file}")
+            break
+        elif choice == "3":
+            print("\n📁 Kendi video dosyanizi belirtin:")
+            print("Video dosyanizi proje klasorune koyun ve adini girin:")
+            print("Onerilen format: .mp4, .avi, .mov")
+            print("Ornek: demo/my_video.mp4")
+            
+            video_file = input("\n📹 Video dosya adi: ").strip()
+            
+            if not video_file:
+                print("❌ Lutfen bir dosya adi girin!")
+                continue
+                
+            # Dosya uzantısı kontrolü
+            if not any(video_file.lower().endswith(ext) for ext in ['.mp4', '.avi', '.mov', '.mkv', '.wmv']):
+                print("⚠️ Video dosya uzantisi eklemeyi unutmayin (.mp4, .avi, vb.)")
+                continue
+            
+            print(f"✅ Secildi: {video_file}")
+            break
+        else:
+            print("❌ Lutfen 1, 2 veya 3 secin!")
+            continue
+    
+    return video_file
+
+if __name__ == "__main__":
+    args = parse_args()
+    
+    # Test çalıştır
+    table_areas = load_table_areas(args.table_areas) if args.table_areas else None
+    detector_options = {
+        'backend': args.backend,
+        'imgsz': args.imgsz,
+        'int8': args.int8,
+        'calibration_source': args.calibration,
+        'adaptive': args.adaptive,
+        'inference_budget_ms': args.budget_ms,
+        'detection_cache': args.cache,
+        'cache_tolerance': args.cache_tolerance
+    }
+    
+    # Worker modunda model sadece worker sürecinde yüklenir
+    food_init_start = time.perf_counter()
+    inference_worker = InferenceWorker(detector_options, table_areas) if args.worker else None
+    # Paralel modda model segment süreçlerinde yüklenir, ana süreç sadece takip ve hesap tutar
+    food_detector = YOLOFoodDetector(**detector_options, load_in_background=args.fast_start,
+                                     with_model=not (args.worker or args.parallel))
+    food_init_time = time.perf_counter() - food_init_start
+    
+    qr_init_start = time.perf_counter()
+    qr_registry = QRRegistry.from_file(args.qr_config) if args.qr_config else None
+    qr_cascade = load_cascade_profile(args.qr_cascade) if args.qr_cascade else None
+    detector = test_qr_detector(food_detector, table_areas, inference_worker, qr_registry, qr_cascade,
+                                None if args.qr_decoder == 'auto' else args.qr_decoder,
+                                args.badge_mode, args.marker_dictionary)
+    if qr_cascade:
+        print(f"🔍 QR kaskadı: {'+'.join(detector.qr_cascade)} ({args.qr_cascade})")
+    if detector.badge_detector is not None:
+        print(f"🏷️ Garson rozetleri: ArUco {args.marker_dictionary} (QR kaskadı: {'+'.join(detector.qr_cascade)})")
+    
+    detector.profiler = RuntimeProfiler(args.profile_dir, args.profile_seconds, args.profile_mode)
+    if detector.profiler.install_signal():
+        print(f"🔬 Profil: kill -USR1 {os.getpid()} ile {args.profile_seconds:g} saniyelik profil alınır")
+    qr_init_time = time.perf_counter() - qr_init_start
+    
+    # Checkpoint'ten devam (API sağlayıcıları yüklenen durumu görsün diye sunucudan önce)
+    if args.resume:
+        if os.path.exists(args.checkpoint):
+            detector.resume_from_checkpoint(args.checkpoint)
+        else:
+            print(f"⚠️ Checkpoint bulunamadı, baştan başlanıyor: {args.checkpoint}")
+    if args.checkpoint:
+        detector.enable_checkpoints(args.checkpoint, args.checkpoint_every)
+    if args.events_spill:
+        detector.analytics.enable_spill(args.events_spill)
+    
+    # Durum API'si kendi thread'inde çalışır, anlık görüntüleri kendisi okur (frame döngüsü beklemez)
+    state_server = None
+    if args.api:
+        state_server = StateServer({
+            'tables': detector.table_manager.get_table_status_display,
+            'waiters': detector.table_manager.get_performance_summary,
+            'bills': detector.food_detector.get_all_tables_summary
+        }, port=args.api_port, actions={
+            'profile': lambda query: detector.profiler.request(query.get('seconds'), query.get('mode'))
+        }).start()
+    
+    print(f"\n⏱️ Başlangıç süreleri: importlar {IMPORT_TIME:.2f}s, "
+          f"yemek detector {food_init_time:.2f}s, QR sistemi {qr_init_time:.2f}s"
+          f"{' (model arka planda yükleniyor)' if args.fast_start else ''}")
+    
+    # Kullanıcıdan video seçimi iste
+    video_file = args.video if args.video else select_video_file()
+    
+    # Video dosyasının varlığını kontrol et (canlı modda kaynak kamera/URL olabilir)
+    if not args.live and not source_exists(video_file):
+        print(f"\n❌ Video dosyasi bulunamadi: {video_file}")
+        print("💡 Lutfen dosyanin dogru konumda oldugunu emin olun.")
+        exit(1)
+    
+    if args.qr_decoder == 'auto':
+        detector.calibrate_qr_decoder(video_file, args.qr_recall_target)
+    
+    try:
+        print(f"\n🚀 Video isleme baslatiliyor: {video_file}")
+        print("💡 Kontroller:")
+        print("   [ESC] - Cikis")
+        print("   [SPACE] - Duraklat/Devam et") 
+        print("   [R] - Basa don")
+        print("   [Q] - Hizli cikis")
+        print("   [F] - Pencere boyutunu yenile")
+        print("   [C] - Hesap sifirla")
+        print("   [H] - Isi haritasi")
+        print("\n⚠️ Video cok buyukse otomatik olarak kucultulecek")
+        print("⏳ Video aciliyor...")
+        
+        if args.offline and args.parallel:
+            from segment_analysis import analyze_video_parallel
+            final_states = analyze_video_parallel(detector, video_file, workers=args.parallel,
+                                                  detector_options=detector_options, batch_size=args.batch_size,
+                                                  overlap_seconds=args.segment_overlap)
+        elif args.offline:
+            final_states = detector.analyze_video_offline(video_file, batch_size=args.batch_size)
+        else:
+            final_states = detector.process_video(video_file, live=args.live)
+        
+        if args.events:
+            detector.save_events(args.events)
+        
+        if final_states:
+            print(f"\n✅ Video isleme tamamlandi!")
+            print(f"🎯 Sistem hazir, video dosyasi basariyla islendi.")
+        else:
+            print(f"\n❌ Video islenemedi!")
+            
+    except KeyboardInterrupt:
+        print(f"\n⏹️ Kullanici tarafindan durduruldu")
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        print("🔄 Lutfen video dosyasinin dogru formatta oldugunu emin olun.")
+    finally:
+        if state_server:
+            state_server.stop()
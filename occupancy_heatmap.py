@@ -0,0 +1,186 @@
+"""
+Masa Doluluk Zaman Serisi ve Kat Isı Haritası
+Masa durumlarının (boş/bekliyor/servis) süreleri sabit uzunluktaki zaman kutularına,
+garson konumları küçültülmüş bir kat ızgarasına vektörel olarak (np.add.at)
+biriktirilir. Bellek vardiya boyunca sabittir: zaman serisi halka (ring) olarak döner.
+"""
+
+import time
+import cv2
+import numpy as np
+from table_manager import TableStatus
+
+STATUSES = tuple(TableStatus)
+
+class OccupancyTimeline:
+    """Masa × durum × zaman kutusu süre birikimi (saniye)"""
+
+    def __init__(self, table_ids, bin_seconds=60, bin_count=720):
+        self.table_ids = list(table_ids)
+        self.bin_seconds = bin_seconds
+        self.bin_count = bin_count  # Varsayılan: 720 × 1 dk = 12 saatlik vardiya
+
+        self.status_index = {status: index for index, status in enumerate(STATUSES)}
+        self.durations = np.zeros((len(self.table_ids), len(STATUSES), bin_count), dtype=np.float32)
+        self.table_rows = np.arange(len(self.table_ids))
+
+        self.last_time = None
+        self.last_bin = None  # Mutlak kutu numarası (time // bin_seconds)
+
+    def _advance_to(self, absolute_bin):
+        """
+        Yeni kutulara geçerken halkada üzerine yazılacak eski kutuları sıfırla
+        """
+        if self.last_bin is None:
+            self.durations[:, :, absolute_bin % self.bin_count] = 0.0
+        elif absolute_bin > self.last_bin:
+            skipped = min(absolute_bin - self.last_bin, self.bin_count)
+            slots = np.arange(absolute_bin - skipped + 1, absolute_bin + 1) % self.bin_count
+            self.durations[:, :, slots] = 0.0
+        else:
+            return
+        self.last_bin = absolute_bin
+
+    def update(self, statuses, now=None):
+        """
+        Son güncellemeden bu yana geçen süreyi masaların önceki durumlarına ekle
+        statuses: table_ids sırasıyla TableStatus listesi (bu andan itibaren geçerli)
+        """
+        now = time.time() if now is None else now
+        codes = np.fromiter((self.status_index[status] for status in statuses), dtype=np.int64,
+                            count=len(self.table_ids))
+
+        if self.last_time is not None and now > self.last_time:
+            # Geçen süreyi kutu sınırlarında böl (genelde tek kutu)
+            start = self.last_time
+            while start < now:
+                absolute_bin = int(start // self.bin_seconds)
+                end = min(now, (absolute_bin + 1) * self.bin_seconds)
+                self._advance_to(absolute_bin)
+                np.add.at(self.durations, (self.table_rows, self.previous_codes, absolute_bin % self.bin_count),
+                          end - start)
+                start = end
+        else:
+            self._advance_to(int(now // self.bin_seconds))
+
+        self.last_time = now
+        self.previous_codes = codes
+
+    def series(self, status=TableStatus.WAITING, bins=None):
+        """
+        Durumun masa bazlı zaman serisi, eskiden yeniye sıralı: [masa, kutu] (saniye)
+        """
+        bins = self.bin_count if bins is None else min(bins, self.bin_count)
+        if self.last_bin is None:
+            return np.zeros((len(self.table_ids), bins), dtype=np.float32)
+        slots = np.arange(self.last_bin - bins + 1, self.last_bin + 1) % self.bin_count
+        return self.durations[:, self.status_index[status], slots]
+
+    def totals(self, bins=None):
+        """
+        Pencere içindeki masa bazlı durum süreleri: {masa: {durum: saniye}}
+        """
+        bins = self.bin_count if bins is None else min(bins, self.bin_count)
+        summed = np.stack([self.series(status, bins).sum(axis=1) for status in STATUSES], axis=1)
+        return {
+            table_id: {status.value: round(float(seconds), 1) for status, seconds in zip(STATUSES, row)}
+            for table_id, row in zip(self.table_ids, summed)
+        }
+
+    def render(self, status=TableStatus.WAITING, bins=120, cell_width=4, row_height=20):
+        """
+        Son bins kutunun masa × zaman ısı şeridi (BGR görüntü)
+        """
+        series = self.series(status, bins)
+        normalized = np.clip(series / self.bin_seconds * 255, 0, 255).astype(np.uint8)
+        strip = cv2.resize(normalized, (series.shape[1] * cell_width, len(self.table_ids) * row_height),
+                           interpolation=cv2.INTER_NEAREST)
+        image = cv2.applyColorMap(strip, cv2.COLORMAP_JET)
+
+        for row, table_id in enumerate(self.table_ids):
+            cv2.putText(image, table_id, (3, row * row_height + 14),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+        return image
+
+class FloorHeatmap:
+    """Küçültülmüş kat ızgarasında konum yoğunluğu"""
+
+    def __init__(self, frame_shape, cell_size=16):
+        self.cell_size = cell_size
+        self.frame_height, self.frame_width = frame_shape[:2]
+        self.grid_shape = (-(-self.frame_height // cell_size), -(-self.frame_width // cell_size))
+        self.counts = np.zeros(self.grid_shape, dtype=np.float32)
+
+    def add(self, points, weights=None):
+        """
+        Konumları (x, y) ızgaraya ekle - weights verilirse nokta başına ağırlık (ör. saniye)
+        """
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        if len(points) == 0:
+            return
+
+        columns = np.clip(points[:, 0] // self.cell_size, 0, self.grid_shape[1] - 1)
+        rows = np.clip(points[:, 1] // self.cell_size, 0, self.grid_shape[0] - 1)
+        np.add.at(self.counts, (rows, columns), 1.0 if weights is None else weights)
+
+    def hotspots(self, top=5):
+        """
+        En yoğun hücrelerin merkezleri: [((x, y), değer), ...]
+        """
+        flat = self.counts.ravel()
+        top = min(top, np.count_nonzero(flat))
+        if top == 0:
+            return []
+        indices = np.argpartition(flat, -top)[-top:]
+        indices = indices[np.argsort(flat[indices])[::-1]]
+        rows, columns = np.divmod(indices, self.grid_shape[1])
+        half = self.cell_size // 2
+        return [((int(column) * self.cell_size + half, int(row) * self.cell_size + half), float(flat[index]))
+                for row, column, index in zip(rows, columns, indices)]
+
+    def render(self, frame, alpha=0.45):
+        """
+        Isı haritasını frame üzerine bindir
+        """
+        if not self.counts.any():
+            return frame
+        normalized = (np.sqrt(self.counts / self.counts.max()) * 255).astype(np.uint8)
+        heat = cv2.resize(normalized, (frame.shape[1], frame.shape[0]), interpolation=cv2.INTER_LINEAR)
+        colored = cv2.applyColorMap(heat, cv2.COLORMAP_JET)
+        mask = heat > 0
+        frame[mask] = cv2.addWeighted(frame, 1 - alpha, colored, alpha, 0)[mask]
+        return frame
+
+# Test fonksiyonu
+def test_occupancy_heatmap(shift_hours=12, step_seconds=0.5):
+    """
+    Bir vardiyalık sentetik güncellemede bellek ve güncelleme maliyetini ölç
+    """
+    print(f"🧪 Doluluk/Isı Haritası Test Ediliyor ({shift_hours} saat, {step_seconds}s adım)...")
+
+    rng = np.random.default_rng(0)
+    tables = ["MASA_1", "MASA_2", "MASA_3", "MASA_4"]
+    timeline = OccupancyTimeline(tables)
+    heatmap = FloorHeatmap((800, 1200))
+
+    steps = int(shift_hours * 3600 / step_seconds)
+    start_time = time.time()
+    statuses = [TableStatus.EMPTY] * len(tables)
+
+    start = time.perf_counter()
+    for step in range(steps):
+        if rng.random() < 0.01:
+            statuses[rng.integers(len(tables))] = STATUSES[rng.integers(len(STATUSES))]
+        timeline.update(statuses, start_time + step * step_seconds)
+        heatmap.add(rng.normal((600, 400), (200, 120), size=(2, 2)))
+    elapsed = time.perf_counter() - start
+
+    print(f"   {steps:,} güncelleme: {elapsed / steps * 1e6:.1f} µs/güncelleme")
+    print(f"   Bellek: zaman serisi {timeline.durations.nbytes / 1024:.0f} KB, "
+          f"ısı haritası {heatmap.counts.nbytes / 1024:.0f} KB (sabit)")
+    for table_id, totals in timeline.totals().items():
+        print(f"   {table_id}: {totals}")
+    print(f"   Yoğun bölgeler: {heatmap.hotspots(3)}")
+
+if __name__ == "__main__":
+    test_occupancy_heatmap()
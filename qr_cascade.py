@@ -0,0 +1,279 @@
+"""
+QR Çözme Kaskadı
+detect_qr_codes her frame'i birkaç ön işleme varyantında çözer (ham, gri, kontrast, blur,
+üç rotasyon). Hangi varyantların çalışacağı bir kaskad profilinden (JSON) yüklenir.
+
+Doğrudan çalıştırılınca analiz aracıdır: etiketli bir klipte her varyantın çözme süresini,
+sadece o varyantın bulduğu (tekil) QR'ları ve her varyant alt kümesinin recall'unu ölçer,
+süre/recall Pareto cephesini yazdırır ve seçilen alt kümeyi profil olarak kaydeder.
+"""
+
+import argparse
+import json
+import time
+from itertools import combinations
+import cv2
+import numpy as np
+
+# Varyantlar detect_qr_codes'taki sırayla
+QR_VARIANTS = ('raw', 'gray', 'contrast', 'blur', 'rot90', 'rot180', 'rot270')
+VARIANT_ROTATIONS = {'rot90': 90, 'rot180': 180, 'rot270': 270}
+
+def rotate_image(image, angle):
+    """
+    Görüntüyü belirtilen açıda döndür (köşeler kesilmesin diye tuval büyütülür)
+    """
+    if angle == 0:
+        return image
+
+    (h, w) = image.shape[:2]
+    center = (w // 2, h // 2)
+
+    # Rotasyon matrisini oluştur
+    M = cv2.getRotationMatrix2D(center, angle, 1.0)
+
+    # Yeni boyutları hesapla
+    cos = np.abs(M[0, 0])
+    sin = np.abs(M[0, 1])
+
+    new_w = int((h * sin) + (w * cos))
+    new_h = int((h * cos) + (w * sin))
+
+    # Çeviri değerlerini ayarla
+    M[0, 2] += (new_w / 2) - center[0]
+    M[1, 2] += (new_h / 2) - center[1]
+
+    # Döndürülmüş görüntüyü döndür
+    return cv2.warpAffine(image, M, (new_w, new_h))
+
+def to_gray(frame):
+    """
+    Gri tonlama (frame zaten tek kanallıysa kendisi)
+    """
+    return frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+def variant_image(variant, frame, gray):
+    """
+    Varyantın çözülecek görüntüsü - gray: frame'in gri tonlaması (varyantlar arasında paylaşılır)
+    """
+    if variant == 'raw':
+        return frame
+    if variant == 'gray':
+        return gray
+    if variant == 'contrast':
+        return cv2.convertScaleAbs(gray, alpha=1.5, beta=30)  # Kontrast artırma
+    if variant == 'blur':
+        return cv2.GaussianBlur(gray, (3, 3), 0)  # Gürültü azaltma
+    return rotate_image(gray, VARIANT_ROTATIONS[variant])  # Eğik garson kartları için
+
+def iter_variant_images(frame, variants):
+    """
+    (varyant, görüntü, rotasyon) - gri tonlama ilk gerektiğinde bir kez hesaplanır
+    """
+    gray = None
+    for variant in variants:
+        if variant != 'raw' and gray is None:
+            gray = to_gray(frame)
+        yield variant, variant_image(variant, frame, gray), VARIANT_ROTATIONS.get(variant, 0)
+
+def validate_variants(variants):
+    """
+    Bilinmeyen varyant varsa ValueError, yoksa varyantları kanonik sırada döndür
+    """
+    unknown = [variant for variant in variants if variant not in QR_VARIANTS]
+    if unknown or not variants:
+        raise ValueError(f"Geçersiz QR kaskad varyantları: {unknown or 'boş liste'} "
+                         f"(geçerli: {', '.join(QR_VARIANTS)})")
+    return [variant for variant in QR_VARIANTS if variant in variants]
+
+def load_cascade_profile(path):
+    """
+    Kaskad profilini oku: {"variants": ["raw", "rot90", ...], ...} - varyant listesi
+    """
+    with open(path, encoding='utf-8') as f:
+        profile = json.load(f)
+    return validate_variants(profile.get('variants', []))
+
+def save_cascade_profile(path, variants, **metrics):
+    """
+    Kaskad profilini yaz - metrics (recall, süre, klip) bilgi amaçlı eklenir
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'variants': validate_variants(variants), **metrics}, f, indent=2, ensure_ascii=False)
+
+# --- Analiz aracı ---
+
+def load_labels(path):
+    """
+    Etiket dosyası: {"frame_no": ["m001", "g002", ...], ...} - frame'de görünen QR içerikleri
+    """
+    with open(path, encoding='utf-8') as f:
+        labels = json.load(f)
+    return {int(frame_no): set(payloads) for frame_no, payloads in labels.items()}
+
+def measure_variants(source, sample_every=2, max_frames=None, labels=None, decoder='pyzbar'):
+    """
+    Örneklenen her frame'de tüm varyantları çöz (decoder: qr_decoders backend adı)
+    Dönüş: (frame numaraları, {varyant: [frame başına içerik kümesi]},
+            {varyant: toplam süre ms}, gri tonlama toplam süre ms, [frame başına etiket kümesi])
+    Etiket verilmezse ve kaynak sentetikse (visible_codes) etiketler kaynaktan alınır
+    """
+    from qr_decoders import create_decoder
+    decoder = create_decoder(decoder)
+
+    frame_numbers = []
+    hits = {variant: [] for variant in QR_VARIANTS}
+    times = dict.fromkeys(QR_VARIANTS, 0.0)
+    gray_ms = 0.0
+    truth = []
+    frame_count = 0
+
+    while max_frames is None or len(frame_numbers) < max_frames:
+        ret, frame = source.read()
+        if not ret:
+            break
+        frame_count += 1
+        if frame_count % sample_every != 0:
+            continue
+
+        # main.py ile aynı boyutlandırma
+        height, width = frame.shape[:2]
+        scale_factor = min(1200/width, 800/height, 1.0)
+        if scale_factor < 1.0:
+            frame = cv2.resize(frame, (int(width * scale_factor), int(height * scale_factor)))
+
+        start = time.perf_counter()
+        gray = to_gray(frame)
+        gray_ms += (time.perf_counter() - start) * 1000
+
+        for variant in QR_VARIANTS:
+            start = time.perf_counter()
+            decoded = decoder.decode(variant_image(variant, frame, gray))
+            times[variant] += (time.perf_counter() - start) * 1000
+            hits[variant].append({obj.data.decode('utf-8', 'replace') for obj in decoded})
+
+        frame_numbers.append(frame_count)
+        if labels is not None:
+            truth.append(labels.get(frame_count, set()))
+        elif hasattr(source, 'visible_codes'):
+            truth.append(source.visible_codes(frame_count - 1))
+
+    if not truth:
+        # Etiket yok: tüm varyantların birleşimi referans alınır (tam kaskada göre recall)
+        truth = [set().union(*(hits[variant][i] for variant in QR_VARIANTS)) for i in range(len(frame_numbers))]
+
+    return frame_numbers, hits, times, gray_ms, truth
+
+def evaluate_subsets(hits, times, gray_ms, truth):
+    """
+    Her boş olmayan varyant alt kümesi için (varyantlar, recall, frame başına ms)
+    Gri tonlama süresi alt kümede ham dışında varyant varsa bir kez eklenir
+    """
+    frame_total = len(truth)
+    label_total = sum(len(labels) for labels in truth)
+    results = []
+
+    for size in range(1, len(QR_VARIANTS) + 1):
+        for subset in combinations(QR_VARIANTS, size):
+            found = 0
+            for i, labels in enumerate(truth):
+                found += len(labels & set().union(*(hits[variant][i] for variant in subset)))
+            cost = sum(times[variant] for variant in subset)
+            if any(variant != 'raw' for variant in subset):
+                cost += gray_ms
+            results.append((subset, found / label_total if label_total else 1.0,
+                            cost / frame_total if frame_total else 0.0))
+
+    return results
+
+def pareto_front(results):
+    """
+    Daha ucuz ve en az aynı recall'a sahip başka alt kümenin olmadığı alt kümeler (süreye göre sıralı)
+    """
+    front = []
+    best_recall = -1.0
+    for subset, recall, cost in sorted(results, key=lambda r: (r[2], -r[1])):
+        if recall > best_recall:
+            front.append((subset, recall, cost))
+            best_recall = recall
+    return front
+
+def variant_report(hits, times, truth):
+    """
+    Varyant başına: frame başına ms, bulduğu etiketli QR sayısı, sadece kendisinin bulduğu QR sayısı,
+    etikette olmayan çözümler
+    """
+    frame_total = len(truth)
+    report = {}
+    for variant in QR_VARIANTS:
+        found = unique = extra = 0
+        for i, labels in enumerate(truth):
+            own = hits[variant][i]
+            others = set().union(*(hits[other][i] for other in QR_VARIANTS if other != variant))
+            found += len(own & labels)
+            unique += len((own - others) & labels)
+            extra += len(own - labels)
+        report[variant] = {
+            'ms_per_frame': times[variant] / frame_total if frame_total else 0.0,
+            'found': found,
+            'unique': unique,
+            'extra': extra
+        }
+    return report
+
+def choose_profile(front, recall_target):
+    """
+    Pareto cephesinde recall hedefini sağlayan en ucuz alt küme (yoksa en yüksek recall)
+    """
+    for subset, recall, cost in front:
+        if recall >= recall_target:
+            return subset, recall, cost
+    return front[-1]
+
+if __name__ == "__main__":
+    from video_sources import open_video_source
+
+    parser = argparse.ArgumentParser(description="QR çözme kaskadı varyantlarının süre/recall analizi")
+    parser.add_argument("video", help="Etiketli klip (video, .raw, klasör veya synthetic[:saniye])")
+    parser.add_argument("--labels", help="Etiket JSON dosyası {\"frame_no\": [\"m001\", ...]} "
+                                         "(yoksa sentetik kaynağın kendi etiketleri veya tüm varyantların birleşimi)")
+    parser.add_argument("--sample-every", type=int, default=2, help="Örnekleme aralığı (canlı modda her 2 frame)")
+    parser.add_argument("--frames", type=int, help="En fazla örnek frame sayısı")
+    parser.add_argument("--recall-target", type=float, default=0.98, help="Profil seçimi için recall hedefi")
+    parser.add_argument("--decoder", default="pyzbar", help="QR çözücü backend'i (pyzbar, opencv, aruco)")
+    parser.add_argument("--write-profile", help="Seçilen alt kümeyi kaskad profili olarak yaz (main.py --qr-cascade)")
+    args = parser.parse_args()
+
+    source = open_video_source(args.video)
+    labels = load_labels(args.labels) if args.labels else None
+    frame_numbers, hits, times, gray_ms, truth = measure_variants(source, args.sample_every, args.frames, labels,
+                                                                   args.decoder)
+    source.release()
+
+    if not frame_numbers:
+        print(f"❌ Klipten frame okunamadı: {args.video}")
+        exit(1)
+
+    label_total = sum(len(labels) for labels in truth)
+    print(f"\n📊 QR kaskad analizi: {len(frame_numbers)} frame, {label_total} etiketli QR görünümü "
+          f"(gri tonlama {gray_ms / len(frame_numbers):.2f} ms/frame)")
+    for variant, stats in variant_report(hits, times, truth).items():
+        print(f"   {variant:>8}: {stats['ms_per_frame']:6.2f} ms/frame, {stats['found']:5d} bulundu, "
+              f"{stats['unique']:4d} tekil, {stats['extra']:4d} etiket dışı")
+
+    results = evaluate_subsets(hits, times, gray_ms, truth)
+    full_cost = next(cost for subset, _, cost in results if len(subset) == len(QR_VARIANTS))
+    front = pareto_front(results)
+    print(f"\n🎯 Pareto cephesi ({len(results)} alt küme, tam kaskad {full_cost:.2f} ms/frame):")
+    for subset, recall, cost in front:
+        print(f"   recall {recall:6.1%}  {cost:6.2f} ms/frame  {'+'.join(subset)}")
+
+    subset, recall, cost = choose_profile(front, args.recall_target)
+    print(f"\n✅ Seçilen kaskad (hedef recall {args.recall_target:.0%}): {'+'.join(subset)} - "
+          f"recall {recall:.1%}, {cost:.2f} ms/frame (tam kaskadın %{cost / full_cost * 100 if full_cost else 0:.0f}'i)")
+
+    if args.write_profile:
+        save_cascade_profile(args.write_profile, subset, recall=round(recall, 4),
+                             ms_per_frame=round(cost, 3), decoder=args.decoder, clip=args.video,
+                             frames=len(frame_numbers))
+        print(f"💾 Kaskad profili kaydedildi: {args.write_profile}")
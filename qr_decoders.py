@@ -0,0 +1,217 @@
+"""
+QR Çözücü Backend'leri
+detect_qr_codes'un kaskad varyantlarını çözen backend'ler:
+
+  pyzbar : zbar, sadece QR sembolojisi taranır (diğer barkod tipleri atlanır)
+  opencv : cv2.QRCodeDetector.detectAndDecodeMulti
+  aruco  : cv2.QRCodeDetectorAruco.detectAndDecodeMulti (OpenCV 4.8+, ArUco tabanlı bulucu)
+
+Tüm backend'ler pyzbar sonucu gibi .data (bytes) ve .polygon (x/y noktaları) alanlı
+nesneler döner. Kameradan farklı çözücüler daha iyi sonuç verebildiği için kalibrasyon,
+örnek frame'lerde her backend'in süresini ve recall'unu ölçüp recall hedefini sağlayan
+en hızlısını seçer (main.py --qr-decoder auto veya bu dosyanın doğrudan çalıştırılması).
+"""
+
+import argparse
+import time
+from collections import namedtuple
+import cv2
+from qr_cascade import QR_VARIANTS, iter_variant_images, load_cascade_profile
+
+DECODER_NAMES = ('pyzbar', 'opencv', 'aruco')
+
+# pyzbar Decoded nesnesinin kullanılan alanları (OpenCV backend'leri için)
+Point = namedtuple('Point', ['x', 'y'])
+DecodedQR = namedtuple('DecodedQR', ['data', 'polygon'])
+
+class QRDecoder:
+    """Tüm çözücülerin ortak arayüzü"""
+    name = 'base'
+
+    def decode(self, image):
+        """
+        Görüntüdeki QR kodlarını çöz - .data (bytes) ve .polygon alanlı nesneler listesi
+        """
+        raise NotImplementedError
+
+class PyzbarDecoder(QRDecoder):
+    """zbar - sadece QR sembolojisi (tüm barkod tiplerini taramaz)"""
+    name = 'pyzbar'
+
+    def __init__(self):
+        from pyzbar import pyzbar
+        from pyzbar.pyzbar import ZBarSymbol
+        self.pyzbar = pyzbar
+        self.symbols = [ZBarSymbol.QRCODE]
+
+    def decode(self, image):
+        return self.pyzbar.decode(image, symbols=self.symbols)
+
+class OpenCVDecoder(QRDecoder):
+    """OpenCV QR bulucu ve çözücü - tek çağrıda birden fazla kod"""
+    name = 'opencv'
+
+    def __init__(self):
+        self.detector = cv2.QRCodeDetector()
+
+    def decode(self, image):
+        ok, texts, points, _ = self.detector.detectAndDecodeMulti(image)
+        if not ok:
+            return []
+
+        decoded = []
+        for text, corners in zip(texts, points):
+            if text:  # Bulunup çözülemeyen kodlar boş döner
+                decoded.append(DecodedQR(text.encode('utf-8'),
+                                         [Point(int(round(x)), int(round(y))) for x, y in corners]))
+        return decoded
+
+class ArucoDecoder(OpenCVDecoder):
+    """OpenCV ArUco tabanlı QR bulucu - küçük/eğik kodlarda daha kararlı, OpenCV 4.8+ gerekli"""
+    name = 'aruco'
+
+    def __init__(self):
+        if not hasattr(cv2, 'QRCodeDetectorAruco'):
+            raise ImportError(f"cv2.QRCodeDetectorAruco bu OpenCV sürümünde yok ({cv2.__version__})")
+        self.detector = cv2.QRCodeDetectorAruco()
+
+def create_decoder(decoder):
+    """
+    İsme göre QR çözücü oluştur ('pyzbar', 'opencv', 'aruco')
+    """
+    if decoder not in DECODER_NAMES:
+        raise ValueError(f"Bilinmeyen QR çözücü: {decoder} (seçenekler: {', '.join(DECODER_NAMES)})")
+
+    if decoder == 'pyzbar':
+        return PyzbarDecoder()
+    if decoder == 'opencv':
+        return OpenCVDecoder()
+    return ArucoDecoder()
+
+def available_decoders(names=DECODER_NAMES):
+    """
+    Bu ortamda oluşturulabilen çözücüler {isim: çözücü} - eksik bağımlılıklar atlanır
+    """
+    decoders = {}
+    for name in names:
+        try:
+            decoders[name] = create_decoder(name)
+        except ImportError as e:
+            print(f"⚠️ QR çözücü kullanılamıyor: {name} ({e})")
+    return decoders
+
+# --- Kalibrasyon ---
+
+def sample_frames(source, max_frames=30, sample_every=15):
+    """
+    Kaynaktan kalibrasyon frame'leri (main.py ile aynı boyutlandırma)
+    Dönüş: (frame'ler, frame başına etiket kümesi veya None) - sentetik kaynakta etiketler kaynaktan
+    """
+    frames, truth = [], []
+    frame_count = 0
+
+    while len(frames) < max_frames:
+        ret, frame = source.read()
+        if not ret:
+            break
+        frame_count += 1
+        if frame_count % sample_every != 0:
+            continue
+
+        height, width = frame.shape[:2]
+        scale_factor = min(1200/width, 800/height, 1.0)
+        if scale_factor < 1.0:
+            frame = cv2.resize(frame, (int(width * scale_factor), int(height * scale_factor)))
+        frames.append(frame)
+
+        if hasattr(source, 'visible_codes'):
+            truth.append(source.visible_codes(frame_count - 1))
+
+    return frames, truth or None
+
+def measure_decoder(decoder, frames, variants=QR_VARIANTS, warmup=2):
+    """
+    Kaskad varyantlarıyla tüm frame'leri çöz - (frame başına ms, frame başına içerik kümeleri)
+    """
+    for frame in frames[:warmup]:
+        for _, image, _ in iter_variant_images(frame, variants):
+            decoder.decode(image)
+
+    found = []
+    start = time.perf_counter()
+    for frame in frames:
+        payloads = set()
+        for _, image, _ in iter_variant_images(frame, variants):
+            payloads.update(obj.data.decode('utf-8', 'replace') for obj in decoder.decode(image))
+        found.append(payloads)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / len(frames) * 1000 if frames else 0.0, found
+
+def calibrate_decoders(frames, variants=QR_VARIANTS, truth=None, recall_target=0.98, names=DECODER_NAMES):
+    """
+    Her çözücüyü örnek frame'lerde ölç, recall hedefini sağlayan en hızlısını seç
+    truth: frame başına etiket kümeleri (yoksa tüm çözücülerin birleşimi referans alınır)
+    Dönüş: (seçilen isim, {isim: {'ms_per_frame', 'recall', 'found'}})
+    """
+    measurements = {name: measure_decoder(decoder, frames, variants)
+                    for name, decoder in available_decoders(names).items()}
+    if not measurements:
+        raise RuntimeError("Kullanılabilir QR çözücü yok")
+
+    if truth is None:
+        truth = [set().union(*(found[i] for _, found in measurements.values())) for i in range(len(frames))]
+    label_total = sum(len(labels) for labels in truth)
+
+    results = {}
+    for name, (ms_per_frame, found) in measurements.items():
+        hits = sum(len(labels & payloads) for labels, payloads in zip(truth, found))
+        results[name] = {
+            'ms_per_frame': ms_per_frame,
+            'recall': hits / label_total if label_total else 1.0,
+            'found': hits
+        }
+
+    # Hedefi sağlayanlar arasında en hızlısı, hiçbiri sağlamıyorsa en yüksek recall
+    eligible = [name for name, result in results.items() if result['recall'] >= recall_target]
+    if eligible:
+        chosen = min(eligible, key=lambda name: results[name]['ms_per_frame'])
+    else:
+        chosen = max(results, key=lambda name: (results[name]['recall'], -results[name]['ms_per_frame']))
+    return chosen, results
+
+def print_calibration(chosen, results, recall_target):
+    """
+    Kalibrasyon sonuçlarını yazdır
+    """
+    for name, result in sorted(results.items(), key=lambda item: item[1]['ms_per_frame']):
+        marker = "➜" if name == chosen else " "
+        print(f"   {marker} {name:>7}: {result['ms_per_frame']:7.2f} ms/frame, recall {result['recall']:6.1%} "
+              f"({result['found']} QR)")
+    print(f"✅ Seçilen QR çözücü: {chosen} (hedef recall {recall_target:.0%})")
+
+if __name__ == "__main__":
+    from video_sources import open_video_source
+
+    parser = argparse.ArgumentParser(description="QR çözücü backend'lerinin süre/recall karşılaştırması")
+    parser.add_argument("video", help="Kamera veya klip (video, .raw, klasör veya synthetic[:saniye])")
+    parser.add_argument("--frames", type=int, default=30, help="Örnek frame sayısı")
+    parser.add_argument("--sample-every", type=int, default=15, help="Örnekleme aralığı (frame)")
+    parser.add_argument("--recall-target", type=float, default=0.98)
+    parser.add_argument("--qr-cascade", help="Kaskad profili JSON (varsayılan: tüm varyantlar)")
+    parser.add_argument("--decoders", nargs='+', default=list(DECODER_NAMES), choices=DECODER_NAMES)
+    args = parser.parse_args()
+
+    variants = load_cascade_profile(args.qr_cascade) if args.qr_cascade else list(QR_VARIANTS)
+    source = open_video_source(args.video)
+    frames, truth = sample_frames(source, args.frames, args.sample_every)
+    source.release()
+
+    if not frames:
+        print(f"❌ Kaynaktan frame okunamadı: {args.video}")
+        exit(1)
+
+    print(f"\n📊 QR çözücü kalibrasyonu: {len(frames)} frame, kaskad {'+'.join(variants)}, "
+          f"etiket: {'kaynak' if truth else 'çözücülerin birleşimi'}")
+    chosen, results = calibrate_decoders(frames, variants, truth, args.recall_target, args.decoders)
+    print_calibration(chosen, results, args.recall_target)
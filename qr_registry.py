@@ -0,0 +1,129 @@
+"""
+QR İçerik Kaydı (Registry)
+Her QR içeriği (bytes veya str) tek bir sözlük aramasıyla paylaşılan (interned) bir
+(tür, varlık ID'si) kaydına çevrilir; bilinmeyen içerik aynı aramada None döner.
+Masa/garson kodları JSON yapılandırmasından (birden fazla mekân) yüklenir. Masa ve garson
+ID'leri tüm mekânlarda tekildir (aynı ID iki mekânda tanımlanırsa yükleme hata verir), böylece
+TableManager ve raporlar ID'yi mekânsız kullanabilir. Masa-garson atamaları yapılandırmadaki
+"assignments" bölümünden gelir, yoksa mekânın masaları garsonlara sırayla eşit bloklar halinde bölünür.
+"""
+
+import json
+import sys
+from collections import namedtuple
+
+TABLE = sys.intern('table')
+WAITER = sys.intern('waiter')
+
+# venue: kaydın geldiği mekân (tek mekânlı yapılandırmada None)
+QRRecord = namedtuple('QRRecord', ['kind', 'entity_id', 'venue'])
+
+# Varsayılan kodlar: standart format + demo video formatı (+ ArUco rozet ID'leri, badge_markers.py)
+DEFAULT_CODES = {
+    "tables": {
+        "MASA_1": ["MASA_1", "m001"],
+        "MASA_2": ["MASA_2", "m002"],
+        "MASA_3": ["MASA_3", "m003"],
+        "MASA_4": ["MASA_4", "m004"]
+    },
+    "waiters": {
+        "GARSON_1": ["GARSON_1", "w001", "g001", "aruco:1"],
+        "GARSON_2": ["GARSON_2", "w002", "g002", "aruco:2"]
+    }
+}
+
+class QRRegistry:
+    """İçerik -> QRRecord eşlemesi"""
+
+    def __init__(self, config=None):
+        self.records = {}  # bytes ve str anahtarlar aynı sözlükte (çakışmazlar)
+        self.entities = {}  # (tür, varlık, mekân) -> QRRecord (her varlık için tek nesne)
+        self.entity_venues = {}  # (tür, varlık) -> mekân (ID'ler mekânlar arasında tekil)
+        self.assignments = {}  # Masa -> garson (yapılandırmada açıkça verilenler)
+
+        config = DEFAULT_CODES if config is None else config
+        venues = config.get("venues") or {None: config}
+        for venue, codes in venues.items():
+            for kind, section in ((TABLE, "tables"), (WAITER, "waiters")):
+                for entity_id, payloads in codes.get(section, {}).items():
+                    self.register(kind, entity_id, payloads, venue)
+            for table_id, waiter_id in codes.get("assignments", {}).items():
+                self.assign(table_id, waiter_id)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        JSON yapılandırmasından yükle:
+        {"tables": {"MASA_1": ["m001", ...]}, "waiters": {...}}
+        veya {"venues": {"MEKAN_A": {"tables": ..., "waiters": ...}, ...}}
+        """
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def register(self, kind, entity_id, payloads, venue=None):
+        """
+        Varlığın QR içeriklerini kaydet - aynı içerik başka varlığa aitse veya aynı ID başka
+        mekânda tanımlıysa ValueError
+        """
+        other_venue = self.entity_venues.setdefault((kind, entity_id), venue)
+        if other_venue != venue:
+            raise ValueError(f"{entity_id} iki mekânda tanımlı ({other_venue} / {venue}) - ID'ler mekânlar arasında tekil olmalı")
+
+        key = (kind, entity_id, venue)
+        record = self.entities.get(key)
+        if record is None:
+            record = QRRecord(kind, sys.intern(entity_id), sys.intern(venue) if venue else None)
+            self.entities[key] = record
+
+        for payload in payloads:
+            payload_bytes = payload.encode('utf-8') if isinstance(payload, str) else bytes(payload)
+            existing = self.records.get(payload_bytes)
+            if existing is not None and existing is not record:
+                raise ValueError(f"QR içeriği iki kez tanımlı: {payload_bytes!r} "
+                                 f"({existing.entity_id} / {record.entity_id})")
+            self.records[payload_bytes] = record
+            self.records[payload_bytes.decode('utf-8')] = record
+
+    def lookup(self, payload):
+        """
+        İçeriğin kaydı (bilinmiyorsa None) - tek sözlük araması
+        """
+        return self.records.get(payload)
+
+    def entity_ids(self, kind):
+        """
+        Türdeki tüm varlık ID'leri (kayıt sırasıyla)
+        """
+        return [record.entity_id for record in self.entities.values() if record.kind == kind]
+
+    def assign(self, table_id, waiter_id):
+        """
+        Masayı garsona ata - ikisi de kayıtlı ve aynı mekânda olmalı (yoksa ValueError)
+        """
+        if (TABLE, table_id) not in self.entity_venues or (WAITER, waiter_id) not in self.entity_venues:
+            raise ValueError(f"Atamada bilinmeyen masa/garson: {table_id} -> {waiter_id}")
+        table_venue = self.entity_venues[(TABLE, table_id)]
+        waiter_venue = self.entity_venues[(WAITER, waiter_id)]
+        if table_venue != waiter_venue:
+            raise ValueError(f"{table_id} ({table_venue}) başka mekânın garsonuna atanamaz: {waiter_id} ({waiter_venue})")
+        self.assignments[table_id] = waiter_id
+
+    def waiter_assignments(self):
+        """
+        Tüm masaların garsonu {MASA_x: GARSON_y} (kayıt sırasıyla)
+        Açık atama yoksa mekânın masaları garsonlarına sırayla eşit bloklar halinde bölünür
+        (varsayılan kodlarda MASA_1-2 -> GARSON_1, MASA_3-4 -> GARSON_2); garsonsuz mekânda None
+        """
+        by_venue = {}  # mekân -> (masalar, garsonlar)
+        for (kind, entity_id), venue in self.entity_venues.items():
+            by_venue.setdefault(venue, ([], []))[0 if kind == TABLE else 1].append(entity_id)
+
+        assignments = {}
+        for tables, waiters in by_venue.values():
+            for index, table_id in enumerate(tables):
+                default = waiters[index * len(waiters) // len(tables)] if waiters else None
+                assignments[table_id] = self.assignments.get(table_id, default)
+        return assignments
+
+    def __len__(self):
+        return len(self.records) // 2
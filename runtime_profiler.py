@@ -0,0 +1,239 @@
+"""
+Çalışma Anında Profil Alma
+Sistemi yeniden başlatmadan frame döngüsünün N saniyelik profili alınır. İstek tuş ([P]),
+sinyal (SIGUSR1) veya durum API'si (POST /api/profile) ile gelir; profil frame döngüsünün
+kendi thread'inde başlatılıp durdurulur (poll), istek tarafı sadece bayrak bırakır.
+
+  sampling      : arka plan thread'i döngü thread'inin yığınını aralıklarla örnekler (düşük ek yük)
+  deterministic : ek olarak cProfile çalışır, .pstats yazılır (ek yük yüksek, tam çağrı sayıları)
+
+Çıktılar: <ad>.folded (flamegraph.pl / speedscope için collapsed stack), <ad>.pstats
+(deterministic modda) ve <ad>.json (o anki örnekleme aralıkları, FPS, seviye etiketleri).
+"""
+
+import cProfile
+import json
+import math
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+PROFILE_MODES = ('sampling', 'deterministic')
+MAX_PROFILE_SECONDS = 600.0  # Daha uzun istekler bu süreye kırpılır (deterministic modda ek yük yüksek)
+
+def parse_profile_seconds(value, max_seconds=MAX_PROFILE_SECONDS):
+    """
+    Profil süresi: sonlu ve pozitif olmalı, en fazla max_seconds - geçersizse ValueError
+    """
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"geçersiz süre: {value}") from None
+    if not math.isfinite(seconds) or seconds <= 0:
+        raise ValueError(f"süre sonlu ve pozitif olmalı: {value}")
+    return min(seconds, max_seconds)
+
+class StackSampler:
+    """Hedef thread'in yığınını sabit aralıklarla örnekleyip collapsed stack sayaçlarına yazar"""
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def write_folded(self, path):
+        """
+        Collapsed stack formatı: "kök;çağıran;çağrılan <örnek sayısı>" - satır başına bir yığın
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class RuntimeProfiler:
+    """Frame döngüsünden yönetilen, istek üzerine N saniyelik profil"""
+
+    def __init__(self, output_dir='profiles', seconds=30.0, mode='sampling', interval=0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Geçersiz profil modu: {mode} (geçerli: {', '.join(PROFILE_MODES)})")
+        self.output_dir = output_dir
+        self.seconds = parse_profile_seconds(seconds)
+        self.mode = mode
+        self.interval = interval
+
+        # İstek (sinyal işleyicisinden de bırakılabilir: kilit yok, tek atama)
+        self.pending = None  # (saniye, mod)
+
+        self.active = False
+        self.sampler = None
+        self.profile = None
+        self.started_at = 0.0
+        self.stop_at = 0.0
+        self.start_frame = 0
+        self.last_frame = 0
+        self.tags = {}
+        self.written = []  # Yazılan profillerin temel yolları
+
+    def request(self, seconds=None, mode=None):
+        """
+        Profil iste (herhangi bir thread'den veya sinyal işleyicisinden) - döngü bir sonraki poll'da başlatır
+        Dönüş: isteğin durumu (API yanıtı için) - geçersiz süre/mod: {'status': 'error', ...}
+        """
+        if self.active:
+            return {'status': 'running', 'remaining': round(max(0.0, self.stop_at - time.monotonic()), 1)}
+        mode = mode or self.mode
+        if mode not in PROFILE_MODES:
+            return {'status': 'error', 'error': f"geçersiz mod: {mode}"}
+        try:
+            seconds = parse_profile_seconds(self.seconds if seconds is None else seconds)
+        except ValueError as e:
+            return {'status': 'error', 'error': str(e)}
+        self.pending = (seconds, mode)
+        return {'status': 'scheduled', 'seconds': self.pending[0], 'mode': mode}
+
+    def install_signal(self, signum=None):
+        """
+        Sinyal ile tetikleme (varsayılan SIGUSR1, sadece ana thread'den ve destekleyen platformlarda)
+        """
+        import signal
+        signum = signum if signum is not None else getattr(signal, 'SIGUSR1', None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signum, lambda *_: self.request())
+        return True
+
+    def poll(self, frame_count, tags=None):
+        """
+        Frame döngüsünden her turda çağrılır: bekleyen isteği başlatır, süresi dolan profili yazar
+        tags: profil başında etiketleri veren çağrılabilir (sadece başlatırken çağrılır)
+        """
+        if self.active:
+            self.last_frame = frame_count
+            if time.monotonic() >= self.stop_at:
+                self.stop()
+        elif self.pending is not None:
+            seconds, mode = self.pending
+            self.pending = None
+            self.start(seconds, mode, frame_count, tags() if tags else {})
+
+    def start(self, seconds, mode, frame_count, tags):
+        """
+        Profili çağıran thread (frame döngüsü) için başlat
+        """
+        self.active = True
+        self.tags = dict(tags, mode=mode, seconds=seconds)
+        self.start_frame = self.last_frame = frame_count
+        self.started_at = time.monotonic()
+        self.stop_at = self.started_at + seconds
+
+        self.sampler = StackSampler(threading.get_ident(), self.interval).start()
+        if mode == 'deterministic':
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+        print(f"🔬 Profil başladı: {seconds:g}s, {mode} (frame {frame_count})")
+
+    def stop(self):
+        """
+        Profili durdur ve dosyalara yaz - yazılan temel yol
+        """
+        if not self.active:
+            return None
+
+        if self.profile is not None:
+            self.profile.disable()
+        self.sampler.stop()
+        self.active = False
+
+        elapsed = time.monotonic() - self.started_at
+        frames = self.last_frame - self.start_frame
+        fps = frames / elapsed if elapsed > 0 else 0.0
+        self.tags.update(elapsed=round(elapsed, 2), frames=frames, fps=round(fps, 1),
+                         samples=self.sampler.samples, interval_ms=self.interval * 1000)
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Milisaniyeli isim; aynı isim yine varsa (aynı ms'de ikinci profil) sıra eki - eski dosyanın üzerine yazılmaz
+        name = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]}_{fps:.0f}fps_{self.tags['mode']}"
+        base = os.path.join(self.output_dir, name)
+        suffix = 1
+        while os.path.exists(base + '.json'):
+            suffix += 1
+            base = os.path.join(self.output_dir, f"{name}_{suffix}")
+        self.sampler.write_folded(base + '.folded')
+        if self.profile is not None:
+            pstats.Stats(self.profile).dump_stats(base + '.pstats')
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(self.tags, f, indent=2, ensure_ascii=False, default=str)
+
+        self.profile = None
+        self.sampler = None
+        self.written.append(base)
+        print(f"🔬 Profil yazıldı: {base}.* ({frames} frame, {fps:.1f} FPS, {self.tags['samples']} örnek)")
+        return base
+
+    def close(self):
+        """
+        Çıkışta yarım kalan profili yaz
+        """
+        self.pending = None
+        return self.stop()
+
+# Test fonksiyonu
+def test_runtime_profiler(seconds=0.5):
+    """
+    Sahte frame döngüsünde iki profil al (sampling ve deterministic)
+    """
+    import tempfile
+    import numpy as np
+
+    output_dir = tempfile.mkdtemp(prefix='profiles_')
+    profiler = RuntimeProfiler(output_dir, seconds=seconds)
+
+    def busy_frame():
+        return float(np.linalg.svd(np.random.rand(60, 60))[1].sum())
+
+    for mode in PROFILE_MODES:
+        print(f"   İstek: {profiler.request(mode=mode)}")
+        frame_count = 0
+        while profiler.pending is not None or profiler.active:
+            busy_frame()
+            frame_count += 1
+            profiler.poll(frame_count, lambda: {'qr_every': 2, 'food_every': 10})
+
+    for base in profiler.written:
+        with open(base + '.folded', encoding='utf-8') as f:
+            stack, count = f.readline().rsplit(' ', 1)
+        files = sorted(name for name in os.listdir(output_dir) if name.startswith(os.path.basename(base)))
+        print(f"   {files}")
+        print(f"      en sık yığın ({count.strip()} örnek): ...{stack[-80:]}")
+
+if __name__ == "__main__":
+    test_runtime_profiler()
@@ -0,0 +1,180 @@
+"""
+Tek Uzun Kaydın Paralel Segment Analizi
+Video zaman segmentlerine bölünür; her segmentin pahalı kısmı (QR çözme + batch YOLO)
+ayrı süreçte yapılır ve frame sırasıyla bir gözlem akışı (QR kodları, masa bazlı yemekler) döner.
+Birleştirme adımı akışları segment sırasıyla ana dedektörün durum makinesine video saatinde
+uygular: masa/garson durumu ve zamanlayıcılar segment sınırında kopmaz, rapor sıralı
+offline analizle aynı olur. Segmentler biraz örtüşür; örtüşen frame'lerin QR gözlemleri
+önceki segmentinkilerle karşılaştırılarak hatalı sarma (seek) tespit edilir.
+"""
+
+import multiprocessing as mp
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from occupancy_heatmap import FloorHeatmap
+from video_sources import open_video_source
+
+# Worker sürecindeki dedektör (süreç başına bir kez oluşturulur, model bir kez yüklenir)
+_worker_detector = None
+
+def _init_worker(detector_options, table_areas, qr_registry, qr_cascade, qr_decoder, badge_options, quiet):
+    global _worker_detector
+    if quiet:
+        sys.stdout = open(os.devnull, 'w')
+
+    # Ana modül worker'da import edilir (üst süreçte __main__ olarak çalışıyor)
+    from main import QRCodeDetector
+    from yolo_food_detector import YOLOFoodDetector
+
+    food_detector = YOLOFoodDetector(**detector_options)
+    food_detector.model_ready.wait()
+    _worker_detector = QRCodeDetector(food_detector, table_areas, qr_registry=qr_registry, qr_cascade=qr_cascade,
+                                      qr_decoder=qr_decoder, **badge_options)
+
+def _analyze_segment(task):
+    """
+    Segmentin gözlem akışı: [(frame_no, qr_kodları, masa bazlı yemekler veya None), ...]
+    Örtüşme frame'lerinde (frame_no <= start_frame) sadece QR çözülür (sınır kontrolü için)
+    """
+    video_path, segment_index, start_frame, end_frame, overlap_frames, batch_size = task
+    detector = _worker_detector
+    food_detector = detector.food_detector
+    stats_before = dict(food_detector.inference_stats)
+
+    cap = open_video_source(video_path)
+    first_frame = max(0, start_frame - overlap_frames)
+    if first_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, first_frame)
+
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    scale_factor = min(1200/width, 800/height, 1.0)  # Offline analizle aynı boyutlandırma
+    new_size = (int(width * scale_factor), int(height * scale_factor))
+
+    observations = []
+    food_frames = []
+    food_indices = []
+
+    def flush_food_frames():
+        if food_frames:
+            for index, foods_by_table in zip(food_indices,
+                                             food_detector.detect_food_by_table(food_frames, detector.table_areas)):
+                observations[index][2] = foods_by_table
+            food_frames.clear()
+            food_indices.clear()
+
+    for frame_no in range(first_frame + 1, end_frame + 1):
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        # Offline analizle aynı örnekleme: her 2 frame'de QR, her 10 frame'de yemek
+        if frame_no % 2 != 0:
+            continue
+
+        if scale_factor < 1.0:
+            frame = cv2.resize(frame, new_size)
+
+        observations.append([frame_no, detector.detect_qr_codes(frame), None])
+
+        if frame_no % 10 == 0 and frame_no > start_frame:
+            food_frames.append(frame)
+            food_indices.append(len(observations) - 1)
+            if len(food_frames) >= batch_size:
+                flush_food_frames()
+
+    flush_food_frames()
+    cap.release()
+
+    stats = {key: food_detector.inference_stats[key] - stats_before[key] for key in stats_before}
+    return segment_index, start_frame, end_frame, observations, stats
+
+def split_segments(frame_count, segment_count):
+    """
+    [0, frame_count) aralığını eşit segmentlere böl: [(başlangıç, bitiş), ...]
+    """
+    bounds = np.linspace(0, frame_count, segment_count + 1).astype(int)
+    return [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+def analyze_video_parallel(detector, video_path, workers=None, detector_options=None, batch_size=8,
+                           overlap_seconds=2.0, segment_count=None, quiet=True):
+    """
+    Kaydı segmentlere bölüp süreç havuzunda analiz et, gözlemleri sırayla detector'a uygula
+    detector: QRCodeDetector (durum makinesi ve rapor ana süreçte)
+    """
+    cap = open_video_source(video_path)
+    if not cap.isOpened():
+        print(f"❌ Video dosyası açılamadı: {video_path}")
+        return None
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    detector.use_video_clock(video_path, cap)
+    cap.release()
+
+    if detector.floor_heatmap is None:
+        scale_factor = min(1200/width, 800/height, 1.0)
+        detector.floor_heatmap = FloorHeatmap((int(height * scale_factor), int(width * scale_factor)))
+
+    if frame_count <= 0:
+        print(f"❌ Frame sayısı bilinmiyor (canlı kaynak?): {video_path}")
+        return None
+
+    workers = workers or os.cpu_count() or 1
+    segments = split_segments(frame_count, segment_count or workers)
+    overlap_frames = int(overlap_seconds * fps)
+    tasks = [(str(video_path), index, start, end, overlap_frames, batch_size)
+             for index, (start, end) in enumerate(segments)]
+
+    print(f"🧩 Paralel segment analizi: {video_path} - {frame_count} frame, {len(segments)} segment, "
+          f"{workers} süreç, {overlap_frames} frame örtüşme")
+
+    start_time = time.time()
+    seam_checked = 0
+    seam_mismatches = 0
+    previous_tail = {}  # Önceki segmentin son frame'lerindeki QR içerikleri (sınır kontrolü)
+
+    context = mp.get_context('spawn')
+    with context.Pool(workers, initializer=_init_worker,
+                      initargs=(detector_options or {}, detector.table_areas, detector.qr_registry,
+                                detector.qr_cascade, detector.qr_decoder.name,
+                                {'badge_mode': detector.badge_mode, 'marker_dictionary': detector.marker_dictionary},
+                                quiet)) as pool:
+        # imap sırayı korur: ilk segment biterken sonrakiler hâlâ işlenebilir (birleştirme akış halinde)
+        for segment_index, start_frame, end_frame, observations, stats in pool.imap(_analyze_segment, tasks):
+            applied = 0
+            for frame_no, qr_codes, foods_by_table in observations:
+                if frame_no <= start_frame:
+                    expected = previous_tail.get(frame_no)
+                    if expected is not None:
+                        seam_checked += 1
+                        if expected != {qr.data for qr in qr_codes}:
+                            seam_mismatches += 1
+                    continue
+                detector.apply_observation(frame_no, qr_codes, foods_by_table)
+                applied += 1
+
+            previous_tail = {frame_no: {qr.data for qr in qr_codes}
+                             for frame_no, qr_codes, _ in observations if frame_no > end_frame - overlap_frames}
+
+            for key, value in stats.items():
+                detector.food_detector.inference_stats[key] += value
+
+            print(f"   ✅ Segment {segment_index + 1}/{len(segments)}: frame {start_frame + 1}-{end_frame}, "
+                  f"{applied} gözlem uygulandı ({time.time() - start_time:.1f}s)")
+
+    elapsed = time.time() - start_time
+    print(f"✅ Paralel analiz tamamlandı: {frame_count} frame, {elapsed:.1f}s "
+          f"({frame_count / elapsed if elapsed > 0 else 0:.1f} FPS)")
+    if seam_mismatches:
+        print(f"⚠️ Segment sınırlarında {seam_mismatches}/{seam_checked} örtüşen frame farklı çözüldü "
+              f"(kaynakta frame-doğru sarma yok olabilir)")
+
+    detector.print_final_report()
+
+    return detector.table_states
@@ -0,0 +1,476 @@
+"""
+Vardiya / Gün / Ay Raporları için Kolon Bazlı Olay Deposu
+Müşteri gelişi, servis, uyarı, kalkış ve hesap olayları NumPy structured array'de
+kolon kolon tutulur; raporlar Python döngüsü yerine vektörel sorgularla hesaplanır.
+Sonuçlar CSV veya Parquet (pyarrow kuruluysa) olarak dışa aktarılabilir.
+
+Uzun vardiyalarda enable_spill() ile günlük belirli aralıklarla diske (.npz parçaları) boşaltılır;
+bellekte sadece son parçanın olayları kalır, full_log() tüm vardiyayı birleştirir.
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+import numpy as np
+
+# Olay türleri (kind kolonu)
+ARRIVAL = 0    # Müşteri geldi (QR kapandı)
+SERVICE = 1    # Garson geldi - value: yanıt süresi (s)
+WARNING = 2    # Bekleme eşiği aşıldı - value: bekleme süresi (s)
+DEPARTURE = 3  # Müşteri kalktı (servis almıştı)
+ABANDON = 4    # Müşteri garson gelmeden kalktı - value: bekleme süresi (s)
+SALE = 5       # Hesaba yemek eklendi - value: tutar (TL)
+BILL_CLOSED = 6  # Hesap kapandı/sıfırlandı - value: toplam (TL)
+
+EVENT_NAMES = ('arrival', 'service', 'warning', 'departure', 'abandon', 'sale', 'bill_closed')
+
+EVENT_DTYPE = np.dtype([
+    ('time', np.float64),   # Unix zamanı (s)
+    ('kind', np.uint8),
+    ('table', np.int16),    # tables listesindeki indeks, -1: yok
+    ('waiter', np.int16),   # waiters listesindeki indeks, -1: yok
+    ('value', np.float64)
+])
+
+def _local_utc_offset(timestamp=None):
+    """
+    Yerel saat diliminin UTC farkı (s) - saat bazlı gruplama için
+    """
+    return time.localtime(timestamp if timestamp is not None else time.time()).tm_gmtoff
+
+def _group_percentiles(groups, values, percentiles):
+    """
+    Her grup için yüzdelikler (numpy 'linear' yöntemi) - tek sıralama ile vektörel
+    Dönüş: (benzersiz gruplar, adetler, [len(gruplar), len(percentiles)] matris)
+    """
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+
+    unique_groups, starts, counts = np.unique(groups, return_index=True, return_counts=True)
+    result = np.empty((len(unique_groups), len(percentiles)))
+
+    for column, percentile in enumerate(percentiles):
+        position = starts + (counts - 1) * (percentile / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, starts + counts - 1)
+        fraction = position - lower
+        result[:, column] = values[lower] + (values[upper] - values[lower]) * fraction
+
+    return unique_groups, counts, result
+
+def write_table(columns, path):
+    """
+    Kolon sözlüğünü ({ad: dizi}) uzantıya göre Parquet veya CSV olarak yaz
+    """
+    if str(path).lower().endswith('.parquet'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet çıktısı için pyarrow gerekli: pip install pyarrow")
+        pq.write_table(pa.table({name: np.asarray(column) for name, column in columns.items()}), path)
+        return path
+
+    names = list(columns)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        writer.writerows(zip(*(np.asarray(columns[name]).tolist() for name in names)))
+    return path
+
+class ShiftAnalytics:
+    """Olay günlüğü ve vektörel rapor sorguları"""
+
+    def __init__(self, capacity=4096):
+        self._events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.size = 0
+
+        # Diske boşaltma (enable_spill ile açılır): parça klasörü, aralık (olay saati, s), yazılan parça sayısı
+        self.spill_dir = None
+        self.spill_interval = 3600.0
+        self.spill_start = None
+        self.segments = 0
+        self.spilled = 0
+
+        # Masa/garson adları küçük tamsayılara çevrilir (kolonlar sabit genişlikte kalır)
+        self.tables = []
+        self.waiters = []
+        self._table_index = {}
+        self._waiter_index = {}
+
+        # Olaylar birden fazla thread'den (masa kilitleri altında) yazılabilir
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """
+        Checkpoint için: kilit hariç, sadece dolu kısım
+        """
+        state = self.__dict__.copy()
+        state['_events'] = self.events.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def events(self):
+        """
+        Kaydedilmiş olayların görünümü (kopyasız)
+        """
+        return self._events[:self.size]
+
+    def _intern(self, name, names, index):
+        if name is None:
+            return -1
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+        return index[name]
+
+    def record(self, kind, table=None, waiter=None, value=0.0, timestamp=None):
+        """
+        Tek bir olay ekle - kapasite dolunca dizi iki katına büyütülür
+        """
+        with self._lock:
+            if self.size == len(self._events):
+                grown = np.zeros(max(2 * len(self._events), 1), dtype=EVENT_DTYPE)
+                grown[:self.size] = self._events[:self.size]
+                self._events = grown
+
+            event = self._events[self.size]
+            event['time'] = time.time() if timestamp is None else timestamp
+            event['kind'] = kind
+            event['table'] = self._intern(table, self.tables, self._table_index)
+            event['waiter'] = self._intern(waiter, self.waiters, self._waiter_index)
+            event['value'] = value
+            self.size += 1
+
+            if self.spill_dir is not None:
+                if self.spill_start is None:
+                    self.spill_start = event['time']
+                elif event['time'] - self.spill_start >= self.spill_interval:
+                    self._spill()
+                    self.spill_start = event['time']
+
+    def enable_spill(self, directory, interval_seconds=3600.0):
+        """
+        Günlüğü her interval_seconds olay saatinde directory'ye parça olarak yaz ve bellekten çıkar
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.spill_dir = directory
+        self.spill_interval = interval_seconds
+
+    def _segment_path(self, index):
+        return os.path.join(self.spill_dir, f"events_{index:05d}.npz")
+
+    def _spill(self):
+        # Kilit altında çağrılır; checkpoint'ten devam edilirse sonraki parçaların üzerine yazılır
+        self.save(self._segment_path(self.segments))
+        self.segments += 1
+        self.spilled += self.size
+        self.size = 0
+
+    def full_log(self):
+        """
+        Diske yazılmış parçalar + bellekteki olaylar (boşaltma yoksa kendisi)
+        """
+        if not self.segments:
+            return self
+        merged = ShiftAnalytics(capacity=0)
+        for index in range(self.segments):
+            merged.extend(ShiftAnalytics.load(self._segment_path(index)))
+        merged.extend(self)
+        return merged
+
+    def extend(self, other):
+        """
+        Başka bir günlüğü (ör. önceki günler) ekle - ay raporları için
+        """
+        table_map = np.array([self._intern(name, self.tables, self._table_index) for name in other.tables] + [-1],
+                             dtype=np.int16)
+        waiter_map = np.array([self._intern(name, self.waiters, self._waiter_index) for name in other.waiters] + [-1],
+                              dtype=np.int16)
+
+        incoming = other.events.copy()
+        incoming['table'] = table_map[incoming['table']]  # -1 son elemana (-1) düşer
+        incoming['waiter'] = waiter_map[incoming['waiter']]
+
+        self._events = np.concatenate([self.events, incoming])
+        self.size = len(self._events)
+
+    def _select(self, kind, start=None, end=None):
+        events = self.events
+        mask = events['kind'] == kind
+        if start is not None:
+            mask &= events['time'] >= start
+        if end is not None:
+            mask &= events['time'] < end
+        return events[mask]
+
+    def _hour_of_day(self, timestamps, utc_offset=None):
+        if utc_offset is None:
+            utc_offset = _local_utc_offset(float(timestamps[0]) if len(timestamps) else None)
+        return (((timestamps + utc_offset) // 3600) % 24).astype(np.int64)
+
+    def _day(self, timestamps, utc_offset=None):
+        if utc_offset is None:
+            utc_offset = _local_utc_offset(float(timestamps[0]) if len(timestamps) else None)
+        return ((timestamps + utc_offset) // 86400).astype('datetime64[D]')
+
+    def waiter_response_percentiles(self, percentiles=(50, 90, 95), by_hour=True, start=None, end=None,
+                                    utc_offset=None):
+        """
+        Garson (ve saat) bazında yanıt süresi yüzdelikleri
+        Dönüş: {'waiter', ['hour'], 'services', 'p50', 'p90', ...} kolonları
+        """
+        services = self._select(SERVICE, start, end)
+        services = services[services['waiter'] >= 0]
+        waiter_ids = services['waiter'].astype(np.int64)
+
+        if by_hour:
+            hours = self._hour_of_day(services['time'], utc_offset)
+            groups = waiter_ids * 24 + hours
+        else:
+            groups = waiter_ids
+
+        unique_groups, counts, values = _group_percentiles(groups, services['value'], percentiles)
+
+        waiter_column = unique_groups // 24 if by_hour else unique_groups
+        columns = {'waiter': np.array([self.waiters[i] for i in waiter_column], dtype=object)}
+        if by_hour:
+            columns['hour'] = unique_groups % 24
+        columns['services'] = counts
+        for column, percentile in enumerate(percentiles):
+            columns[f'p{percentile:g}'] = np.round(values[:, column], 1)
+        return columns
+
+    def table_turnover(self, start=None, end=None, utc_offset=None):
+        """
+        Masa ve gün bazında müşteri sayısı (devir), garsonsuz kalkma ve ortalama servis süresi
+        """
+        events = self.events
+        mask = events['table'] >= 0
+        if start is not None:
+            mask &= events['time'] >= start
+        if end is not None:
+            mask &= events['time'] < end
+        events = events[mask]
+
+        days = self._day(events['time'], utc_offset)
+        unique_days, day_index = np.unique(days, return_inverse=True)
+        table_count = max(len(self.tables), 1)
+        groups = day_index * table_count + events['table'].astype(np.int64)
+        size = len(unique_days) * table_count
+
+        def count(kind):
+            return np.bincount(groups[events['kind'] == kind], minlength=size)
+
+        arrivals, abandons = count(ARRIVAL), count(ABANDON)
+        services = events['kind'] == SERVICE
+        service_counts = np.bincount(groups[services], minlength=size)
+        response_sums = np.bincount(groups[services], weights=events['value'][services], minlength=size)
+
+        present = np.nonzero(arrivals + service_counts + abandons)[0]
+        return {
+            'day': unique_days[present // table_count].astype(str),
+            'table': np.array([self.tables[i] for i in present % table_count], dtype=object),
+            'customers': arrivals[present],
+            'served': service_counts[present],
+            'abandoned': abandons[present],
+            'avg_response': np.round(np.divide(response_sums[present], service_counts[present],
+                                               out=np.zeros(len(present)),
+                                               where=service_counts[present] > 0), 1)
+        }
+
+    def revenue_by_table(self, start=None, end=None):
+        """
+        Masa bazında ciro (TL) ve satılan yemek sayısı
+        """
+        sales = self._select(SALE, start, end)
+        sales = sales[sales['table'] >= 0]
+        size = len(self.tables)
+        revenue = np.bincount(sales['table'], weights=sales['value'], minlength=size)
+        items = np.bincount(sales['table'], minlength=size)
+        present = np.nonzero(items)[0]
+        return {
+            'table': np.array([self.tables[i] for i in present], dtype=object),
+            'items': items[present],
+            'revenue': np.round(revenue[present], 2)
+        }
+
+    def revenue_by_hour(self, start=None, end=None, utc_offset=None):
+        """
+        Günün saatine göre ciro (TL) - 24 satır
+        """
+        sales = self._select(SALE, start, end)
+        hours = self._hour_of_day(sales['time'], utc_offset)
+        return {
+            'hour': np.arange(24),
+            'items': np.bincount(hours, minlength=24),
+            'revenue': np.round(np.bincount(hours, weights=sales['value'], minlength=24), 2)
+        }
+
+    def queue_length_curve(self, bin_seconds=60, start=None, end=None):
+        """
+        Garson bekleyen masa sayısının zaman eğrisi (her aralığın sonundaki değer)
+        Geliş +1, servis veya garsonsuz kalkma -1
+        """
+        events = self.events
+        changes = np.zeros(len(events), dtype=np.int64)
+        changes[events['kind'] == ARRIVAL] = 1
+        changes[(events['kind'] == SERVICE) | (events['kind'] == ABANDON)] = -1
+
+        moving = changes != 0
+        times, changes = events['time'][moving], changes[moving]
+        if len(times) == 0:
+            return {'time': np.array([]), 'waiting_tables': np.array([], dtype=np.int64)}
+
+        order = np.argsort(times, kind='stable')
+        times = times[order]
+        queue = np.cumsum(changes[order])
+
+        start = times[0] if start is None else start
+        end = times[-1] if end is None else end
+        bin_ends = np.arange(start, end + bin_seconds, bin_seconds) + bin_seconds
+        last_event = np.searchsorted(times, bin_ends, side='right') - 1
+        waiting = np.where(last_event >= 0, queue[np.maximum(last_event, 0)], 0)
+
+        return {'time': bin_ends - bin_seconds, 'waiting_tables': waiting}
+
+    def summary(self):
+        """
+        Olay türü sayıları
+        """
+        counts = np.bincount(self.events['kind'], minlength=len(EVENT_NAMES))
+        return {name: int(count) for name, count in zip(EVENT_NAMES, counts)}
+
+    def event_columns(self):
+        """
+        Olay günlüğünün okunabilir kolonları (dışa aktarım için)
+        """
+        events = self.events
+        tables = np.array(self.tables + [''], dtype=object)
+        waiters = np.array(self.waiters + [''], dtype=object)
+        return {
+            'time': events['time'],
+            'kind': np.array(EVENT_NAMES, dtype=object)[events['kind']],
+            'table': tables[events['table']],
+            'waiter': waiters[events['waiter']],
+            'value': events['value']
+        }
+
+    def export(self, path):
+        """
+        Olay günlüğünü CSV/Parquet olarak dışa aktar
+        """
+        return write_table(self.event_columns(), path)
+
+    def save(self, path):
+        """
+        Günlüğü ham haliyle kaydet (.npz) - sonra load() ile birleştirilebilir
+        """
+        np.savez_compressed(path, events=self.events,
+                            names=np.array(json.dumps({'tables': self.tables, 'waiters': self.waiters})))
+
+    @classmethod
+    def load(cls, path):
+        """
+        save() ile kaydedilmiş günlüğü yükle
+        """
+        with np.load(path) as data:
+            names = json.loads(str(data['names']))
+            analytics = cls(capacity=0)
+            analytics._events = data['events'].astype(EVENT_DTYPE)
+        analytics.size = len(analytics._events)
+        for name in names['tables']:
+            analytics._intern(name, analytics.tables, analytics._table_index)
+        for name in names['waiters']:
+            analytics._intern(name, analytics.waiters, analytics._waiter_index)
+        return analytics
+
+def print_report(analytics):
+    """
+    Vardiya raporunu yazdır
+    """
+    print("\n📈 Vardiya Analitiği:")
+    print(f"   • Olaylar: {analytics.summary()}")
+
+    percentiles = analytics.waiter_response_percentiles(by_hour=False)
+    for waiter, services, p50, p90, p95 in zip(percentiles['waiter'], percentiles['services'],
+                                               percentiles['p50'], percentiles['p90'], percentiles['p95']):
+        print(f"   • {waiter}: {services} servis, yanıt p50/p90/p95: {p50}/{p90}/{p95}s")
+
+    revenue = analytics.revenue_by_table()
+    for table, items, total in zip(revenue['table'], revenue['items'], revenue['revenue']):
+        print(f"   • {table}: {items} yemek, {total:.0f} TL ciro")
+
+# Test fonksiyonu
+def test_shift_analytics(event_count=1_000_000):
+    """
+    Sentetik bir aylık günlük üzerinde sorgu sürelerini ölç
+    """
+    print(f"🧪 ShiftAnalytics Test Ediliyor ({event_count:,} olay)...")
+
+    rng = np.random.default_rng(0)
+    analytics = ShiftAnalytics()
+    for table in ("MASA_1", "MASA_2", "MASA_3", "MASA_4"):
+        analytics._intern(table, analytics.tables, analytics._table_index)
+    for waiter in ("GARSON_1", "GARSON_2"):
+        analytics._intern(waiter, analytics.waiters, analytics._waiter_index)
+
+    events = np.zeros(event_count, dtype=EVENT_DTYPE)
+    events['time'] = np.sort(time.time() - rng.uniform(0, 30 * 86400, event_count))
+    events['kind'] = rng.choice([ARRIVAL, SERVICE, ABANDON, SALE], event_count, p=[0.2, 0.18, 0.02, 0.6])
+    events['table'] = rng.integers(0, 4, event_count)
+    events['waiter'] = np.where(events['kind'] == SERVICE, events['table'] // 2, -1)
+    events['value'] = np.where(events['kind'] == SALE, rng.choice([15.0, 25.0, 40.0], event_count),
+                               rng.gamma(2.0, 20.0, event_count))
+    analytics._events, analytics.size = events, event_count
+
+    for name, query in (("Yanıt yüzdelikleri (garson × saat)", analytics.waiter_response_percentiles),
+                        ("Masa devri (gün × masa)", analytics.table_turnover),
+                        ("Masa cirosu", analytics.revenue_by_table),
+                        ("Saatlik ciro", analytics.revenue_by_hour),
+                        ("Kuyruk eğrisi (5 dk)", lambda: analytics.queue_length_curve(300))):
+        start = time.perf_counter()
+        result = query()
+        elapsed = (time.perf_counter() - start) * 1000
+        rows = len(next(iter(result.values())))
+        print(f"   {name}: {rows} satır, {elapsed:.1f} ms")
+
+    print_report(analytics)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Kaydedilmiş olay günlüklerinden vardiya/ay raporu")
+    parser.add_argument("logs", nargs="*", help="save() ile kaydedilmiş .npz günlükleri (verilmezse sentetik test)")
+    parser.add_argument("--export-dir", help="Rapor tablolarını bu klasöre yaz")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    args = parser.parse_args()
+
+    if not args.logs:
+        test_shift_analytics()
+    else:
+        analytics = ShiftAnalytics.load(args.logs[0])
+        for path in args.logs[1:]:
+            analytics.extend(ShiftAnalytics.load(path))
+        print_report(analytics)
+
+        if args.export_dir:
+            import os
+            os.makedirs(args.export_dir, exist_ok=True)
+            reports = {
+                'events': analytics.event_columns(),
+                'waiter_response_by_hour': analytics.waiter_response_percentiles(),
+                'table_turnover': analytics.table_turnover(),
+                'revenue_by_table': analytics.revenue_by_table(),
+                'revenue_by_hour': analytics.revenue_by_hour(),
+                'queue_length': analytics.queue_length_curve()
+            }
+            for name, columns in reports.items():
+                path = write_table(columns, os.path.join(args.export_dir, f"{name}.{args.format}"))
+                print(f"💾 {path}")
@@ -0,0 +1,268 @@
+"""
+Uzun Vardiya Dayanıklılık (Soak) Testi
+Sentetik restoran kaynağından 12-24 saatlik bir vardiya hızlandırılmış olarak tüm durum
+makinesine (masa/garson durumları, zamanlayıcılar, yemek takibi, hesaplar, analitik,
+doluluk) video saatinde uygulanır. Periyodik olarak tracemalloc belleği, RSS ve yapı
+boyutları örneklenir; ısınmadan sonra büyümeye devam eden yapılar raporlanır ve bellek
+bütçeden hızlı büyüyorsa test başarısız olur (çıkış kodu 1). Isınmadan sonra servis ve uyarı
+olayları da birikmeye devam etmeli: yapılar bu olaylar birikirken ölçülerek düz kalmalıdır.
+Hesap geçmişi hesap kapanınca silinir, vardiya analitiği saatlik olarak geçici bir klasöre
+boşaltılır; ikisi de diğer yapılar gibi sınırlı kalmalıdır.
+
+QR tespitleri varsayılan olarak kaynağın kendi etiketlerinden (konum titreşimiyle) üretilir;
+--decode-every N ile her N. gözlemde frame çizilip gerçekten çözülür.
+"""
+
+import argparse
+import contextlib
+import gc
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from detections import QRDetection, FoodDetection
+from shift_analytics import SERVICE, WARNING
+from video_sources import SyntheticRestaurantSource
+
+SANDWICH = (54, 'sandwich', 'Sandviç', 25.0, (255, 255, 0))
+
+def structure_sizes(detector):
+    """
+    Uzun süre yaşayan yapıların eleman sayıları
+    """
+    food = detector.food_detector
+    return {
+        'tables_served': sum(len(perf['tables_served']) for perf in detector.table_manager.waiter_performance.values()),
+        'previous_table_states': len(detector.previous_table_states),
+        'previous_waiter_states': len(detector.previous_waiter_states),
+        'waiter_positions': sum(len(positions) for positions in detector.waiter_detector.tracker.waiter_positions.values()),
+        'food_tracks': sum(len(tracker) for tracker in food.food_trackers.values()),
+        'food_track_items': sum(len(tracker.track_items) for tracker in food.food_trackers.values()),
+        'ledger_history': sum(len(ledger.history) for ledger in food.detected_foods.values()),
+        'analytics_events': detector.analytics.size
+    }
+
+def event_counts(detector):
+    """
+    Şu ana kadarki servis ve uyarı olayları (diske boşaltılan parçalar dahil analitik günlüğünden)
+    """
+    counts = np.bincount(detector.analytics.full_log().events['kind'], minlength=max(SERVICE, WARNING) + 1)
+    return {'services': int(counts[SERVICE]), 'warnings': int(counts[WARNING])}
+
+def current_rss_mb():
+    """
+    Anlık RSS, MB (/proc yoksa None)
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return None
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 1024  # macOS bayt, Linux KB
+
+def simulated_qr(detector, source, index, rng, jitter):
+    """
+    Kaynağın etiketlerinden QR tespitleri (merkezlere piksel titreşimi eklenir - gerçek çözmedeki gibi)
+    """
+    timestamp = time.monotonic_ns()
+    half = source.qr_size // 2
+    qr_codes = []
+    for payload, (cx, cy) in source.visible_qr(index):
+        if jitter:
+            cx, cy = cx + int(rng.integers(-jitter, jitter + 1)), cy + int(rng.integers(-jitter, jitter + 1))
+        qr_codes.append(QRDetection(payload, detector.qr_registry.lookup(payload), (cx - half, cy - half,
+                                    source.qr_size, source.qr_size), (cx, cy), 0, 1.0, timestamp))
+    return qr_codes
+
+def simulated_foods(source, t, rng, jitter):
+    """
+    Garsonun servisinden kalkışa kadar her dolu masada iki sandviç (masa bazlı FoodDetection listeleri)
+    """
+    timestamp = time.monotonic_ns()
+    foods_by_table = {}
+    for table_index, (cx, cy) in enumerate(source.table_centers):
+        table_id = f"MASA_{table_index + 1}"
+        visit = source.visit_at(table_index, t)
+        served = visit is not None and visit[0] + visit[2] <= t
+        foods = []
+        if served:
+            for offset in (-60, 60):
+                x = cx + offset - 40 + int(rng.integers(-jitter, jitter + 1))
+                y = cy - 40 + int(rng.integers(-jitter, jitter + 1))
+                foods.append(FoodDetection(*SANDWICH, (x, y, 80, 80), (x + 40, y + 40), 6400,
+                                           float(rng.uniform(0.5, 0.9)), timestamp, table_id))
+        foods_by_table[table_id] = foods
+    return foods_by_table
+
+def growth_report(samples, warmup_fraction):
+    """
+    Isınma sonrası örneklerde yapı başına saatlik büyüme ve sınırsız büyüyen yapılar
+    Bir yapı ısınma sonrası ikinci yarıdaki en düşük değeri ilk yarıdaki en yüksek değerini aşıyorsa
+    büyüyor sayılır - anlık doluluğa göre inip çıkan yapılar (ör. aktif yemek izleri) sınırlı kalır
+    (kapsayıcının üst sınırı değil, ölçülen değerler esas alınır)
+    """
+    start = int(len(samples) * warmup_fraction)
+    steady = samples[start:]
+    middle = len(steady) // 2
+    hours = np.array([sample['hours'] for sample in steady])
+
+    report = {}
+    for name in steady[0]['sizes']:
+        values = np.array([sample['sizes'][name] for sample in steady], dtype=np.float64)
+        slope = np.polyfit(hours, values, 1)[0] if len(values) > 1 else 0.0
+        report[name] = {
+            'final': int(values[-1]),
+            'per_hour': float(slope),
+            'growing': bool(values[middle:].min() > values[:middle].max()) if middle else False
+        }
+    return report
+
+def activity_after_warmup(samples, warmup_fraction):
+    """
+    Isınma sonrası biriken olaylar {'services': n, 'warnings': n}
+    """
+    first = samples[min(int(len(samples) * warmup_fraction), len(samples) - 1)]['events']
+    last = samples[-1]['events']
+    return {kind: last[kind] - first[kind] for kind in last}
+
+def memory_slope(samples, key, warmup_fraction):
+    """
+    Isınma sonrası saatlik eğim (doğrusal uyum)
+    """
+    steady = [sample for sample in samples[int(len(samples) * warmup_fraction):] if sample[key] is not None]
+    if len(steady) < 2:
+        return 0.0
+    return float(np.polyfit([sample['hours'] for sample in steady], [sample[key] for sample in steady], 1)[0])
+
+def run_soak(hours=12.0, fps=15, seed=0, sample_minutes=30.0, jitter=3, decode_every=0, warmup_fraction=0.25,
+             spill_dir=None):
+    """
+    Simüle vardiyayı çalıştır - örnekler ve ısınma/son tracemalloc anlık görüntüleri
+    spill_dir: analitik günlüğünün saatlik boşaltıldığı klasör
+    """
+    # Ana modül importu sırasında ve çalışırken sistem çıktıları yazdırılmaz
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        from main import QRCodeDetector
+        from yolo_food_detector import YOLOFoodDetector
+        from shift_analytics import ShiftAnalytics
+
+        # Boşaltma yolunun modülleri (np.savez/np.load, zipfile) izleme başlamadan yüklensin
+        if spill_dir is not None:
+            warmup_path = os.path.join(spill_dir, 'warmup.npz')
+            ShiftAnalytics().save(warmup_path)
+            ShiftAnalytics.load(warmup_path)
+            os.remove(warmup_path)
+
+        tracemalloc.start()
+        source = SyntheticRestaurantSource(duration=hours * 3600, fps=fps, seed=seed)
+        detector = QRCodeDetector(YOLOFoodDetector(with_model=False))
+        detector.use_video_clock(f"synthetic:{hours * 3600:.0f}", source)
+        if spill_dir is not None:
+            detector.analytics.enable_spill(spill_dir)
+
+    rng = np.random.default_rng(seed)
+    total_frames = int(hours * 3600 * fps)
+    sample_frames = max(2, int(sample_minutes * 60 * fps))
+    warmup_frame = int(total_frames * warmup_fraction)
+
+    samples = []
+    warmup_snapshot = None
+    start_time = time.perf_counter()
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        observations = 0
+        # Canlı/offline mod ile aynı örnekleme: her 2 frame'de QR, her 10 frame'de yemek
+        for frame_no in range(2, total_frames + 1, 2):
+            observations += 1
+            if decode_every and observations % decode_every == 0:
+                qr_codes = detector.detect_qr_codes(source._frame(frame_no - 1))
+            else:
+                qr_codes = simulated_qr(detector, source, frame_no - 1, rng, jitter)
+            foods_by_table = simulated_foods(source, frame_no / fps, rng, jitter) if frame_no % 10 == 0 else None
+            detector.apply_observation(frame_no, qr_codes, foods_by_table)
+
+            if frame_no % sample_frames == 0 or frame_no + 2 > total_frames:
+                # Tam toplama serbest listeleri de boşaltır (yoksa önbellekteki tuple'lar büyüme gibi görünür)
+                gc.collect()
+                samples.append({
+                    'hours': frame_no / fps / 3600,
+                    'traced_kb': tracemalloc.get_traced_memory()[0] / 1024,
+                    'rss_mb': current_rss_mb(),
+                    'sizes': structure_sizes(detector),
+                    'events': event_counts(detector)
+                })
+                if warmup_snapshot is None and frame_no >= warmup_frame:
+                    warmup_snapshot = tracemalloc.take_snapshot()
+
+    final_snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return samples, warmup_snapshot, final_snapshot, time.perf_counter() - start_time
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simüle uzun vardiyada bellek ve yapı büyümesi testi")
+    parser.add_argument("--hours", type=float, default=12.0, help="Simüle vardiya süresi, saat (varsayılan: 12)")
+    parser.add_argument("--fps", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample-minutes", type=float, default=30.0, help="Örnekleme aralığı, simüle dakika")
+    parser.add_argument("--jitter", type=int, default=3, help="QR/yemek konumlarına eklenen piksel titreşimi")
+    parser.add_argument("--decode-every", type=int, default=0,
+                        help="Her N. gözlemde frame çizilip gerçekten çözülür (0: sadece etiketler)")
+    parser.add_argument("--warmup", type=float, default=0.25, help="Büyüme değerlendirmesine katılmayan başlangıç oranı")
+    parser.add_argument("--max-growth-kb-per-hour", type=float, default=64.0,
+                        help="Isınma sonrası izin verilen bellek büyümesi, KB/saat")
+    args = parser.parse_args()
+
+    print(f"\n🧪 Soak testi: {args.hours:g} saatlik simüle vardiya ({args.fps} FPS, her {args.sample_minutes:g} dk örnek)")
+    with tempfile.TemporaryDirectory(prefix='soak_events_') as spill_dir:
+        samples, warmup_snapshot, final_snapshot, elapsed = run_soak(
+            args.hours, args.fps, args.seed, args.sample_minutes, args.jitter, args.decode_every, args.warmup,
+            spill_dir)
+    print(f"   ⏱️ {elapsed:.0f}s sürdü (x{args.hours * 3600 / elapsed:.0f} hızlandırılmış)")
+
+    print("\n📏 Yapı boyutları (ısınma sonrası):")
+    report = growth_report(samples, args.warmup)
+    unbounded = []
+    for name, result in report.items():
+        if not result['growing']:
+            status = "✅ sınırlı"
+        else:
+            status = "❌ SINIRSIZ BÜYÜYOR"
+            unbounded.append(name)
+        print(f"   {name:>22}: {result['final']:8d} (saatte {result['per_hour']:+9.1f}) {status}")
+
+    traced_slope = memory_slope(samples, 'traced_kb', args.warmup)
+    rss_slope = memory_slope(samples, 'rss_mb', args.warmup)
+    last = samples[-1]
+    print(f"\n💾 Bellek: tracemalloc {last['traced_kb']:.0f} KB (saatte {traced_slope:+.1f} KB)")
+    if last['rss_mb'] is not None:
+        print(f"   RSS {last['rss_mb']:.1f} MB (saatte {rss_slope:+.2f} MB), tepe RSS {peak_rss_mb():.1f} MB")
+
+    if warmup_snapshot is not None:
+        print("\n🔎 Isınmadan sonra en çok büyüyen satırlar:")
+        for stat in final_snapshot.compare_to(warmup_snapshot, 'lineno')[:8]:
+            if stat.size_diff > 0:
+                frame = stat.traceback[0]
+                print(f"   {stat.size_diff / 1024:+8.1f} KB  {os.path.basename(frame.filename)}:{frame.lineno}")
+
+    # Servis/uyarı yolları çalışmadıysa düz kalan yapılar bir şey kanıtlamaz
+    activity = activity_after_warmup(samples, args.warmup)
+    print(f"\n🛎️ Isınma sonrası: {activity['services']} servis, {activity['warnings']} uyarı "
+          f"(toplam {last['events']['services']} / {last['events']['warnings']})")
+    idle = [kind for kind, count in activity.items() if count == 0]
+
+    failed = traced_slope > args.max_growth_kb_per_hour or bool(unbounded) or bool(idle)
+    if failed:
+        print(f"\n❌ Soak testi başarısız: bellek saatte {traced_slope:+.1f} KB "
+              f"(bütçe {args.max_growth_kb_per_hour:g} KB), sınırsız yapılar: {', '.join(unbounded) or '-'}, "
+              f"ısınma sonrası hiç olmayan olaylar: {', '.join(idle) or '-'}")
+    else:
+        print(f"\n✅ Soak testi geçti: servis ve uyarılar birikirken bellek ve yapılar sınırlı "
+              f"(saatte {traced_slope:+.1f} KB)")
+
+    exit(1 if failed else 0)
@@ -0,0 +1,304 @@
+"""
+Yerel Durum API'si (asyncio HTTP + Server-Sent Events)
+Masa, garson ve hesap durumları ayrı bir thread'deki asyncio sunucusundan JSON olarak
+sunulur. Durumlar belirli aralıklarla okunup önbelleğe alınır ve sürümlenir (ETag):
+yoklayan tabletler değişiklik yoksa 304 alır, /api/events aboneleri sadece değişiklikleri alır.
+Sağlayıcılar frame döngüsünün yayınladığı anlık görüntüleri okumalıdır (kilitsiz, tutarlı).
+Frame döngüsü sunucuyu hiç beklemez. İşlemler (ör. POST /api/profile) sunucu thread'inde
+çağrılır; işlem fonksiyonu sadece istek bırakmalıdır, işi frame döngüsü yapar.
+
+ETag'ler süreç başına rastgele bir belirteç içerir: yeniden başlayan sunucunun sürüm
+sayacı 0'dan başlasa da eski ETag'ler eşleşmez.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import traceback
+from datetime import datetime
+from urllib.parse import parse_qsl
+import numpy as np
+
+def _json_default(value):
+    """
+    JSON'a çevrilemeyen değerler (datetime, NumPy sayıları)
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+class StateServer:
+    """Önbellekli ve sürümlü durum anlık görüntülerini sunan HTTP/SSE sunucusu"""
+
+    def __init__(self, providers, host='127.0.0.1', port=8765, refresh_interval=0.5, heartbeat=15.0,
+                 actions=None):
+        self.providers = providers  # {ad: çağrılabilir} - ör. {'tables': manager.get_table_status_display}
+        self.actions = actions or {}  # {ad: çağrılabilir(sorgu sözlüğü)} - POST /api/<ad>
+        self.host = host
+        self.port = port
+        self.refresh_interval = refresh_interval
+        self.heartbeat = heartbeat
+
+        # ad -> (sürüm, ETag, JSON gövdesi) - ETag'de süreç belirteci (yeniden başlatmada eski ETag eşleşmez)
+        self.token = os.urandom(4).hex()
+        self.snapshots = {name: (0, self._etag(name, 0), b'null') for name in providers}
+        self.failing = set()  # Son okumada hata veren sağlayıcılar (hata bir kez loglanır)
+        self.subscribers = set()
+
+        self.loop = None
+        self.server = None
+        self.stopping = None  # asyncio.Event - sunucu thread'inde oluşturulur
+        self.connections = set()
+        self.ready = threading.Event()
+        self.stats = {'requests': 0, 'not_modified': 0, 'sse_events': 0, 'refresh_errors': 0}
+        self.thread = threading.Thread(target=self._run, name='state-api', daemon=True)
+
+    def start(self):
+        """
+        Sunucuyu arka plan thread'inde başlat
+        """
+        self.thread.start()
+        self.ready.wait(5.0)
+        return self
+
+    def _etag(self, name, version):
+        return f'"{name}-{self.token}-{version}"'
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._serve())
+        self.loop.close()
+
+    async def _serve(self):
+        self.stopping = asyncio.Event()
+        try:
+            self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        except OSError as e:
+            print(f"❌ Durum API'si başlatılamadı ({self.host}:{self.port}): {e}")
+            self.ready.set()
+            return
+
+        print(f"🌐 Durum API'si: http://{self.host}:{self.port}/api/state (SSE: /api/events)")
+        self.ready.set()
+
+        refresher = asyncio.ensure_future(self._refresh_loop())
+        await self.stopping.wait()
+
+        # Yeni bağlantıları kapat, açık istek/SSE bağlantılarını ve yenilemeyi iptal et
+        self.server.close()
+        tasks = [refresher, *self.connections]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def _refresh_loop(self):
+        """
+        Durumları periodik olarak oku; değişen anlık görüntünün sürümünü artır ve abonelere gönder
+        """
+        while True:
+            for name, provider in self.providers.items():
+                try:
+                    body = json.dumps(provider(), default=_json_default, ensure_ascii=False).encode('utf-8')
+                except Exception:
+                    # Sağlayıcı hatası (ör. görüntü değişirken KeyError) veya JSON'a çevrilemeyen değer:
+                    # eski görüntü sunulmaya devam eder, yenileme durmaz
+                    self.stats['refresh_errors'] += 1
+                    if name not in self.failing:
+                        self.failing.add(name)
+                        print(f"⚠️ Durum API'si '{name}' durumunu okuyamadı (düzelene kadar tekrar loglanmaz):")
+                        traceback.print_exc()
+                    continue
+                self.failing.discard(name)
+
+                version, _, previous = self.snapshots[name]
+                if body != previous:
+                    version += 1
+                    self.snapshots[name] = (version, self._etag(name, version), body)
+                    self._broadcast(name, version, body)
+
+            await asyncio.sleep(self.refresh_interval)
+
+    def _broadcast(self, name, version, body):
+        message = f"id: {name}-{version}\nevent: {name}\ndata: ".encode('utf-8') + body + b"\n\n"
+        for subscriber in list(self.subscribers):
+            if subscriber.full():
+                continue  # Yavaş istemci - eski olayları biriktirme, sıradaki değişikliği alır
+            subscriber.put_nowait(message)
+            self.stats['sse_events'] += 1
+
+    async def _handle_connection(self, reader, writer):
+        """
+        HTTP/1.1 keep-alive bağlantısı: GET isteklerini sırayla yanıtla
+        """
+        self.connections.add(asyncio.current_task())
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                parts = request_line.decode('latin-1').split()
+                method, target = (parts[0], parts[1]) if len(parts) >= 2 else ('', '')
+                path, _, query = target.partition('?')
+                self.stats['requests'] += 1
+
+                # İstek gövdesi kullanılmaz ama keep-alive bağlantıda okunmalı
+                content_length = int(headers.get('content-length') or 0)
+                if content_length:
+                    await reader.readexactly(content_length)
+
+                if method == 'POST':
+                    await self._run_action(writer, path, query)
+                elif method != 'GET':
+                    await self._respond(writer, 405, b'{"error": "method not allowed"}')
+                elif path == '/api/events':
+                    await self._stream_events(writer)
+                    break
+                else:
+                    await self._respond_snapshot(writer, path, headers)
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self.connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def _respond(self, writer, status, body, extra_headers=()):
+        reason = {200: 'OK', 202: 'Accepted', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+                  405: 'Method Not Allowed'}[status]
+        lines = [f"HTTP/1.1 {status} {reason}",
+                 "Content-Type: application/json; charset=utf-8",
+                 f"Content-Length: {len(body)}",
+                 "Access-Control-Allow-Origin: *",
+                 "Cache-Control: no-cache",
+                 *extra_headers]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+        await writer.drain()
+
+    async def _respond_snapshot(self, writer, path, headers):
+        """
+        /api/<ad> tek anlık görüntü, /api/state hepsi - If-None-Match eşleşirse 304
+        """
+        if path == '/api/state':
+            etag = f'"state-{self.token}-' + '-'.join(str(self.snapshots[name][0]) for name in self.snapshots) + '"'
+            body = None
+        elif path.startswith('/api/') and path[5:] in self.snapshots:
+            _, etag, body = self.snapshots[path[5:]]
+        else:
+            await self._respond(writer, 404, b'{"error": "not found"}')
+            return
+
+        if headers.get('if-none-match') == etag:
+            self.stats['not_modified'] += 1
+            await self._respond(writer, 304, b'', [f"ETag: {etag}"])
+            return
+
+        if body is None:
+            body = b'{' + b', '.join(f'"{name}": '.encode('utf-8') + snapshot[2]
+                                     for name, snapshot in self.snapshots.items()) + b'}'
+        await self._respond(writer, 200, body, [f"ETag: {etag}"])
+
+    async def _run_action(self, writer, path, query):
+        """
+        POST /api/<ad>?anahtar=değer - işlemi sorgu parametreleriyle çağır, sonucunu 202 ile döndür
+        İşlem {'status': 'error'} dönerse (ör. geçersiz parametre) 400
+        """
+        action = self.actions.get(path[5:]) if path.startswith('/api/') else None
+        if action is None:
+            await self._respond(writer, 404, b'{"error": "not found"}')
+            return
+
+        result = action(dict(parse_qsl(query)))
+        status = 400 if isinstance(result, dict) and result.get('status') == 'error' else 202
+        await self._respond(writer, status, json.dumps(result, default=_json_default, ensure_ascii=False).encode('utf-8'))
+
+    async def _stream_events(self, writer):
+        """
+        Server-Sent Events: önce mevcut durumlar, sonra sadece değişiklikler
+        """
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Access-Control-Allow-Origin: *\r\nConnection: keep-alive\r\n\r\n")
+
+        subscriber = asyncio.Queue(maxsize=64)
+        for name, (version, _, body) in self.snapshots.items():
+            subscriber.put_nowait(f"id: {name}-{version}\nevent: {name}\ndata: ".encode('utf-8') + body + b"\n\n")
+        self.subscribers.add(subscriber)
+
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    message = b": keep-alive\n\n"
+                writer.write(message)
+                await writer.drain()
+        finally:
+            self.subscribers.discard(subscriber)
+
+    def stop(self):
+        """
+        Sunucuyu durdur (frame döngüsünden çağrılabilir, beklemez)
+        """
+        if self.stopping is not None and self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.stopping.set)
+        self.thread.join(timeout=2.0)
+        print(f"🌐 Durum API'si durduruldu: {self.stats}")
+
+# Test fonksiyonu
+def test_state_server(port=8765, polls=500):
+    """
+    Sahte durumla sunucuyu başlat, ETag'li yoklama ve SSE akışını dene
+    """
+    import http.client
+
+    counter = {'value': 0}
+    server = StateServer({'tables': lambda: [{'table': 'MASA_1', 'count': counter['value']}],
+                          'waiters': lambda: {'GARSON_1': {'performance_score': 100}}},
+                         port=port, refresh_interval=0.05).start()
+    time.sleep(0.2)
+
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    connection.request('GET', '/api/tables')
+    response = connection.getresponse()
+    etag = response.getheader('ETag')
+    print(f"   GET /api/tables: {response.status} {etag} {response.read().decode()}")
+
+    start = time.perf_counter()
+    for _ in range(polls):
+        connection.request('GET', '/api/tables', headers={'If-None-Match': etag})
+        response = connection.getresponse()
+        response.read()
+    elapsed = time.perf_counter() - start
+    print(f"   {polls} ETag'li yoklama: son durum {response.status}, {elapsed / polls * 1000:.2f} ms/istek")
+
+    stream = http.client.HTTPConnection('127.0.0.1', port)
+    stream.request('GET', '/api/events')
+    events = stream.getresponse()
+    counter['value'] += 1
+    received = [events.fp.readline().decode().strip() for _ in range(12)]
+    print(f"   SSE: {[line for line in received if line.startswith(('event:', 'data:'))]}")
+
+    stream.close()
+    connection.close()
+    server.stop()
+
+if __name__ == "__main__":
+    test_state_server()
@@ -1,340 +1,445 @@
-"""
-Adım 2: Müşteri Geldiğinde Zamanlayıcı Başlatma
-TableManager sınıfı - Masa durumları ve zamanlayıcı yönetimi
-"""
-
-from datetime import datetime, timedelta
-from enum import Enum
-import time
-
-class TableStatus(Enum):
-    """Masa durumları"""
-    EMPTY = "empty"          # Boş masa (QR kod görünür)
-    OCCUPIED = "occupied"    # Müşteri var (QR kod görünmez)
-    WAITING = "waiting"      # Müşteri geldi, garson bekleniyor
-    SERVED = "served"        # Garson geldi, servis yapıldı
-
-class TableTimer:
-    """Her masa için zamanlayıcı"""
-    def __init__(self, table_id):
-        self.table_id = table_id
-        self.customer_arrival_time = None
-        self.waiter_arrival_time = None
-        self.service_start_time = None
-        self.response_time = None
-        self.warning_issued = False
-        
-    def start_customer_timer(self):
-        """Müşteri geldiğinde zamanlayıcıyı başlat"""
-        self.customer_arrival_time = datetime.now()
-        self.waiter_arrival_time = None
-        self.service_start_time = None
-        self.response_time = None
-        self.warning_issued = False
-        print(f"⏰ {self.table_id.upper()}: Müşteri zamanlayıcısı başlatıldı ({self.customer_arrival_time.strftime('%H:%M:%S')})")
-    
-    def waiter_arrived(self):
-        """Garson geldiğinde zamanlayıcıyı durdur"""
-        if self.customer_arrival_time:
-            self.waiter_arrival_time = datetime.now()
-            self.response_time = (self.waiter_arrival_time - self.customer_arrival_time).total_seconds()
-            print(f"👨‍💼 {self.table_id.upper()}: Garson geldi! Yanıt süresi: {self.response_time:.1f} saniye")
-            return self.response_time
-        return None
-    
-    def get_waiting_time(self):
-        """Şu anki bekleme süresini al"""
-        if self.customer_arrival_time and not self.waiter_arrival_time:
-            return (datetime.now() - self.customer_arrival_time).total_seconds()
-        return 0
-    
-    def check_warning(self, warning_threshold=60):
-        """Uyarı kontrolü (varsayılan 60 saniye)"""
-        waiting_time = self.get_waiting_time()
-        if waiting_time > warning_threshold and not self.warning_issued:
-            self.warning_issued = True
-            print(f"⚠️ UYARI: {self.table_id.upper()} - Garson {waiting_time:.1f} saniyedir gelmedi!")
-            return True
-        return False
-    
-    def reset(self):
-        """Zamanlayıcıyı sıfırla"""
-        self.customer_arrival_time = None
-        self.waiter_arrival_time = None
-        self.service_start_time = None
-        self.response_time = None
-        self.warning_issued = False
-
-class TableManager:
-    """Masa yönetimi sistemi"""
-    def __init__(self):
-        self.tables = {
-            "table_1": {
-                "status": TableStatus.EMPTY,
-                "qr_visible": True,
-                "last_update": None,
-                "timer": TableTimer("table_1"),
-                "waiter_assigned": None,  # hangi garson sorumlu
-                "customer_count": 0,
-                "total_waiting_time": 0,
-                "service_count": 0
-            },
-            "table_2": {
-                "status": TableStatus.EMPTY,
-                "qr_visible": True,
-                "last_update": None,
-                "timer": TableTimer("table_2"),
-                "waiter_assigned": None,
-                "customer_count": 0,
-                "total_waiting_time": 0,
-                "service_count": 0
-            },
-            "table_3": {
-                "status": TableStatus.EMPTY,
-                "qr_visible": True,
-                "last_update": None,
-                "timer": TableTimer("table_3"),
-                "waiter_assigned": None,
-                "customer_count": 0,
-                "total_waiting_time": 0,
-                "service_count": 0
-            },
-            "table_4": {
-                "status": TableStatus.EMPTY,
-                "qr_visible": True,
-                "last_update": None,
-                "timer": TableTimer("table_4"),
-                "waiter_assigned": None,
-                "customer_count": 0,
-                "total_waiting_time": 0,
-                "service_count": 0
-            }
-        }
-        
-        # Garson-masa atamaları (proje tanımına göre)
-        self.waiter_assignments = {
-            "table_1": "GARSON_1",  # İlk iki masa birinci garson
-            "table_2": "GARSON_1",
-            "table_3": "GARSON_2",  # Son iki masa ikinci garson
-            "table_4": "GARSON_2"
-        }
-        
-        # Garson performans takibi
-        self.waiter_performance = {
-            "GARSON_1": {
-                "total_responses": 0,
-                "total_response_time": 0,
-                "average_response_time": 0,
-                "warnings": 0,
-                "tables_served": []
-            },
-            "GARSON_2": {
-                "total_responses": 0,
-                "total_response_time": 0,
-                "average_response_time": 0,
-                "warnings": 0,
-                "tables_served": []
-            }
-        }
-    
-    def update_table_qr_status(self, table_qr_codes):
-        """QR kod durumlarına göre masa durumlarını güncelle"""
-        current_time = datetime.now()
-        
-        # Hangi masa QR kodları görüldü
-        visible_tables = []
-        for qr_code in table_qr_codes:
-            if qr_code.startswith("MASA_"):
-                table_num = qr_code.split('_')[1]
-                table_name = f"table_{table_num}"
-                visible_tables.append(table_name)
-        
-        # Tüm masaları kontrol et
-        for table_name, table_data in self.tables.items():
-            
-            if table_name in visible_tables:
-                # QR kod görülüyor - masa boş veya müşteri kalktı
-                if not table_data["qr_visible"]:
-                    print(f"📋 {table_name.upper()}: Müşteri kalktı, masa boşaldı!")
-                    self._customer_left(table_name)
-                
-                table_data["qr_visible"] = True
-                table_data["status"] = TableStatus.EMPTY
-                table_data["last_update"] = current_time
-                
-            else:
-                # QR kod görülmüyor - müşteri geldi
-                if table_data["qr_visible"]:
-                    print(f"👥 {table_name.upper()}: Müşteri geldi!")
-                    self._customer_arrived(table_name)
-                
-                table_data["qr_visible"] = False
-                if table_data["status"] == TableStatus.EMPTY:
-                    table_data["status"] = TableStatus.WAITING
-                table_data["last_update"] = current_time
-    
-    def _customer_arrived(self, table_name):
-        """Müşteri geldiğinde"""
-        table_data = self.tables[table_name]
-        table_data["status"] = TableStatus.WAITING
-        table_data["timer"].start_customer_timer()
-        table_data["customer_count"] += 1
-        
-        # Garson ataması
-        assigned_waiter = self.waiter_assignments[table_name]
-        table_data["waiter_assigned"] = assigned_waiter
-        
-        print(f"🔔 {table_name.upper()}: Atanan garson: {assigned_waiter}")
-    
-    def _customer_left(self, table_name):
-        """Müşteri kalktığında"""
-        table_data = self.tables[table_name]
-        
-        # Eğer garson gelmemişse, bekleme süresini kaydet
-        if table_data["status"] == TableStatus.WAITING:
-            waiting_time = table_data["timer"].get_waiting_time()
-            table_data["total_waiting_time"] += waiting_time
-            
-            # Garson performansına olumsuz kayıt - SADECE 60+ saniye için
-            assigned_waiter = table_data["waiter_assigned"]
-            if assigned_waiter and waiting_time >= 60.0:  # 60 saniye ve üzeri için eksi puan
-                self.waiter_performance[assigned_waiter]["warnings"] += 1
-                print(f"⚠️ {assigned_waiter}: Performans puanı düştü (müşteri {waiting_time:.1f}s bekledi)")
-            elif assigned_waiter and waiting_time < 60.0:
-                print(f"✅ {assigned_waiter}: Müşteri {waiting_time:.1f}s bekledi (60s altında - puan düşmedi)")
-        
-        # Masa durumunu sıfırla
-        table_data["status"] = TableStatus.EMPTY
-        table_data["timer"].reset()
-        table_data["waiter_assigned"] = None
-    
-    def waiter_detected(self, waiter_id, table_position=None):
-        """Garson tespit edildiğinde"""
-        # Hangi masaya yakın olduğunu belirle
-        target_table = None
-        
-        # Eğer pozisyon verilmişse, en yakın masayı bul
-        if table_position:
-            # Şimdilik basit logic - ilerleyen adımlarda geliştirilecek
-            # Garson atama sistemine göre hangi masaları kontrol etmeli
-            for table_name, assigned_waiter in self.waiter_assignments.items():
-                if assigned_waiter == waiter_id:
-                    table_data = self.tables[table_name]
-                    if table_data["status"] == TableStatus.WAITING:
-                        target_table = table_name
-                        break
-        
-        if target_table:
-            response_time = self.tables[target_table]["timer"].waiter_arrived()
-            self.tables[target_table]["status"] = TableStatus.SERVED
-            self.tables[target_table]["service_count"] += 1
-            
-            # Garson performansını güncelle
-            self._update_waiter_performance(waiter_id, response_time, target_table)
-            
-            return target_table, response_time
-        
-        return None, None
-    
-    def _update_waiter_performance(self, waiter_id, response_time, table_name):
-        """Garson performansını güncelle"""
-        if waiter_id in self.waiter_performance and response_time:
-            perf = self.waiter_performance[waiter_id]
-            perf["total_responses"] += 1
-            perf["total_response_time"] += response_time
-            perf["average_response_time"] = perf["total_response_time"] / perf["total_responses"]
-            perf["tables_served"].append({
-                "table": table_name,
-                "response_time": response_time,
-                "timestamp": datetime.now()
-            })
-    
-    def check_warnings(self, warning_threshold=60):
-        """Tüm masalar için uyarı kontrolü"""
-        warnings = []
-        for table_name, table_data in self.tables.items():
-            if table_data["status"] == TableStatus.WAITING:
-                if table_data["timer"].check_warning(warning_threshold):
-                    warnings.append({
-                        "table": table_name,
-                        "waiter": table_data["waiter_assigned"],
-                        "waiting_time": table_data["timer"].get_waiting_time()
-                    })
-        return warnings
-    
-    def get_performance_summary(self):
-        """Performans özetini al"""
-        summary = {}
-        for waiter_id, perf in self.waiter_performance.items():
-            summary[waiter_id] = {
-                "avg_response": round(perf["average_response_time"], 1),
-                "total_services": perf["total_responses"],
-                "warnings": perf["warnings"],
-                "performance_score": self._calculate_performance_score(waiter_id)
-            }
-        return summary
-    
-    def _calculate_performance_score(self, waiter_id):
-        """Garson performans skoru hesapla (0-100)"""
-        perf = self.waiter_performance[waiter_id]
-        
-        if perf["total_responses"] == 0:
-            return 100  # Henüz servis yapmamış
-        
-        # Temel skor: 100
-        score = 100
-        
-        # Ortalama yanıt süresine göre puan kaybı
-        avg_time = perf["average_response_time"]
-        if avg_time > 60:  # 60 saniyeden fazla
-            score -= min(50, (avg_time - 60) / 2)  # Maksimum 50 puan kaybı
-        
-        # Uyarı sayısına göre puan kaybı
-        score -= perf["warnings"] * 10  # Her uyarı için 10 puan kaybı
-        
-        return max(0, round(score, 1))
-    
-    def get_table_status_display(self):
-        """Masa durumlarını görüntüleme için formatla"""
-        status_list = []
-        for table_name, table_data in self.tables.items():
-            status_info = {
-                "table": table_name.replace("table_", "MASA_"),
-                "status": table_data["status"].value,
-                "qr_visible": table_data["qr_visible"],
-                "waiting_time": table_data["timer"].get_waiting_time() if table_data["status"] == TableStatus.WAITING else 0,
-                "assigned_waiter": table_data["waiter_assigned"],
-                "customer_count": table_data["customer_count"]
-            }
-            status_list.append(status_info)
-        return status_list
-
-# Test fonksiyonu
-def test_table_manager():
-    """TableManager sistemini test et"""
-    print("🧪 TableManager Test Ediliyor...")
-    
-    manager = TableManager()
-    
-    # Başlangıç durumu
-    print("\n📋 Başlangıç Masa Durumları:")
-    for status in manager.get_table_status_display():
-        print(f"   {status['table']}: {status['status']}")
-    
-    # Test senaryosu
-    print("\n🎬 Test Senaryosu:")
-    print("1. Table_1'e müşteri geliyor...")
-    manager.update_table_qr_status([])  # QR kod görünmüyor
-    
-    time.sleep(2)
-    
-    print("2. 2 saniye sonra garson geliyor...")
-    manager.waiter_detected("WAITER_1")
-    
-    print("\n📊 Performans Özeti:")
-    summary = manager.get_performance_summary()
-    for waiter, perf in summary.items():
-        print(f"   {waiter}: Skor: {perf['performance_score']}, Ortalama: {perf['avg_response']}s")
-
-if __name__ == "__main__":
-    test_table_manager()
+"""
+Adım 2: Müşteri Geldiğinde Zamanlayıcı Başlatma
+TableManager sınıfı - Masa durumları ve zamanlayıcı yönetimi
+"""
+
+from collections import deque
+from datetime import datetime, timedelta
+from enum import Enum
+import threading
+import time
+from shift_analytics import ARRIVAL, SERVICE, WARNING, DEPARTURE, ABANDON
+
+# Garson başına tutulan son servis sayısı (tüm vardiya geçmişi ShiftAnalytics'te)
+RECENT_SERVICES = 100
+
+class TableStatus(Enum):
+    """Masa durumları"""
+    EMPTY = "empty"          # Boş masa (QR kod görünür)
+    OCCUPIED = "occupied"    # Müşteri var (QR kod görünmez)
+    WAITING = "waiting"      # Müşteri geldi, garson bekleniyor
+    SERVED = "served"        # Garson geldi, servis yapıldı
+
+class VideoClock:
+    """Video zamanı - offline analizde süreler işleme hızından bağımsız, frame numarasından hesaplanır"""
+    def __init__(self, fps, start=None):
+        self.fps = fps or 30.0
+        self.start = start or datetime.now()  # Videonun ilk frame'inin zamanı
+        self.frame = 0
+    
+    def set_frame(self, frame_number):
+        """Saati frame'e ayarla"""
+        self.frame = frame_number
+    
+    def __call__(self):
+        return self.start + timedelta(seconds=self.frame / self.fps)
+
+class TableTimer:
+    """Her masa için zamanlayıcı"""
+    def __init__(self, table_id, clock=datetime.now):
+        self.table_id = table_id
+        self.clock = clock  # datetime döndüren çağrılabilir (canlı: datetime.now, offline: VideoClock)
+        self.customer_arrival_time = None
+        self.waiter_arrival_time = None
+        self.service_start_time = None
+        self.response_time = None
+        self.warning_issued = False
+        
+    def start_customer_timer(self):
+        """Müşteri geldiğinde zamanlayıcıyı başlat"""
+        self.customer_arrival_time = self.clock()
+        self.waiter_arrival_time = None
+        self.service_start_time = None
+        self.response_time = None
+        self.warning_issued = False
+        print(f"⏰ {self.table_id.upper()}: Müşteri zamanlayıcısı başlatıldı ({self.customer_arrival_time.strftime('%H:%M:%S')})")
+    
+    def waiter_arrived(self):
+        """Garson geldiğinde zamanlayıcıyı durdur"""
+        if self.customer_arrival_time:
+            self.waiter_arrival_time = self.clock()
+            self.response_time = (self.waiter_arrival_time - self.customer_arrival_time).total_seconds()
+            print(f"👨‍💼 {self.table_id.upper()}: Garson geldi! Yanıt süresi: {self.response_time:.1f} saniye")
+            return self.response_time
+        return None
+    
+    def get_waiting_time(self):
+        """Şu anki bekleme süresini al"""
+        if self.customer_arrival_time and not self.waiter_arrival_time:
+            return (self.clock() - self.customer_arrival_time).total_seconds()
+        return 0
+    
+    def check_warning(self, warning_threshold=60):
+        """Uyarı kontrolü (varsayılan 60 saniye)"""
+        waiting_time = self.get_waiting_time()
+        if waiting_time > warning_threshold and not self.warning_issued:
+            self.warning_issued = True
+            print(f"⚠️ UYARI: {self.table_id.upper()} - Garson {waiting_time:.1f} saniyedir gelmedi!")
+            return True
+        return False
+    
+    def reset(self):
+        """Zamanlayıcıyı sıfırla"""
+        self.customer_arrival_time = None
+        self.waiter_arrival_time = None
+        self.service_start_time = None
+        self.response_time = None
+        self.warning_issued = False
+
+class TableManager:
+    """Masa yönetimi sistemi"""
+    def __init__(self, analytics=None, waiter_assignments=None, clock=None):
+        # Olaylar verilirse ShiftAnalytics günlüğüne de yazılır (vardiya/ay raporları)
+        self.analytics = analytics
+        
+        # Zaman kaynağı: varsayılan duvar saati, offline analizde VideoClock
+        self.clock = clock or datetime.now
+        
+        # Garson-masa atamaları (proje tanımına göre) - verilirse sadece o masalar yönetilir (ör. bir bölge
+        # veya registry'deki mekân); varsayılan 4 masa sadece atama hiç verilmediğinde kullanılır
+        if waiter_assignments is None:
+            waiter_assignments = {
+                "table_1": "GARSON_1",  # İlk iki masa birinci garson
+                "table_2": "GARSON_1",
+                "table_3": "GARSON_2",  # Son iki masa ikinci garson
+                "table_4": "GARSON_2"
+            }
+        elif not waiter_assignments:
+            raise ValueError("Masa ataması boş: registry'de masa yok veya mekân ID'si hatalı")
+        self.waiter_assignments = waiter_assignments
+        
+        self.tables = {}
+        for table_name in self.waiter_assignments:
+            self.tables[table_name] = {
+                "status": TableStatus.EMPTY,
+                "qr_visible": True,
+                "last_update": None,
+                "timer": TableTimer(table_name, self.clock),
+                "waiter_assigned": None,  # hangi garson sorumlu
+                "customer_count": 0,
+                "total_waiting_time": 0,
+                "service_count": 0
+            }
+        
+        # Garson performans takibi (garsonu atanmamış masalar None ile gelir)
+        self.waiter_performance = {}
+        for waiter_id in filter(None, self.waiter_assignments.values()):
+            self.waiter_performance.setdefault(waiter_id, {
+                "total_responses": 0,
+                "total_response_time": 0,
+                "average_response_time": 0,
+                "warnings": 0,
+                "tables_served": deque(maxlen=RECENT_SERVICES)
+            })
+        
+        # Eşzamanlı beslemeler (birden fazla kamera/thread) için kilitler
+        # Kilit sırası her zaman masa -> garson (kilitlenme olmaz)
+        self.table_locks = {table_name: threading.Lock() for table_name in self.tables}
+        self.waiter_locks = {waiter_id: threading.Lock() for waiter_id in self.waiter_performance}
+        
+        # Okuyucular için yayınlanan anlık görüntüler: yazarlar kilit altındayken yeni nesneyle
+        # değiştirir, okuyucular kilitsiz okur (yazarları bekletmez, yarım güncelleme görmez)
+        self._table_snapshots = {}
+        for table_name in self.tables:
+            self._publish_table(table_name)
+        self._performance_snapshots = {waiter_id: (0, 0.0, 0) for waiter_id in self.waiter_performance}
+    
+    def set_clock(self, clock):
+        """Zaman kaynağını değiştir (ör. offline analizde VideoClock)"""
+        self.clock = clock
+        for table_data in self.tables.values():
+            table_data["timer"].clock = clock
+    
+    def __getstate__(self):
+        """Checkpoint için: kilitler pickle edilemez, yüklenince yeniden oluşturulur"""
+        state = self.__dict__.copy()
+        del state["table_locks"], state["waiter_locks"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.table_locks = {table_name: threading.Lock() for table_name in self.tables}
+        self.waiter_locks = {waiter_id: threading.Lock() for waiter_id in self.waiter_performance}
+    
+    def shift_timers(self, seconds):
+        """
+        Açık zamanlayıcıları ileri kaydır (checkpoint'ten devam edilirken aradaki süre beklemeye eklenmesin)
+        """
+        for table_name, table_data in self.tables.items():
+            with self.table_locks[table_name]:
+                timer = table_data["timer"]
+                if timer.customer_arrival_time:
+                    timer.customer_arrival_time += timedelta(seconds=seconds)
+                if timer.waiter_arrival_time:
+                    timer.waiter_arrival_time += timedelta(seconds=seconds)
+                self._publish_table(table_name)
+    
+    def _publish_table(self, table_name):
+        """Masanın okuyuculara görünen anlık görüntüsünü yenile (masa kilidi altında çağrılır)"""
+        table_data = self.tables[table_name]
+        self._table_snapshots[table_name] = {
+            "status": table_data["status"],
+            "qr_visible": table_data["qr_visible"],
+            "customer_arrival_time": table_data["timer"].customer_arrival_time,
+            "waiter_assigned": table_data["waiter_assigned"],
+            "customer_count": table_data["customer_count"]
+        }
+    
+    def _publish_performance(self, waiter_id):
+        """Garsonun anlık performans görüntüsünü yenile (garson kilidi altında çağrılır)"""
+        perf = self.waiter_performance[waiter_id]
+        self._performance_snapshots[waiter_id] = (perf["total_responses"], perf["total_response_time"], perf["warnings"])
+    
+    def update_table_qr_status(self, table_qr_codes, observed_tables=None):
+        """
+        QR kod durumlarına göre masa durumlarını güncelle
+        observed_tables verilirse sadece bu masalar değerlendirilir (kameranın gördüğü masalar)
+        """
+        current_time = self.clock()
+        
+        # Hangi masa QR kodları görüldü (MASA_x -> table_x, diğer masa ID'leri olduğu gibi)
+        visible_tables = []
+        for qr_code in table_qr_codes:
+            table_name = qr_code.replace("MASA_", "table_")
+            if table_name in self.tables:
+                visible_tables.append(table_name)
+        
+        # Tüm masaları kontrol et (her masa kendi kilidiyle güncellenir)
+        for table_name, table_data in self.tables.items():
+            if observed_tables is not None and table_name not in observed_tables:
+                continue
+            
+            with self.table_locks[table_name]:
+                
+                if table_name in visible_tables:
+                    # QR kod görülüyor - masa boş veya müşteri kalktı
+                    if not table_data["qr_visible"]:
+                        print(f"📋 {table_name.upper()}: Müşteri kalktı, masa boşaldı!")
+                        self._customer_left(table_name)
+                    
+                    table_data["qr_visible"] = True
+                    table_data["status"] = TableStatus.EMPTY
+                    table_data["last_update"] = current_time
+                    
+                else:
+                    # QR kod görülmüyor - müşteri geldi
+                    if table_data["qr_visible"]:
+                        print(f"👥 {table_name.upper()}: Müşteri geldi!")
+                        self._customer_arrived(table_name)
+                    
+                    table_data["qr_visible"] = False
+                    if table_data["status"] == TableStatus.EMPTY:
+                        table_data["status"] = TableStatus.WAITING
+                    table_data["last_update"] = current_time
+                
+                self._publish_table(table_name)
+    
+    def _customer_arrived(self, table_name):
+        """Müşteri geldiğinde (masa kilidi altında çağrılır)"""
+        table_data = self.tables[table_name]
+        table_data["status"] = TableStatus.WAITING
+        table_data["timer"].start_customer_timer()
+        table_data["customer_count"] += 1
+        
+        # Garson ataması
+        assigned_waiter = self.waiter_assignments[table_name]
+        table_data["waiter_assigned"] = assigned_waiter
+        
+        print(f"🔔 {table_name.upper()}: Atanan garson: {assigned_waiter}")
+        self._record_event(ARRIVAL, table_name, assigned_waiter)
+    
+    def _customer_left(self, table_name):
+        """Müşteri kalktığında (masa kilidi altında çağrılır)"""
+        table_data = self.tables[table_name]
+        
+        # Eğer garson gelmemişse, bekleme süresini kaydet
+        if table_data["status"] == TableStatus.WAITING:
+            waiting_time = table_data["timer"].get_waiting_time()
+            table_data["total_waiting_time"] += waiting_time
+            
+            # Garson performansına olumsuz kayıt - SADECE 60+ saniye için
+            assigned_waiter = table_data["waiter_assigned"]
+            if assigned_waiter and waiting_time >= 60.0:  # 60 saniye ve üzeri için eksi puan
+                with self.waiter_locks[assigned_waiter]:
+                    self.waiter_performance[assigned_waiter]["warnings"] += 1
+                    self._publish_performance(assigned_waiter)
+                print(f"⚠️ {assigned_waiter}: Performans puanı düştü (müşteri {waiting_time:.1f}s bekledi)")
+            elif assigned_waiter and waiting_time < 60.0:
+                print(f"✅ {assigned_waiter}: Müşteri {waiting_time:.1f}s bekledi (60s altında - puan düşmedi)")
+            self._record_event(ABANDON, table_name, assigned_waiter, waiting_time)
+        else:
+            self._record_event(DEPARTURE, table_name, table_data["waiter_assigned"])
+        
+        # Masa durumunu sıfırla
+        table_data["status"] = TableStatus.EMPTY
+        table_data["timer"].reset()
+        table_data["waiter_assigned"] = None
+    
+    def waiter_detected(self, waiter_id, table_position=None, table_name=None):
+        """Garson tespit edildiğinde (table_name verilirse sadece o masaya servis yazılır)"""
+        # Hangi masaya yakın olduğunu belirle
+        target_table = None
+        response_time = None
+        
+        # Masa biliniyorsa sadece o, yoksa garsonun atandığı masalar sırayla
+        if table_name is not None:
+            candidates = [(table_name, self.waiter_assignments.get(table_name))]
+        else:
+            candidates = self.waiter_assignments.items()
+        
+        # Eğer pozisyon verilmişse, en yakın masayı bul
+        if table_position:
+            # Şimdilik basit logic - ilerleyen adımlarda geliştirilecek
+            # Garson atama sistemine göre hangi masaları kontrol etmeli
+            for candidate_table, assigned_waiter in candidates:
+                if assigned_waiter == waiter_id:
+                    # Kontrol ve servis aynı kilit altında - iki besleme aynı masaya iki kez servis yazamaz
+                    with self.table_locks[candidate_table]:
+                        table_data = self.tables[candidate_table]
+                        if table_data["status"] == TableStatus.WAITING:
+                            target_table = candidate_table
+                            response_time = table_data["timer"].waiter_arrived()
+                            table_data["status"] = TableStatus.SERVED
+                            table_data["service_count"] += 1
+                            self._publish_table(candidate_table)
+                    if target_table:
+                        break
+        
+        if target_table:
+            # Garson performansını güncelle
+            self._update_waiter_performance(waiter_id, response_time, target_table)
+            self._record_event(SERVICE, target_table, waiter_id, response_time)
+            
+            return target_table, response_time
+        
+        return None, None
+    
+    def _update_waiter_performance(self, waiter_id, response_time, table_name):
+        """Garson performansını güncelle"""
+        if waiter_id in self.waiter_performance and response_time is not None:  # 0.0 s da geçerli servis
+            with self.waiter_locks[waiter_id]:
+                perf = self.waiter_performance[waiter_id]
+                perf["total_responses"] += 1
+                perf["total_response_time"] += response_time
+                perf["average_response_time"] = perf["total_response_time"] / perf["total_responses"]
+                perf["tables_served"].append({
+                    "table": table_name,
+                    "response_time": response_time,
+                    "timestamp": self.clock()
+                })
+                self._publish_performance(waiter_id)
+    
+    def check_warnings(self, warning_threshold=60):
+        """Tüm masalar için uyarı kontrolü"""
+        warnings = []
+        for table_name, table_data in self.tables.items():
+            with self.table_locks[table_name]:
+                if table_data["status"] == TableStatus.WAITING:
+                    if table_data["timer"].check_warning(warning_threshold):
+                        warnings.append({
+                            "table": table_name,
+                            "waiter": table_data["waiter_assigned"],
+                            "waiting_time": table_data["timer"].get_waiting_time()
+                        })
+                        self._record_event(WARNING, table_name, table_data["waiter_assigned"],
+                                           warnings[-1]["waiting_time"])
+        return warnings
+    
+    def _record_event(self, kind, table_name, waiter_id=None, value=0.0):
+        """Analitik günlüğüne olay yaz (masa adı MASA_x formatında)"""
+        if self.analytics is not None:
+            self.analytics.record(kind, table_name.replace("table_", "MASA_"), waiter_id, value or 0.0,
+                                  timestamp=self.clock().timestamp())
+    
+    def get_performance_totals(self):
+        """Garson bazlı ham sayaçlar (bölgeler arası birleştirme için)"""
+        return {
+            waiter_id: {"total_responses": total_responses, "total_response_time": total_response_time, "warnings": warnings}
+            for waiter_id, (total_responses, total_response_time, warnings) in self._performance_snapshots.items()
+        }
+    
+    def get_performance_summary(self):
+        """Performans özetini al (yayınlanan anlık görüntülerden, kilitsiz)"""
+        return self.summarize_performance(self.get_performance_totals())
+    
+    @staticmethod
+    def summarize_performance(performance_totals):
+        """Ham sayaçlardan performans özeti: {garson: {avg_response, total_services, warnings, performance_score}}"""
+        summary = {}
+        for waiter_id, totals in performance_totals.items():
+            total_responses, total_response_time, warnings = (
+                totals["total_responses"], totals["total_response_time"], totals["warnings"])
+            average_response_time = total_response_time / total_responses if total_responses else 0
+            summary[waiter_id] = {
+                "avg_response": round(average_response_time, 1),
+                "total_services": total_responses,
+                "warnings": warnings,
+                "performance_score": TableManager._calculate_performance_score(
+                    total_responses, average_response_time, warnings)
+            }
+        return summary
+    
+    @staticmethod
+    def _calculate_performance_score(total_responses, average_response_time, warnings):
+        """Garson performans skoru hesapla (0-100)"""
+        if total_responses == 0:
+            return 100  # Henüz servis yapmamış
+        
+        # Temel skor: 100
+        score = 100
+        
+        # Ortalama yanıt süresine göre puan kaybı
+        if average_response_time > 60:  # 60 saniyeden fazla
+            score -= min(50, (average_response_time - 60) / 2)  # Maksimum 50 puan kaybı
+        
+        # Uyarı sayısına göre puan kaybı
+        score -= warnings * 10  # Her uyarı için 10 puan kaybı
+        
+        return max(0, round(score, 1))
+    
+    def get_table_status_display(self):
+        """Masa durumlarını görüntüleme için formatla (yayınlanan anlık görüntülerden, kilitsiz)"""
+        now = self.clock()
+        status_list = []
+        for table_name, snapshot in list(self._table_snapshots.items()):
+            waiting = snapshot["status"] == TableStatus.WAITING and snapshot["customer_arrival_time"]
+            status_info = {
+                "table": table_name.replace("table_", "MASA_"),
+                "status": snapshot["status"].value,
+                "qr_visible": snapshot["qr_visible"],
+                "waiting_time": (now - snapshot["customer_arrival_time"]).total_seconds() if waiting else 0,
+                "assigned_waiter": snapshot["waiter_assigned"],
+                "customer_count": snapshot["customer_count"]
+            }
+            status_list.append(status_info)
+        return status_list
+
+# Test fonksiyonu
+def test_table_manager():
+    """TableManager sistemini test et"""
+    print("🧪 TableManager Test Ediliyor...")
+    
+    manager = TableManager()
+    
+    # Başlangıç durumu
+    print("\n📋 Başlangıç Masa Durumları:")
+    for status in manager.get_table_status_display():
+        print(f"   {status['table']}: {status['status']}")
+    
+    # Test senaryosu
+    print("\n🎬 Test Senaryosu:")
+    print("1. Table_1'e müşteri geliyor...")
+    manager.update_table_qr_status([])  # QR kod görünmüyor
+    
+    time.sleep(2)
+    
+    print("2. 2 saniye sonra garson geliyor...")
+    manager.waiter_detected("WAITER_1")
+    
+    print("\n📊 Performans Özeti:")
+    summary = manager.get_performance_summary()
+    for waiter, perf in summary.items():
+        print(f"   {waiter}: Skor: {perf['performance_score']}, Ortalama: {perf['avg_response']}s")
+
+if __name__ == "__main__":
+    test_table_manager()
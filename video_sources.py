@@ -0,0 +1,340 @@
+"""
+Frame Kaynakları
+Video dosyası/kamera (cv2.VideoCapture), resim klasörü, sentetik restoran sahnesi ve
+bellek eşlemeli (mmap) ham frame dosyası aynı cv2.VideoCapture arayüzüyle okunur
+(read/get/set/isOpened/release) - process_video ve benchmark'lar kaynaktan bağımsız çalışır.
+
+Ham frame dosyası: 32 baytlık başlık + sabit adımlı BGR (H×W×3) veya gri (H×W) frame'ler.
+BGR frame'ler kopyasız, salt okunur NumPy görünümleri olarak verilir (üzerine çizecek tüketici
+kopyalar); gri frame'ler okunurken BGR'ye çevrilir (tespit ve çizim 3 kanal bekler).
+"""
+
+import os
+import struct
+import time
+from bisect import bisect_right
+import cv2
+import numpy as np
+
+SYNTHETIC_PREFIX = "synthetic"
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+RAW_MAGIC = b'RAWFRM01'
+RAW_HEADER = struct.Struct('<8sIIIfQ')  # magic, genişlik, yükseklik, kanal, fps, frame sayısı
+RAW_HEADER_SIZE = 32
+
+class FrameSource:
+    """cv2.VideoCapture uyumlu kaynak tabanı: alt sınıflar _frame(index) sağlar"""
+
+    def __init__(self, width, height, fps, frame_count):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_count = frame_count
+        self.position = 0
+        self.opened = True
+
+    def _frame(self, index):
+        raise NotImplementedError
+
+    def read(self):
+        if not self.opened or self.position >= self.frame_count:
+            return False, None
+        frame = self._frame(self.position)
+        self.position += 1
+        return frame is not None, frame
+
+    def get(self, prop):
+        return {
+            cv2.CAP_PROP_FPS: float(self.fps),
+            cv2.CAP_PROP_FRAME_COUNT: float(self.frame_count),
+            cv2.CAP_PROP_FRAME_WIDTH: float(self.width),
+            cv2.CAP_PROP_FRAME_HEIGHT: float(self.height),
+            cv2.CAP_PROP_POS_FRAMES: float(self.position)
+        }.get(prop, 0.0)
+
+    def set(self, prop, value):
+        if prop != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        self.position = int(max(0, min(value, self.frame_count)))
+        return True
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        self.opened = False
+
+class ImageDirectorySource(FrameSource):
+    """Klasördeki resimler (isim sırasıyla) - sabit fps ile"""
+
+    def __init__(self, directory, fps=10):
+        self.paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        first = cv2.imread(self.paths[0]) if self.paths else None
+        height, width = first.shape[:2] if first is not None else (0, 0)
+        super().__init__(width, height, fps, len(self.paths))
+        self.opened = first is not None
+
+    def _frame(self, index):
+        return cv2.imread(self.paths[index])
+
+class RawFrameSource(FrameSource):
+    """Bellek eşlemeli ham frame dosyası - BGR frame'ler kopyasız, salt okunur görünümlerdir (gri: BGR'ye çevrilir)"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            magic, width, height, channels, fps, frame_count = RAW_HEADER.unpack(f.read(RAW_HEADER.size))
+        if magic != RAW_MAGIC:
+            raise ValueError(f"Ham frame dosyası değil: {path}")
+        if channels not in (1, 3):
+            raise ValueError(f"Desteklenmeyen kanal sayısı: {channels} ({path}, BGR veya gri olmalı)")
+
+        super().__init__(width, height, fps, frame_count)
+        shape = (frame_count, height, width) if channels == 1 else (frame_count, height, width, channels)
+        # 'r' (salt okunur): sayfalar sayfa önbelleğinde paylaşılır ve geri alınabilir. Çizim yapacak
+        # tüketici frame'i kopyalar ('c' ile çizilen her sayfa sürece özel, hiç bırakılmayan bellek olurdu)
+        self.frames = np.memmap(path, dtype=np.uint8, mode='r', offset=RAW_HEADER_SIZE, shape=shape)
+
+    def _frame(self, index):
+        frame = self.frames[index]
+        return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR) if frame.ndim == 2 else frame
+
+    def release(self):
+        super().release()
+        self.frames = None
+
+class SyntheticRestaurantSource(FrameSource):
+    """
+    Video dosyası veya kamera olmadan test için sentetik restoran sahnesi
+    Masa QR kodları müşteri oturunca kapanır. Garsonlar kadraj dışındadır; QR'ları sadece planlanan
+    yanıt süresinde masanın yanında görünür (ziyaretlerin bir kısmında garson 60 saniyeden geç gelir).
+    badges='aruco' ile garson kartları ArUco rozeti olarak çizilir (içerik "aruco:<sıra>").
+    Aynı seed ile her zaman aynı frame'ler üretilir.
+    """
+
+    TABLES = (("m001", "g001"), ("m002", "g001"), ("m003", "g002"), ("m004", "g002"))
+
+    def __init__(self, duration=120.0, fps=15, width=960, height=640, seed=0, qr_size=96, badges='qr'):
+        super().__init__(width, height, fps, int(duration * fps))
+        rng = np.random.default_rng(seed)
+        self.qr_size = qr_size
+
+        encoder = cv2.QRCodeEncoder.create()
+        def render_qr(text):
+            code = cv2.resize(encoder.encode(text), (qr_size, qr_size), interpolation=cv2.INTER_NEAREST)
+            return cv2.cvtColor(code, cv2.COLOR_GRAY2BGR)
+
+        # Masalar 2×2 ızgarada, QR kodu masanın ortasında
+        self.table_centers = [(int(width * (0.25 + 0.5 * (i % 2))), int(height * (0.3 + 0.45 * (i // 2))))
+                              for i in range(len(self.TABLES))]
+        self.table_codes = [render_qr(table_code) for table_code, _ in self.TABLES]
+        self.waiter_codes = {waiter: render_qr(waiter) for waiter in dict.fromkeys(w for _, w in self.TABLES)}
+        self.waiter_payloads = {waiter: waiter for waiter in self.waiter_codes}
+        if badges == 'aruco':
+            from badge_markers import marker_payload, render_badge
+            for marker_id, waiter in enumerate(self.waiter_codes, start=1):
+                self.waiter_codes[waiter] = render_badge(marker_id, qr_size)
+                self.waiter_payloads[waiter] = marker_payload(marker_id)
+
+        self.background = np.full((height, width, 3), (70, 90, 110), dtype=np.uint8)
+        for cx, cy in self.table_centers:
+            cv2.rectangle(self.background, (cx - 120, cy - 80), (cx + 120, cy + 80), (40, 60, 90), -1)
+
+        # Masa başına dolu aralıklar [(oturma, kalkma, garsonun geliş süresi)] - saniye
+        # Ziyaretlerin ~%15'inde garson geç gelir (60 s uyarı eşiğini aşar), müşteri garsonu bekler
+        self.occupancy = []
+        for _ in self.TABLES:
+            intervals, t = [], float(rng.uniform(2, 15))
+            while t < duration:
+                stay = float(rng.uniform(15, 45))
+                if rng.random() < 0.15:
+                    response = float(rng.uniform(65, 90))
+                    stay = max(stay, response + 10.0)
+                else:
+                    response = float(rng.uniform(3, min(20, stay)))
+                intervals.append((t, t + stay, response))
+                t += stay + float(rng.uniform(5, 25))
+            self.occupancy.append(intervals)
+        self.occupancy_starts = [[start for start, _, _ in intervals] for intervals in self.occupancy]
+
+    def visit_at(self, table_index, t):
+        """
+        t anındaki ziyaret (oturma, kalkma, garsonun geliş süresi) - masa boşsa None
+        Aralıklar sıralı ve ayrık: ikili arama (uzun simülasyonlarda da frame başına sabit maliyet)
+        """
+        intervals = self.occupancy[table_index]
+        position = bisect_right(self.occupancy_starts[table_index], t) - 1
+        if position >= 0 and t < intervals[position][1]:
+            return intervals[position]
+        return None
+
+    def _table_state(self, table_index, t):
+        """
+        (dolu mu, garson masada mı)
+        """
+        visit = self.visit_at(table_index, t)
+        if visit is None:
+            return False, False
+        start, _, response = visit
+        return True, start + response <= t < start + response + 4.0
+
+    def _paste(self, frame, code, center):
+        half = self.qr_size // 2
+        x = int(np.clip(center[0] - half, 0, self.width - self.qr_size))
+        y = int(np.clip(center[1] - half, 0, self.height - self.qr_size))
+        frame[y:y + self.qr_size, x:x + self.qr_size] = code
+
+    def _layout(self, index):
+        """
+        (masa başına dolu mu, garson -> konum) - frame index anında
+        Sadece masasında olan garsonlar kadrajdadır
+        """
+        t = index / self.fps
+        occupied_tables = []
+        waiter_targets = {}
+        for table_index, (center, (_, waiter)) in enumerate(zip(self.table_centers, self.TABLES)):
+            occupied, waiter_at_table = self._table_state(table_index, t)
+            occupied_tables.append(occupied)
+            if waiter_at_table:
+                waiter_targets[waiter] = self._inside_border((center[0], center[1] + 110))
+        return occupied_tables, waiter_targets
+
+    def _inside_border(self, center):
+        """
+        Kartın tamamı ve çevresinde boşluk (kod boyutunun 1/4'ü) frame içinde kalacak merkez
+        (kenara yapışan rozetin dış sınırı ArUco bulucusunda kaybolur)
+        """
+        low = self.qr_size // 2 + self.qr_size // 4
+        return (min(max(center[0], low), self.width - low), min(max(center[1], low), self.height - low))
+
+    def visible_qr(self, index):
+        """
+        Frame'de görünen QR kodları ve merkezleri [(içerik, (x, y))] - kapanmamış masa kodları
+        ve masada olan garsonların kartları (frame'i çizmeden; uzun simülasyonlar için)
+        """
+        occupied_tables, waiter_targets = self._layout(index)
+        codes = [(table_code, center) for (table_code, _), center, occupied
+                 in zip(self.TABLES, self.table_centers, occupied_tables) if not occupied]
+        codes.extend((self.waiter_payloads[waiter], position) for waiter, position in waiter_targets.items())
+        return [(code, self._clip_center(center)) for code, center in codes]
+
+    def visible_codes(self, index):
+        """
+        Frame'de görünen QR içerikleri (etiket)
+        """
+        return {code for code, _ in self.visible_qr(index)}
+
+    def _clip_center(self, center):
+        """
+        _paste'in frame içine kaydırdığı kodun gerçek merkezi
+        """
+        half = self.qr_size // 2
+        return (min(max(center[0] - half, 0), self.width - self.qr_size) + half,
+                min(max(center[1] - half, 0), self.height - self.qr_size) + half)
+
+    def _frame(self, index):
+        frame = self.background.copy()
+
+        occupied_tables, waiter_targets = self._layout(index)
+        for table_index, (center, occupied) in enumerate(zip(self.table_centers, occupied_tables)):
+            if not occupied:
+                self._paste(frame, self.table_codes[table_index], center)
+            else:
+                cv2.circle(frame, center, 50, (60, 60, 160), -1)  # Müşteri QR'ı kapatıyor
+
+        for waiter, position in waiter_targets.items():
+            self._paste(frame, self.waiter_codes[waiter], position)
+
+        return frame
+
+def source_exists(spec):
+    """
+    Kaynak açılabilir mi (sentetik kaynak ve kamera indeksi her zaman var sayılır)
+    """
+    spec = str(spec)
+    return spec.startswith(SYNTHETIC_PREFIX) or spec.isdigit() or os.path.exists(spec)
+
+def open_video_source(spec):
+    """
+    Kaynak tanımından okuyucu oluştur:
+      0, 1, ...           -> kamera (cv2.VideoCapture)
+      klasör              -> ImageDirectorySource
+      *.raw               -> RawFrameSource (mmap)
+      synthetic[:saniye[:aruco]] -> SyntheticRestaurantSource (aruco: garson kartları ArUco rozeti)
+      diğer               -> video dosyası / yayın URL'si (cv2.VideoCapture)
+    """
+    spec = str(spec)
+    if spec.isdigit():
+        return cv2.VideoCapture(int(spec))
+    if spec.startswith(SYNTHETIC_PREFIX):
+        _, _, options = spec.partition(':')
+        duration, _, badges = options.partition(':')
+        return SyntheticRestaurantSource(duration=float(duration) if duration else 120.0, badges=badges or 'qr')
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec)
+    if spec.lower().endswith('.raw'):
+        return RawFrameSource(spec)
+    return cv2.VideoCapture(spec)
+
+def write_raw_frames(source, path, gray=False, max_frames=None, size=None):
+    """
+    Kaynağı ham frame dosyasına çöz (bir kez decode, sonra bellek hızında tekrar oynat)
+    size: (genişlik, yükseklik) verilirse frame'ler yeniden boyutlandırılır
+    """
+    fps = source.get(cv2.CAP_PROP_FPS) or 30.0
+    channels = 1 if gray else 3
+    frame_count = 0
+    width = height = 0
+
+    with open(path, 'wb') as f:
+        f.write(b'\0' * RAW_HEADER_SIZE)  # Başlık frame sayısı bilinince yazılır
+        while max_frames is None or frame_count < max_frames:
+            ret, frame = source.read()
+            if not ret:
+                break
+            if size is not None:
+                frame = cv2.resize(frame, size)
+            if gray:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            height, width = frame.shape[:2]
+            f.write(np.ascontiguousarray(frame).tobytes())
+            frame_count += 1
+
+        f.seek(0)
+        f.write(RAW_HEADER.pack(RAW_MAGIC, width, height, channels, fps, frame_count).ljust(RAW_HEADER_SIZE, b'\0'))
+
+    return frame_count
+
+def measure_read_speed(spec, max_frames=300):
+    """
+    Kaynaktan okuma hızı (frame/s) - analiz aşamalarından bağımsız
+    """
+    source = open_video_source(spec)
+    frames = 0
+    start = time.perf_counter()
+    while frames < max_frames:
+        ret, frame = source.read()
+        if not ret:
+            break
+        frames += 1
+    elapsed = time.perf_counter() - start
+    source.release()
+    return frames, frames / elapsed if elapsed > 0 else 0.0
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Frame kaynakları: ham dosyaya çevirme ve okuma hızı")
+    parser.add_argument("source", help="Video, klasör, .raw dosyası, kamera indeksi veya synthetic[:saniye]")
+    parser.add_argument("--to-raw", help="Kaynağı bu ham frame dosyasına çöz")
+    parser.add_argument("--gray", action="store_true", help="Ham dosyayı gri tonlamalı yaz")
+    parser.add_argument("--max-frames", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.to_raw:
+        count = write_raw_frames(open_video_source(args.source), args.to_raw, args.gray, args.max_frames)
+        print(f"💾 {count} frame yazıldı: {args.to_raw} ({os.path.getsize(args.to_raw) / 1e6:.1f} MB)")
+
+    for spec in filter(None, (args.source, args.to_raw)):
+        frames, fps = measure_read_speed(spec, args.max_frames or 300)
+        print(f"📊 {spec}: {frames} frame, {fps:.0f} frame/s okuma")
@@ -1,486 +1,663 @@
-"""
-YOLOv8 tabanlı Yemek Tespit Sistemi
-Roboflow'dan eğitilen model ile entegrasyon
-"""
-
-import cv2
-import numpy as np
-from datetime import datetime
-import os
-from ultralytics import YOLO
-
-class YOLOFoodDetector:
-    def __init__(self, model_path='models/food_detection.pt'):
-        """
-        YOLOv11/YOLOv8 tabanlı yemek detector'ı başlat
-        """
-        # Yemek kategorileri ve fiyatları - Custom Model (plate + pogaca)
-        self.food_categories = {
-            0: {  # YOLO class index 0 - plate (tabak)
-                'name': 'Tabak',
-                'price': 0.0,  # Tabak için ücret yok
-                'color': (200, 200, 200),  # Gri
-                'category': 'plate'
-            },
-            1: {  # YOLO class index 1 - pogaca
-                'name': 'Pogaca',
-                'price': 15.0,
-                'color': (0, 127, 255),  # Açık turuncu
-                'category': 'pogaca'
-            }
-        }
-        
-        # Model yolu
-        self.model_path = model_path
-        self.model = None
-        
-        # Tespit edilen yemekler (masa bazlı)
-        self.detected_foods = {}
-        
-        # Geçici tespit buffer'ı (stability için)
-        self.temp_detections = {}
-        
-        # Tespit parametreleri
-        self.confidence_threshold = 0.5  # YOLOv8 confidence threshold
-        self.duplicate_distance_threshold = 120  # Daha büyük mesafe (daha iyi takip)
-        self.stability_frames = 3  # Daha fazla frame bekle (daha güvenilir)
-        
-        # Model yükle
-        self.load_model()
-        
-        print("🤖 YOLOv8 Yemek Tespit Sistemi baslatildi")
-      
-    
-    def load_model(self):
-        """
-        YOLOv8 modelini yükle
-        """
-        if os.path.exists(self.model_path):
-            try:
-                self.model = YOLO(self.model_path)
-                print(f"✅ Model yüklendi: {self.model_path}")
-                
-            except Exception as e:
-                print(f"❌ Model yüklenemedi: {e}")
-                print("🔄 Pre-trained YOLOv11n modeli kullanılacak (genel amaçlı)")
-                self.model = YOLO('yolo11n.pt')  # YOLOv11 nano model
-        else:
-            print(f"⚠️ Model dosyası bulunamadı: {self.model_path}")
-            print("📁 Beklenen konum: models/food_detection.pt")
-            print("🔄 Pre-trained YOLOv11n modeli kullanılacak (genel amaçlı)")
-            
-            # Pre-trained model ile devam et
-            self.model = YOLO('yolo11n.pt')  # YOLOv11 nano model
-            
-            # Genel model için food kategorilerini güncelle
-            self._setup_pretrained_categories()
-    
-    def _setup_pretrained_categories(self):
-        """
-        Pre-trained model için genel kategorileri ayarla
-        """
-        # COCO dataset'inden yemek ile ilgili kategoriler
-        coco_food_mapping = {
-            47: {'name': 'Kupa/Kase', 'price': 0.0, 'color': (255, 255, 0), 'category': 'cup'},
-            48: {'name': 'Çatal', 'price': 0.0, 'color': (0, 255, 255), 'category': 'fork'},
-            49: {'name': 'Bıçak', 'price': 0.0, 'color': (255, 0, 255), 'category': 'knife'},
-            50: {'name': 'Kaşık', 'price': 0.0, 'color': (0, 255, 0), 'category': 'spoon'},
-            51: {'name': 'Kase', 'price': 0.0, 'color': (255, 0, 0), 'category': 'bowl'},
-            52: {'name': 'Muz', 'price': 5.0, 'color': (0, 255, 255), 'category': 'banana'},
-            53: {'name': 'Elma', 'price': 3.0, 'color': (0, 0, 255), 'category': 'apple'},
-            54: {'name': 'Sandviç', 'price': 25.0, 'color': (255, 255, 0), 'category': 'sandwich'},
-            55: {'name': 'Portakal', 'price': 4.0, 'color': (0, 165, 255), 'category': 'orange'},
-            56: {'name': 'Brokoli', 'price': 8.0, 'color': (0, 255, 0), 'category': 'broccoli'},
-            57: {'name': 'Havuç', 'price': 6.0, 'color': (0, 127, 255), 'category': 'carrot'},
-            58: {'name': 'Pizza', 'price': 45.0, 'color': (255, 0, 0), 'category': 'pizza'},
-            59: {'name': 'Donut', 'price': 15.0, 'color': (255, 0, 255), 'category': 'donut'},
-            60: {'name': 'Kek', 'price': 35.0, 'color': (255, 255, 0), 'category': 'cake'}
-        }
-        
-        print("🔄 Pre-trained model food kategorileri:")
-        for class_id, info in coco_food_mapping.items():
-            print(f"   • {info['name']}: {info['price']} TL")
-        
-        self.food_categories = coco_food_mapping
-    
-    def detect_food_on_frame(self, frame, table_areas=None):
-        """
-        YOLOv8 ile frame'de yemek tespiti yap
-        """
-        detected_items = []
-        
-        if self.model is None:
-            return detected_items
-        
-        try:
-            # YOLOv8 ile tespit yap
-            results = self.model(frame, conf=self.confidence_threshold, verbose=False)
-            
-            # Sonuçları işle
-            for result in results:
-                boxes = result.boxes
-                
-                if boxes is not None:
-                    for box in boxes:
-                        # Box bilgilerini al
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                        confidence = box.conf[0].cpu().numpy()
-                        class_id = int(box.cls[0].cpu().numpy())
-                        
-                        # Yemek kategorisi kontrolü
-                        if class_id in self.food_categories:
-                            category_info = self.food_categories[class_id]
-                            
-                            # Bounding box formatını ayarla
-                            x, y, w, h = int(x1), int(y1), int(x2-x1), int(y2-y1)
-                            
-                            detected_items.append({
-                                'category': category_info['category'],
-                                'class_id': class_id,
-                                'bbox': (x, y, w, h),
-                                'center': (x + w//2, y + h//2),
-                                'area': w * h,
-                                'confidence': float(confidence),
-                                'name': category_info['name'],
-                                'price': category_info['price'],
-                                'color': category_info['color'],
-                                'timestamp': datetime.now()
-                            })
-            
-        except Exception as e:
-            print(f"❌ YOLO tespit hatası: {e}")
-        
-        return detected_items
-    
-    def update_table_food_status(self, table_id, detected_foods):
-        """
-        Masa bazlı yemek durumunu güncelle - YOLOv8 için optimize edilmiş
-        """
-        if table_id not in self.detected_foods:
-            self.detected_foods[table_id] = {
-                'items': [],
-                'total_price': 0.0,
-                'last_update': datetime.now()
-            }
-        
-        if table_id not in self.temp_detections:
-            self.temp_detections[table_id] = []
-        
-        current_items = self.detected_foods[table_id]['items']
-        temp_items = self.temp_detections[table_id]
-        
-        # Mevcut temp detections'ları güncelle
-        for food in detected_foods:
-            if food['price'] == 0.0:  # Tabak/çatal gibi fiyatsız itemları atla
-                continue
-                
-            food_center = food['center']
-            food_category = food['category']
-            food_confidence = food['confidence']
-            
-            # 1. Mevcut confirmed itemlarda çok yakın benzer yemek var mı?
-            is_already_confirmed = False
-            for existing_item in current_items:
-                existing_center = existing_item['center']
-                distance = np.sqrt((food_center[0] - existing_center[0])**2 + 
-                                 (food_center[1] - existing_center[1])**2)
-                
-                # Hem aynı kategori hem de yakın mesafe
-                if distance < self.duplicate_distance_threshold and food_category == existing_item['category']:
-                    is_already_confirmed = True
-                    # Mevcut item'ın pozisyonunu güncelle (hareket takibi)
-                    existing_item['center'] = food_center
-                    existing_item['last_seen'] = datetime.now()
-                    break
-            
-            if not is_already_confirmed:
-                # 2. Temp detections'da benzer yemek var mı?
-                found_in_temp = False
-                for temp_item in temp_items:
-                    temp_center = temp_item['center']
-                    distance = np.sqrt((food_center[0] - temp_center[0])**2 + 
-                                     (food_center[1] - temp_center[1])**2)
-                    
-                    # Hem aynı kategori hem de yakın mesafe
-                    if distance < self.duplicate_distance_threshold and food_category == temp_item['category']:
-                        # Mevcut temp item'ı güncelle
-                        temp_item['count'] += 1
-                        temp_item['last_seen'] = datetime.now()
-                        temp_item['center'] = food_center  # Pozisyon güncelle
-                        temp_item['confidence'] = max(temp_item['confidence'], food_confidence)
-                        found_in_temp = True
-                        break
-                
-                if not found_in_temp:
-                    # 3. Yeni temp detection ekle
-                    food['count'] = 1
-                    food['last_seen'] = datetime.now()
-                    temp_items.append(food)
-        
-        # Stability kontrolü
-        items_to_confirm = []
-        remaining_temp_items = []
-        
-        for temp_item in temp_items:
-            if temp_item['count'] >= self.stability_frames:
-                items_to_confirm.append(temp_item)
-            else:
-                remaining_temp_items.append(temp_item)
-        
-        # Confirmed items'ları ana listeye ekle
-        for item in items_to_confirm:
-            current_items.append(item)
-            print(f"🍽️ {table_id}: {item['name']} onaylandi! (+{item['price']:.0f} TL) [Confidence: {item['confidence']:.2f}]")
-        
-        # Temp detections listesini güncelle
-        self.temp_detections[table_id] = remaining_temp_items
-        
-        # Eski temp detections'ları temizle
-        current_time = datetime.now()
-        self.temp_detections[table_id] = [
-            item for item in self.temp_detections[table_id]
-            if (current_time - item['last_seen']).total_seconds() < 5
-        ]
-        
-        # Çok eski confirmed items'ları da temizle (10 saniyeden eski ve artık görünmeyen)
-        # Bu sadece eğer masa üzerinde hiç yemek tespit edilmiyorsa yapılır
-        if len(detected_foods) == 0:  # Hiç yemek tespit edilmiyor
-            current_items[:] = [
-                item for item in current_items
-                if hasattr(item, 'last_seen') and (current_time - item['last_seen']).total_seconds() < 10
-            ]
-        
-        # Toplam fiyatı hesapla
-        total_price = sum(item['price'] for item in current_items)
-        self.detected_foods[table_id]['total_price'] = total_price
-        self.detected_foods[table_id]['last_update'] = datetime.now()
-        
-        return len(current_items), total_price
-    
-    def detect_plates_and_bowls(self, frame):
-        """
-        Tabak ve kase tespiti - YOLO model üzerinden
-        Model zaten plate sınıfını tespit ediyor
-        """
-        plates = []
-        
-        try:
-            # YOLO prediction
-            results = self.model(frame, conf=0.3, verbose=False)  # Düşük confidence tabaklar için
-            
-            for result in results:
-                if result.boxes is not None:
-                    for box in result.boxes:
-                        class_id = int(box.cls.item())
-                        confidence = box.conf.item()
-                        
-                        # Sadece plate (class 0) sınıfını al
-                        if class_id == 0 and confidence > 0.3:  # plate
-                            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                            center_x = int((x1 + x2) / 2)
-                            center_y = int((y1 + y2) / 2)
-                            radius = int(max(x2 - x1, y2 - y1) / 2)
-                            
-                            plates.append({
-                                'center': (center_x, center_y),
-                                'radius': radius,
-                                'bbox': (int(x1), int(y1), int(x2 - x1), int(y2 - y1)),
-                                'area': (x2 - x1) * (y2 - y1),
-                                'type': 'plate',
-                                'confidence': confidence,
-                                'timestamp': datetime.now()
-                            })
-                            
-        except Exception as e:
-            print(f"❌ Plate detection hatası: {e}")
-        
-        return plates
-
-    def draw_food_detections(self, frame, detected_foods, plates=None):
-        """
-        Tespit edilen yemekleri frame üzerine çiz
-        """
-        # Tabak/kaseleri çiz
-        if plates:
-            for plate in plates:
-                center = plate['center']
-                radius = plate['radius']
-                confidence = plate.get('confidence', 0.0)
-                
-                # Tabak çemberi
-                color = (200, 200, 200)  # Gri
-                cv2.circle(frame, center, radius, color, 2)
-                
-                # Merkez nokta
-                cv2.circle(frame, center, 3, color, -1)
-                
-                # Label
-                label = f"PLATE ({confidence:.2f})"
-                cv2.putText(frame, label, (center[0] - 30, center[1] - radius - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
-        
-        # Yemekleri çiz
-        for food in detected_foods:
-            x, y, w, h = food['bbox']
-            name = food['name']
-            price = food['price']
-            confidence = food['confidence']
-            color = food['color']
-            
-            # Bounding box çiz
-            cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
-            
-            # Label için arka plan
-            if price > 0:  # Sadece ücretli itemlar için fiyat göster
-                label = f"{name}: {price} TL ({confidence:.2f})"
-            else:
-                label = f"{name} ({confidence:.2f})"
-                
-            label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
-            cv2.rectangle(frame, (x, y - label_size[1] - 10), 
-                         (x + label_size[0] + 10, y), color, -1)
-            
-            # Label yazısı
-            cv2.putText(frame, label, (x + 5, y - 5),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-            
-            # Merkez çizgisi
-            center = food['center']
-            cv2.circle(frame, center, 5, color, -1)
-        
-        return frame
-    
-    def draw_table_bill(self, frame, table_id, position=(10, 200)):
-        """
-        Masa hesabını frame üzerine çiz
-        """
-        if table_id not in self.detected_foods:
-            return frame
-        
-        table_data = self.detected_foods[table_id]
-        items = table_data['items']
-        total_price = table_data['total_price']
-        
-        x, y = position
-        
-        # Başlık
-        cv2.putText(frame, f"{table_id} HESABI:", (x, y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        y += 30
-        
-        # Yemek listesi
-        item_counts = {}
-        for item in items:
-            name = item['name']
-            price = item['price']
-            
-            if price > 0:  # Sadece ücretli itemları say
-                if name in item_counts:
-                    item_counts[name]['count'] += 1
-                    item_counts[name]['total'] += price
-                else:
-                    item_counts[name] = {'count': 1, 'total': price, 'unit_price': price}
-        
-        # Her yemek türünü listele
-        for name, data in item_counts.items():
-            count = data['count']
-            total = data['total']
-            
-            item_text = f"{count}x {name}: {total:.0f} TL"
-            cv2.putText(frame, item_text, (x, y),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
-            y += 20
-        
-        # Toplam
-        y += 10
-        cv2.putText(frame, f"TOPLAM: {total_price:.0f} TL", (x, y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-        
-        return frame
-    
-    def clear_table_bill(self, table_id):
-        """
-        Masa hesabını sıfırla (QR kod tekrar okunduğunda)
-        """
-        old_total = 0.0
-        
-        if table_id in self.detected_foods:
-            old_total = self.detected_foods[table_id]['total_price']
-            self.detected_foods[table_id] = {
-                'items': [],
-                'total_price': 0.0,
-                'last_update': datetime.now()
-            }
-        
-        # Temp detections'ı da temizle
-        if table_id in self.temp_detections:
-            self.temp_detections[table_id] = []
-        
-        if old_total > 0:
-            print(f"🧾 {table_id}: Hesap sifirlandi (Onceki total: {old_total:.0f} TL)")
-        
-        return old_total
-    
-    def get_table_summary(self, table_id):
-        """
-        Masa özet bilgilerini al
-        """
-        if table_id not in self.detected_foods:
-            return None
-        
-        table_data = self.detected_foods[table_id]
-        
-        # Yemek sayıları (sadece ücretli itemlar)
-        item_counts = {}
-        for item in table_data['items']:
-            if item['price'] > 0:  # Sadece ücretli itemları say
-                name = item['name']
-                if name in item_counts:
-                    item_counts[name] += 1
-                else:
-                    item_counts[name] = 1
-        
-        return {
-            'table_id': table_id,
-            'items': item_counts,
-            'total_items': len([item for item in table_data['items'] if item['price'] > 0]),
-            'total_price': table_data['total_price'],
-            'last_update': table_data['last_update']
-        }
-
-    def get_all_tables_summary(self):
-        """
-        Tüm masaların özet bilgilerini al
-        """
-        summaries = []
-        for table_id in self.detected_foods:
-            summary = self.get_table_summary(table_id)
-            if summary:
-                summaries.append(summary)
-        return summaries
-
-# Test fonksiyonu
-def test_yolo_detector():
-    """
-    YOLOv8 detector'ı test et
-    """
-    detector = YOLOFoodDetector()
-    
-    print("\n🧪 YOLOv8 Food Detector Test")
-    print(f"📊 Model: {detector.model_path}")
-    print(f"🎯 Confidence threshold: {detector.confidence_threshold}")
-    
-    # Test görüntüsü ile test
-    if os.path.exists('test_frame.jpg'):
-        print("\n📸 Test görüntüsü ile test ediliyor...")
-        frame = cv2.imread('test_frame.jpg')
-        foods = detector.detect_food_on_frame(frame)
-        print(f"🍽️ Tespit edilen yemek sayısı: {len(foods)}")
-        
-        for food in foods:
-            print(f"   • {food['name']}: {food['confidence']:.2f}")
-    
-    return detector
-
-if __name__ == "__main__":
-    test_yolo_detector()
+"""
+YOLOv8 tabanlı Yemek Tespit Sistemi
+Roboflow'dan eğitilen model ile entegrasyon
+"""
+
+import cv2
+import numpy as np
+import os
+import threading
+import time
+from inference_backends import PyTorchBackend, create_backend
+from food_tracker import FoodTracker
+from adaptive_inference import AdaptiveInferenceController
+from detection_cache import RegionDetectionCache
+from bill_ledger import TableLedger
+from detections import FoodDetection, PlateDetection
+
+class YOLOFoodDetector:
+    def __init__(self, model_path='models/food_detection.pt', backend='pytorch', imgsz=640,
+                 int8=False, calibration_source=None, load_in_background=False, with_model=True,
+                 adaptive=False, inference_budget_ms=120.0, detection_cache=False, cache_tolerance=6):
+        """
+        YOLOv11/YOLOv8 tabanlı yemek detector'ı başlat
+        backend: 'pytorch' (ultralytics), 'onnx' veya 'openvino' (CPU, export cache'lenir)
+        int8: ONNX/OpenVINO için INT8 quantization (calibration_source: klasör veya video)
+        load_in_background: model arka plan thread'inde yüklenip ısıtılır, hazır olana kadar
+                            tespit fonksiyonları boş sonuç döner
+        with_model: False ise model yüklenmez - çıkarım başka yerde yapılır (worker/segment süreçleri) veya hiç yapılmaz,
+                    bu nesne sadece takip ve hesap için kullanılır
+        adaptive: giriş boyutu ve confidence eşiği ölçülen gecikmeye göre seviyeler arasında
+                  değiştirilir (inference_budget_ms: frame başına süre bütçesi)
+        detection_cache: görüntüsü değişmeyen bölgelerde (aHash farkı <= cache_tolerance bit)
+                         önceki tespitler tekrar kullanılır
+        """
+        # Yemek kategorileri ve fiyatları - Custom Model (plate + pogaca)
+        self.food_categories = {
+            0: {  # YOLO class index 0 - plate (tabak)
+                'name': 'Tabak',
+                'price': 0.0,  # Tabak için ücret yok
+                'color': (200, 200, 200),  # Gri
+                'category': 'plate'
+            },
+            1: {  # YOLO class index 1 - pogaca
+                'name': 'Pogaca',
+                'price': 15.0,
+                'color': (0, 127, 255),  # Açık turuncu
+                'category': 'pogaca'
+            }
+        }
+        
+        # Model yolu ve çıkarım backend'i
+        self.model_path = model_path
+        self.model = None
+        self.backend_name = backend
+        self.imgsz = imgsz
+        self.int8 = int8
+        self.calibration_source = calibration_source
+        
+        # Tespit edilen yemekler (masa bazlı hesap defterleri: table_id -> TableLedger)
+        self.detected_foods = {}
+        
+        # Okuyucular (durum API'si) için yayınlanan hesap özetleri: frame döngüsü hesap değişince
+        # yeni sözlükle değiştirir, okuyucular kilitsiz okur (yarım güncellenmiş hesap görmez)
+        self._bill_snapshots = {}
+        
+        # Masa bazlı yemek takipçileri (geçici + onaylı track'ler)
+        self.food_trackers = {}
+        
+        # Tespit parametreleri
+        self.confidence_threshold = 0.5  # YOLOv8 confidence threshold
+        self.duplicate_distance_threshold = 120  # Daha büyük mesafe (daha iyi takip)
+        self.stability_frames = 3  # Daha fazla frame bekle (daha güvenilir)
+        self.tracking_metric = 'center'  # 'center' (merkez mesafesi) veya 'iou'
+        self.tracking_solver = 'greedy'  # 'greedy' veya 'hungarian' (scipy gerekli)
+        self.roi_imgsz = 320  # Masa bölgesi (ROI) kırpıntıları için daha küçük giriş boyutu
+        
+        # Yüke göre çözünürlük/confidence seçimi (kapalıysa sabit eşikler kullanılır)
+        self.adaptive = AdaptiveInferenceController(budget_ms=inference_budget_ms) if adaptive else None
+        self.inference_stats = {'calls': 0, 'frames': 0, 'total_ms': 0.0}
+        
+        # Değişmeyen masa bölgeleri için tespit önbelleği
+        self.detection_cache = RegionDetectionCache(tolerance=cache_tolerance) if detection_cache else None
+        
+        # Model yükleme durumu (başarısız olsa da yükleme bitince set edilir, hata model_error'da)
+        self.model_ready = threading.Event()
+        self.model_error = None
+        self.startup_timings = {}
+        
+        # Model yükle
+        if not with_model:
+            # Beklenecek yükleme yok (offline analiz model_ready'yi bekler)
+            self.model_ready.set()
+            print("🤖 YOLOv8 Yemek Tespit Sistemi baslatildi (model yüklenmedi: sadece yemek takibi ve hesap)")
+        elif load_in_background:
+            self.start_background_load()
+            print("🤖 YOLOv8 Yemek Tespit Sistemi baslatildi (model arka planda yükleniyor)")
+        else:
+            self.load_model()
+            print("🤖 YOLOv8 Yemek Tespit Sistemi baslatildi")
+      
+    
+    def load_model(self):
+        """
+        YOLOv8 modelini yükle ve ısıt
+        self.model ancak ısınma bittikten sonra atanır (yarım yüklenmiş model kullanılmaz)
+        """
+        load_start = time.perf_counter()
+        
+        if os.path.exists(self.model_path):
+            try:
+                model = self._create_backend(self.model_path)
+                print(f"✅ Model yüklendi: {self.model_path} (backend: {model.name})")
+                
+            except Exception as e:
+                print(f"❌ Model yüklenemedi: {e}")
+                print("🔄 Pre-trained YOLOv11n modeli kullanılacak (genel amaçlı)")
+                model = PyTorchBackend('yolo11n.pt')  # YOLOv11 nano model
+        else:
+            print(f"⚠️ Model dosyası bulunamadı: {self.model_path}")
+            print("📁 Beklenen konum: models/food_detection.pt")
+            print("🔄 Pre-trained YOLOv11n modeli kullanılacak (genel amaçlı)")
+            
+            # Pre-trained model ile devam et
+            model = self._create_backend('yolo11n.pt')  # YOLOv11 nano model
+            
+            # Genel model için food kategorilerini güncelle
+            self._setup_pretrained_categories()
+        
+        self.startup_timings['model_load'] = time.perf_counter() - load_start
+        
+        # İlk çağrıdaki hazırlık maliyetini (graph/bellek ayırma) frame döngüsünden önce öde
+        warmup_start = time.perf_counter()
+        self._warm_up(model)
+        self.startup_timings['warmup'] = time.perf_counter() - warmup_start
+        
+        self.model = model
+        self.model_ready.set()
+        print(f"⏱️ Model hazır: yükleme {self.startup_timings['model_load']:.2f}s, "
+              f"ısınma {self.startup_timings['warmup']:.2f}s")
+    
+    def start_background_load(self):
+        """
+        Modeli arka plan thread'inde yükle (ör. worker süreci düşünce yerel tespite geçerken)
+        """
+        self.model_ready.clear()
+        self.model_error = None
+        threading.Thread(target=self._load_model_in_background, name='yolo-loader', daemon=True).start()
+    
+    def _load_model_in_background(self):
+        """
+        Arka plan thread'i - hata olursa yemek tespiti kapalı kalır, sistem çalışmaya devam eder
+        """
+        try:
+            self.load_model()
+        except Exception as e:
+            self.model_error = str(e) or type(e).__name__
+            print(f"❌ Model arka planda yüklenemedi, yemek tespiti kapalı: {e}")
+        finally:
+            self.model_ready.set()
+    
+    def _warm_up(self, model, runs=2):
+        """
+        Boş bir frame ile birkaç tespit yaparak modeli ısıt
+        """
+        dummy_frame = np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8)
+        
+        # Adaptive modda her seviyenin giriş boyutu ayrı ısıtılır
+        sizes = [level['imgsz'] for level in self.adaptive.levels] if self.adaptive else [None]
+        for imgsz in sizes:
+            for _ in range(runs):
+                model.predict([dummy_frame], conf=self.confidence_threshold, imgsz=imgsz)
+    
+    def _create_backend(self, model_path):
+        """
+        Seçilen backend'i oluştur - export/quantization başarısız olursa PyTorch'a dön
+        """
+        if self.backend_name == 'pytorch':
+            return PyTorchBackend(model_path)
+        
+        try:
+            return create_backend(self.backend_name, model_path, imgsz=self.imgsz, int8=self.int8,
+                                  calibration_source=self.calibration_source)
+        except Exception as e:
+            print(f"⚠️ {self.backend_name} backend'i yüklenemedi: {e}")
+            print("🔄 PyTorch backend'i kullanılacak")
+            return PyTorchBackend(model_path)
+    
+    def _setup_pretrained_categories(self):
+        """
+        Pre-trained model için genel kategorileri ayarla
+        """
+        # COCO dataset'inden yemek ile ilgili kategoriler
+        coco_food_mapping = {
+            47: {'name': 'Kupa/Kase', 'price': 0.0, 'color': (255, 255, 0), 'category': 'cup'},
+            48: {'name': 'Çatal', 'price': 0.0, 'color': (0, 255, 255), 'category': 'fork'},
+            49: {'name': 'Bıçak', 'price': 0.0, 'color': (255, 0, 255), 'category': 'knife'},
+            50: {'name': 'Kaşık', 'price': 0.0, 'color': (0, 255, 0), 'category': 'spoon'},
+            51: {'name': 'Kase', 'price': 0.0, 'color': (255, 0, 0), 'category': 'bowl'},
+            52: {'name': 'Muz', 'price': 5.0, 'color': (0, 255, 255), 'category': 'banana'},
+            53: {'name': 'Elma', 'price': 3.0, 'color': (0, 0, 255), 'category': 'apple'},
+            54: {'name': 'Sandviç', 'price': 25.0, 'color': (255, 255, 0), 'category': 'sandwich'},
+            55: {'name': 'Portakal', 'price': 4.0, 'color': (0, 165, 255), 'category': 'orange'},
+            56: {'name': 'Brokoli', 'price': 8.0, 'color': (0, 255, 0), 'category': 'broccoli'},
+            57: {'name': 'Havuç', 'price': 6.0, 'color': (0, 127, 255), 'category': 'carrot'},
+            58: {'name': 'Pizza', 'price': 45.0, 'color': (255, 0, 0), 'category': 'pizza'},
+            59: {'name': 'Donut', 'price': 15.0, 'color': (255, 0, 255), 'category': 'donut'},
+            60: {'name': 'Kek', 'price': 35.0, 'color': (255, 255, 0), 'category': 'cake'}
+        }
+        
+        print("🔄 Pre-trained model food kategorileri:")
+        for class_id, info in coco_food_mapping.items():
+            print(f"   • {info['name']}: {info['price']} TL")
+        
+        self.food_categories = coco_food_mapping
+    
+    def detect_food_on_frame(self, frame, table_areas=None):
+        """
+        YOLOv8 ile frame'de yemek tespiti yap
+        table_areas verilirse sadece masa bölgelerinde tespit yapılır ve
+        her tespitin table_id alanı doldurulur
+        """
+        detected_items = []
+        
+        if table_areas:
+            for table_id, items in self.detect_food_in_table_areas([frame], table_areas)[0].items():
+                detected_items.extend(items)
+            return detected_items
+        
+        if self.model is None:
+            return detected_items
+        
+        try:
+            # YOLOv8 ile tespit yap
+            imgsz, conf = self._inference_settings()
+            detections = self._cached_predict([frame], ['frame'], conf, imgsz)[0]
+            
+            # Sonuçları işle
+            detected_items = self._parse_food_detections(detections)
+            
+        except Exception as e:
+            print(f"❌ YOLO tespit hatası: {e}")
+        
+        return detected_items
+    
+    def detect_food_on_frames(self, frames):
+        """
+        Birden fazla frame'de tek bir batch çıkarımı ile yemek tespiti yap
+        Offline analiz için - her frame için ayrı tespit listesi döner (frame sırasıyla)
+        """
+        if self.model is None or not frames:
+            return [[] for _ in frames]
+        
+        try:
+            # Tüm frame'ler tek çağrıda modele verilir
+            imgsz, conf = self._inference_settings()
+            batch_detections = self._cached_predict(list(frames), ['frame'] * len(frames), conf, imgsz)
+            return [self._parse_food_detections(detections) for detections in batch_detections]
+            
+        except Exception as e:
+            print(f"❌ YOLO batch tespit hatası: {e}")
+            return [[] for _ in frames]
+    
+    def detect_food_in_table_areas(self, frames, table_areas):
+        """
+        Her frame'den masa bölgelerini kırp ve tüm kırpıntıları tek batch'te tespit et
+        table_areas: {table_id: (x, y, w, h)} - frame koordinatlarında
+        Dönüş: frame başına {table_id: [tespitler]} (koordinatlar frame'e geri taşınmış)
+        """
+        per_frame = [{table_id: [] for table_id in table_areas} for _ in frames]
+        
+        if self.model is None or not frames:
+            return per_frame
+        
+        crops = []
+        crop_owners = []  # (frame indeksi, table_id, x ofseti, y ofseti)
+        
+        for frame_index, frame in enumerate(frames):
+            frame_h, frame_w = frame.shape[:2]
+            for table_id, (x, y, w, h) in table_areas.items():
+                # Bölgeyi frame sınırlarına kırp
+                x1, y1 = max(0, int(x)), max(0, int(y))
+                x2, y2 = min(frame_w, int(x + w)), min(frame_h, int(y + h))
+                if x2 <= x1 or y2 <= y1:
+                    continue
+                
+                crops.append(frame[y1:y2, x1:x2])
+                crop_owners.append((frame_index, table_id, x1, y1))
+        
+        if not crops:
+            return per_frame
+        
+        try:
+            # ROI kırpıntıları sabit küçük boyutta çalışır, adaptive seviyeden etkilenmez
+            batch_detections = self._cached_predict(crops, [owner[1] for owner in crop_owners],
+                                                    self.confidence_threshold, self.roi_imgsz, adaptive=False)
+            
+            for (frame_index, table_id, offset_x, offset_y), detections in zip(crop_owners, batch_detections):
+                # Kırpıntı koordinatlarını frame koordinatlarına taşı
+                detections = detections.copy()
+                detections[:, [0, 2]] += offset_x
+                detections[:, [1, 3]] += offset_y
+                
+                per_frame[frame_index][table_id].extend(self._parse_food_detections(detections, table_id))
+                    
+        except Exception as e:
+            print(f"❌ YOLO masa bölgesi tespit hatası: {e}")
+        
+        return per_frame
+    
+    def detect_food_by_table(self, frames, table_areas=None, default_table='MASA_1'):
+        """
+        Frame'lerde yemek tespiti yap ve masa bazlı grupla
+        Masa bölgeleri varsa her bölge kırpılıp batch halinde tespit edilir,
+        yoksa tüm frame default_table'a yazılır
+        Dönüş: frame başına {table_id: [tespitler]}
+        """
+        if table_areas:
+            return self.detect_food_in_table_areas(frames, table_areas)
+        
+        return [{default_table: foods} for foods in self.detect_food_on_frames(frames)]
+    
+    def _inference_settings(self, plates=False):
+        """
+        Çıkarım giriş boyutu ve confidence eşiği - adaptive modda o anki seviyeden
+        (imgsz None ise backend'in varsayılan boyutu kullanılır)
+        """
+        if self.adaptive is None:
+            return None, (0.3 if plates else self.confidence_threshold)
+        
+        level = self.adaptive.current()
+        return level['imgsz'], level['plate_conf' if plates else 'conf']
+    
+    def _timed_predict(self, frames, conf, imgsz=None, adaptive=True):
+        """
+        Backend çağrısı + gecikme ölçümü (adaptive kontrolcüye frame başına süre bildirilir)
+        """
+        start = time.perf_counter()
+        detections = self.model.predict(frames, conf=conf, imgsz=imgsz)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        self.inference_stats['calls'] += 1
+        self.inference_stats['frames'] += len(frames)
+        self.inference_stats['total_ms'] += elapsed_ms
+        
+        if adaptive and self.adaptive is not None:
+            self.adaptive.record(elapsed_ms / len(frames))
+        
+        return detections
+    
+    def _cached_predict(self, images, regions, conf, imgsz=None, adaptive=True):
+        """
+        Önbellek destekli çıkarım: her görüntünün bölgesi (table_id veya 'frame') ve hash'i
+        önbellekte varsa ham tespitler tekrar kullanılır, sadece ıskalar modele gider
+        """
+        if self.detection_cache is None:
+            return self._timed_predict(images, conf, imgsz, adaptive)
+        
+        # Farklı giriş boyutu/eşikte alınmış tespitler karışmasın
+        keys = [(region, imgsz, conf) for region in regions]
+        signatures = [self.detection_cache.signature(image) for image in images]
+        results = [self.detection_cache.lookup(key, signature) for key, signature in zip(keys, signatures)]
+        
+        misses = [i for i, detections in enumerate(results) if detections is None]
+        if misses:
+            fresh = self._timed_predict([images[i] for i in misses], conf, imgsz, adaptive)
+            for i, detections in zip(misses, fresh):
+                results[i] = detections
+                self.detection_cache.store(keys[i], signatures[i], detections)
+        
+        return results
+    
+    def get_inference_stats(self):
+        """
+        Çıkarım istatistikleri: çağrı/frame sayısı, ortalama gecikme ve adaptive seviye bilgisi
+        """
+        stats = dict(self.inference_stats)
+        stats['avg_ms_per_frame'] = round(stats['total_ms'] / stats['frames'], 1) if stats['frames'] else None
+        stats['total_ms'] = round(stats['total_ms'], 1)
+        if self.adaptive is not None:
+            stats['adaptive'] = self.adaptive.get_stats()
+        if self.detection_cache is not None:
+            stats['cache'] = self.detection_cache.get_stats()
+        return stats
+    
+    def _parse_food_detections(self, detections, table_id=None):
+        """
+        Backend çıktısını ((N, 6): x1, y1, x2, y2, confidence, class_id) FoodDetection listesine çevir
+        table_id: masa bölgesi tespitinde kayıtlara yazılır
+        """
+        detected_items = []
+        timestamp = time.monotonic_ns()
+        
+        for x1, y1, x2, y2, confidence, class_id in detections:
+            class_id = int(class_id)
+            
+            # Yemek kategorisi kontrolü
+            if class_id in self.food_categories:
+                category_info = self.food_categories[class_id]
+                
+                # Bounding box formatını ayarla
+                x, y, w, h = int(x1), int(y1), int(x2-x1), int(y2-y1)
+                
+                detected_items.append(FoodDetection(
+                    class_id,
+                    category_info['category'],
+                    category_info['name'],
+                    category_info['price'],
+                    category_info['color'],
+                    (x, y, w, h),
+                    (x + w//2, y + h//2),
+                    w * h,
+                    float(confidence),
+                    timestamp,
+                    table_id
+                ))
+        
+        return detected_items
+    
+    def update_table_food_status(self, table_id, detected_foods, now=None):
+        """
+        Masa bazlı yemek durumunu güncelle - FoodTracker ile eşleştirme ve onay
+        now: güncelleme zamanı, saniye (verilmezse şimdi) - offline analizde video zamanı
+        """
+        if table_id not in self.detected_foods:
+            self.detected_foods[table_id] = TableLedger(table_id, self.food_categories)
+        
+        if table_id not in self.food_trackers:
+            self.food_trackers[table_id] = FoodTracker(
+                distance_threshold=self.duplicate_distance_threshold,
+                stability_frames=self.stability_frames,
+                metric=self.tracking_metric,
+                solver=self.tracking_solver
+            )
+        
+        ledger = self.detected_foods[table_id]
+        
+        # Tabak/çatal gibi fiyatsız itemlar takip edilmez
+        priced_foods = [food for food in detected_foods if food.price != 0.0]
+        
+        # Stabil hale gelen (onaylanan) track'leri hesaba ekle
+        confirmed = self.food_trackers[table_id].update(priced_foods, now)
+        for item in confirmed:
+            ledger.add(item, now)
+            print(f"🍽️ {table_id}: {item.name} onaylandi! (+{item.price:.0f} TL) [Confidence: {item.confidence:.2f}]")
+        if confirmed or table_id not in self._bill_snapshots:
+            self._publish_bill(table_id)
+        
+        return ledger.item_count, ledger.total_price
+    
+    def detect_plates_and_bowls(self, frame):
+        """
+        Tabak ve kase tespiti - YOLO model üzerinden
+        Model zaten plate sınıfını tespit ediyor
+        """
+        plates = []
+        
+        if self.model is None:
+            return plates
+        
+        try:
+            # YOLO prediction
+            imgsz, plate_conf = self._inference_settings(plates=True)  # Düşük confidence tabaklar için
+            detections = self._timed_predict([frame], plate_conf, imgsz)[0]
+            timestamp = time.monotonic_ns()
+            
+            for x1, y1, x2, y2, confidence, class_id in detections:
+                # Sadece plate (class 0) sınıfını al
+                if int(class_id) == 0 and confidence > plate_conf:  # plate
+                    center_x = int((x1 + x2) / 2)
+                    center_y = int((y1 + y2) / 2)
+                    radius = int(max(x2 - x1, y2 - y1) / 2)
+                    
+                    plates.append(PlateDetection(
+                        (center_x, center_y),
+                        radius,
+                        (int(x1), int(y1), int(x2 - x1), int(y2 - y1)),
+                        float((x2 - x1) * (y2 - y1)),
+                        float(confidence),
+                        timestamp
+                    ))
+                    
+        except Exception as e:
+            print(f"❌ Plate detection hatası: {e}")
+        
+        return plates
+
+    def draw_food_detections(self, frame, detected_foods, plates=None):
+        """
+        Tespit edilen yemekleri frame üzerine çiz
+        """
+        # Tabak/kaseleri çiz
+        if plates:
+            for plate in plates:
+                center = plate.center
+                radius = plate.radius
+                confidence = plate.confidence
+                
+                # Tabak çemberi
+                color = (200, 200, 200)  # Gri
+                cv2.circle(frame, center, radius, color, 2)
+                
+                # Merkez nokta
+                cv2.circle(frame, center, 3, color, -1)
+                
+                # Label
+                label = f"PLATE ({confidence:.2f})"
+                cv2.putText(frame, label, (center[0] - 30, center[1] - radius - 10),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        
+        # Yemekleri çiz
+        for food in detected_foods:
+            x, y, w, h = food.bbox
+            name = food.name
+            price = food.price
+            confidence = food.confidence
+            color = food.color
+            
+            # Bounding box çiz
+            cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+            
+            # Label için arka plan
+            if price > 0:  # Sadece ücretli itemlar için fiyat göster
+                label = f"{name}: {price} TL ({confidence:.2f})"
+            else:
+                label = f"{name} ({confidence:.2f})"
+                
+            label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+            cv2.rectangle(frame, (x, y - label_size[1] - 10), 
+                         (x + label_size[0] + 10, y), color, -1)
+            
+            # Label yazısı
+            cv2.putText(frame, label, (x + 5, y - 5),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            
+            # Merkez çizgisi
+            center = food.center
+            cv2.circle(frame, center, 5, color, -1)
+        
+        return frame
+    
+    def draw_table_areas(self, frame, table_areas):
+        """
+        Masa bölgelerini (ROI) ve anlık toplamlarını frame üzerine çiz
+        """
+        for table_id, (x, y, w, h) in table_areas.items():
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 200, 0), 1)
+            
+            ledger = self.detected_foods.get(table_id)
+            total_price = ledger.total_price if ledger else 0.0
+            cv2.putText(frame, f"{table_id}: {total_price:.0f} TL", (x + 5, y + 20),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 200, 0), 1)
+        
+        return frame
+    
+    def draw_table_bill(self, frame, table_id, position=(10, 200)):
+        """
+        Masa hesabını frame üzerine çiz
+        """
+        if table_id not in self.detected_foods:
+            return frame
+        
+        ledger = self.detected_foods[table_id]
+        
+        x, y = position
+        
+        # Başlık
+        cv2.putText(frame, f"{table_id} HESABI:", (x, y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        y += 30
+        
+        # Her yemek türünü listele (ledger'da artımlı tutulan adet ve ara toplamlar)
+        for name, count, total in ledger.lines():
+            item_text = f"{count}x {name}: {total:.0f} TL"
+            cv2.putText(frame, item_text, (x, y),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+            y += 20
+        
+        # Toplam
+        y += 10
+        cv2.putText(frame, f"TOPLAM: {ledger.total_price:.0f} TL", (x, y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        
+        return frame
+    
+    def clear_table_bill(self, table_id):
+        """
+        Masa hesabını sıfırla (QR kod tekrar okunduğunda)
+        """
+        old_total = 0.0
+        
+        if table_id in self.detected_foods:
+            old_total = self.detected_foods[table_id].clear()
+            self._publish_bill(table_id)
+        
+        # Track'leri de temizle
+        if table_id in self.food_trackers:
+            self.food_trackers[table_id].reset()
+        
+        if old_total > 0:
+            print(f"🧾 {table_id}: Hesap sifirlandi (Onceki total: {old_total:.0f} TL)")
+        
+        return old_total
+    
+    def get_table_summary(self, table_id):
+        """
+        Masa özet bilgilerini al
+        """
+        if table_id not in self.detected_foods:
+            return None
+        
+        ledger = self.detected_foods[table_id]
+        
+        return {
+            'table_id': table_id,
+            'items': ledger.item_counts(),
+            'total_items': ledger.item_count,
+            'total_price': ledger.total_price,
+            'last_update': ledger.last_update
+        }
+
+    def _publish_bill(self, table_id):
+        """
+        Masanın hesap özetini yeniden yayınla (hesabı değiştiren frame döngüsünden çağrılır)
+        """
+        self._bill_snapshots[table_id] = self.get_table_summary(table_id)
+    
+    def publish_bills(self):
+        """
+        Tüm hesapları yeniden yayınla (ör. checkpoint'ten yüklenen hesap defterleri için)
+        """
+        self._bill_snapshots = {table_id: self.get_table_summary(table_id) for table_id in self.detected_foods}
+    
+    def get_all_tables_summary(self):
+        """
+        Tüm masaların özet bilgilerini al (yayınlanan anlık görüntülerden, kilitsiz - başka thread'den okunabilir)
+        """
+        return list(self._bill_snapshots.values())
+
+# Test fonksiyonu
+def test_yolo_detector():
+    """
+    YOLOv8 detector'ı test et
+    """
+    detector = YOLOFoodDetector()
+    
+    print("\n🧪 YOLOv8 Food Detector Test")
+    print(f"📊 Model: {detector.model_path}")
+    print(f"🎯 Confidence threshold: {detector.confidence_threshold}")
+    
+    # Test görüntüsü ile test
+    if os.path.exists('test_frame.jpg'):
+        print("\n📸 Test görüntüsü ile test ediliyor...")
+        frame = cv2.imread('test_frame.jpg')
+        foods = detector.detect_food_on_frame(frame)
+        print(f"🍽️ Tespit edilen yemek sayısı: {len(foods)}")
+        
+        for food in foods:
+            print(f"   • {food.name}: {food.confidence:.2f}")
+    
+    return detector
+
+if __name__ == "__main__":
+    test_yolo_detector()
@@ -0,0 +1,358 @@
+"""
+Bölgelere Bölünmüş Masa Durumu (Çok Katlı Mekânlar)
+Masalar bölgelere (ör. katlara) ayrılır; her bölgenin durumu kendi sürecindeki
+TableManager'da tutulur. ZoneRouter QR ve garson olaylarını masa ID'sine göre ilgili
+bölgeye toplu (batch) gönderir, ZoneCoordinator bölge özetlerini genel rapora birleştirir.
+"""
+
+import contextlib
+import json
+import multiprocessing as mp
+import os
+import queue
+import random
+import sys
+import time
+from table_manager import TableManager, TableStatus
+
+def _zone_main(zone_name, waiter_assignments, request_queue, result_queue, quiet):
+    """
+    Bölge süreci: olay batch'lerini sırayla kendi TableManager'ına uygular
+    Özet istekleri olaylarla aynı kuyruktan geldiği için önceki tüm olayları yansıtır
+    """
+    if quiet:
+        sys.stdout = open(os.devnull, 'w')
+
+    manager = TableManager(waiter_assignments=waiter_assignments)
+    processed = 0
+
+    while True:
+        batch = request_queue.get()
+        if batch is None:
+            break
+
+        for event in batch:
+            kind = event[0]
+            if kind == 'qr':
+                manager.update_table_qr_status(event[1], event[2])
+            elif kind == 'waiter':
+                manager.waiter_detected(event[1], event[2], event[3])
+            elif kind == 'warnings':
+                manager.check_warnings(event[1])
+            elif kind == 'summary':
+                result_queue.put((zone_name, processed, {
+                    'performance': manager.get_performance_totals(),
+                    'tables': manager.get_table_status_display()
+                }))
+                continue
+            processed += 1
+
+def load_zones(path):
+    """
+    Bölge yapılandırması JSON: {"KAT_1": {"MASA_1": "GARSON_1", ...}, ...}
+    """
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+class ZoneRouter:
+    """Olayları masa ID'sine göre bölge süreçlerine yönlendirir"""
+
+    def __init__(self, zones, batch_size=64, quiet=False):
+        context = mp.get_context('spawn')
+        self.batch_size = batch_size
+        self.result_queue = context.Queue()
+
+        self.table_zone = {}    # MASA_x -> bölge (yapılandırma sırasıyla)
+        self.table_waiter = {}  # MASA_x -> garson
+        self.waiter_zones = {}  # GARSON_x -> [bölgeler]
+        self.waiting_tables = set()  # Koordinatörün son birleştirmesinde garson bekleyen masalar
+        self.stats = {'unrouted_waiters': 0}  # Masası belirsiz, bekleyen masası bilinmeyen garson olayları
+        self.zone_tables = {}   # bölge -> {MASA_x}
+        self.request_queues = {}
+        self.pending = {}
+        self.processes = {}
+
+        for zone_name, assignments in zones.items():
+            waiter_assignments = {}
+            for table_code, waiter_id in assignments.items():
+                if table_code in self.table_zone:
+                    raise ValueError(f"{table_code} birden fazla bölgede tanımlı")
+                self.table_zone[table_code] = zone_name
+                self.table_waiter[table_code] = waiter_id
+                self.waiter_zones.setdefault(waiter_id, [])
+                if zone_name not in self.waiter_zones[waiter_id]:
+                    self.waiter_zones[waiter_id].append(zone_name)
+                waiter_assignments[table_code.replace("MASA_", "table_")] = waiter_id
+
+            self.zone_tables[zone_name] = set(assignments)
+            self.request_queues[zone_name] = context.Queue()
+            self.pending[zone_name] = []
+            self.processes[zone_name] = context.Process(
+                target=_zone_main,
+                args=(zone_name, waiter_assignments, self.request_queues[zone_name], self.result_queue, quiet),
+                name=f'zone-{zone_name}',
+                daemon=True
+            )
+            self.processes[zone_name].start()
+
+        print(f"🗺️ {len(zones)} bölge süreci başlatıldı: "
+              + ", ".join(f"{zone} ({len(tables)} masa)" for zone, tables in self.zone_tables.items()))
+
+    def _send(self, zone_name, event):
+        pending = self.pending[zone_name]
+        pending.append(event)
+        if len(pending) >= self.batch_size:
+            self._flush_zone(zone_name)
+
+    def _flush_zone(self, zone_name):
+        if self.pending[zone_name]:
+            self.request_queues[zone_name].put(self.pending[zone_name])
+            self.pending[zone_name] = []
+
+    def flush(self):
+        """
+        Bekleyen batch'leri hemen gönder
+        """
+        for zone_name in self.pending:
+            self._flush_zone(zone_name)
+
+    def route_qr(self, visible_codes, observed_codes=None):
+        """
+        Görülen masa QR kodlarını (MASA_x) bölgelerine dağıt
+        observed_codes: kameranın gördüğü masalar (verilmezse tüm masalar) - sadece onların bölgelerine gider
+        """
+        observed_codes = self.table_zone.keys() if observed_codes is None else observed_codes
+
+        observed_by_zone = {}
+        for table_code in observed_codes:
+            zone_name = self.table_zone.get(table_code)
+            if zone_name is not None:
+                observed_by_zone.setdefault(zone_name, []).append(table_code.replace("MASA_", "table_"))
+
+        for zone_name, observed_tables in observed_by_zone.items():
+            visible = [code for code in visible_codes if self.table_zone.get(code) == zone_name]
+            self._send(zone_name, ('qr', visible, observed_tables))
+
+    def route_waiter(self, waiter_id, position, table_code=None):
+        """
+        Garson tespitini yönlendir: masa biliniyorsa onun bölgesine (servis o masaya yazılır),
+        yoksa tek bir bölgeye (bölgedeki ilk bekleyen masasına) - bir tespit en fazla bir masaya servis yazar
+        Garson birden fazla bölgedeyse son birleştirmede (ZoneCoordinator.collect) bekleyen ilk masasının
+        bölgesi seçilir (tek süreçteki TableManager gibi atama sırasıyla); bekleyen masası yoksa olay atılır
+        """
+        if table_code in self.table_zone:
+            self._send(self.table_zone[table_code], ('waiter', waiter_id, position, table_code.replace("MASA_", "table_")))
+            return
+
+        zones = self.waiter_zones.get(waiter_id, [])
+        if len(zones) == 1:
+            self._send(zones[0], ('waiter', waiter_id, position, None))
+            return
+
+        for table_code, zone_name in self.table_zone.items():
+            if self.table_waiter[table_code] == waiter_id and table_code in self.waiting_tables:
+                self._send(zone_name, ('waiter', waiter_id, position, None))
+                return
+        self.stats['unrouted_waiters'] += 1
+
+    def route_warning_check(self, warning_threshold=60):
+        for zone_name in self.request_queues:
+            self._send(zone_name, ('warnings', warning_threshold))
+
+    def stop(self, timeout=5.0):
+        """
+        Bekleyenleri gönder ve bölge süreçlerini durdur
+        """
+        self.flush()
+        for zone_name, request_queue in self.request_queues.items():
+            request_queue.put(None)
+        for process in self.processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        print("🗺️ Bölge süreçleri durduruldu")
+
+class ZoneCoordinator:
+    """Bölge özetlerini toplayıp genel garson performansı ve masa listesi üretir"""
+
+    def __init__(self, router):
+        self.router = router
+
+    def collect(self, timeout=30.0):
+        """
+        Tüm bölgelerden (o ana kadar yönlendirilen olayları yansıtan) özet iste ve birleştir
+        """
+        for zone_name in self.router.request_queues:
+            self.router.pending[zone_name].append(('summary',))
+        self.router.flush()
+
+        zone_summaries = {}
+        deadline = time.monotonic() + timeout
+        while len(zone_summaries) < len(self.router.request_queues):
+            try:
+                zone_name, processed, summary = self.router.result_queue.get(
+                    timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                missing = set(self.router.request_queues) - set(zone_summaries)
+                raise TimeoutError(f"Bölge özetleri gelmedi: {sorted(missing)}")
+            zone_summaries[zone_name] = (processed, summary)
+
+        merged = self.merge(zone_summaries)
+        self.router.waiting_tables = {status['table'] for status in merged['tables']
+                                      if status['status'] == TableStatus.WAITING.value}
+        return merged
+
+    @staticmethod
+    def merge(zone_summaries):
+        """
+        {bölge: (işlenen olay, özet)} -> genel özet
+        Garson birden fazla bölgede çalışıyorsa sayaçları toplanır, skor toplamdan hesaplanır
+        """
+        totals = {}
+        tables = []
+        processed_by_zone = {}
+
+        for zone_name, (processed, summary) in zone_summaries.items():
+            processed_by_zone[zone_name] = processed
+            for waiter_id, counts in summary['performance'].items():
+                merged = totals.setdefault(waiter_id, {"total_responses": 0, "total_response_time": 0.0, "warnings": 0})
+                for key in merged:
+                    merged[key] += counts[key]
+            for status in summary['tables']:
+                tables.append(dict(status, zone=zone_name))
+
+        return {
+            'performance': TableManager.summarize_performance(totals),
+            'tables': tables,
+            'processed_events': processed_by_zone
+        }
+
+# Test fonksiyonu
+def benchmark_zone_sharding(floors=3, tables_per_floor=8, waiters_per_floor=2, events=30000, max_zones=None):
+    """
+    Aynı olay akışını 1..max_zones bölgeye bölünmüş durumda işle, olay/saniye ölç
+    Her kat bir kamera: kendi masalarının QR görünürlüğünü ve garsonlarını gönderir
+    Bölünme sonucu değiştirmemeli: birleşik servis sayıları ve masa durumları her bölge sayısında aynı olmalı
+    """
+    rng = random.Random(0)
+    floor_tables = [[f"MASA_{floor * tables_per_floor + i + 1}" for i in range(tables_per_floor)]
+                    for floor in range(floors)]
+    assignments = {}
+    for floor, tables in enumerate(floor_tables):
+        for i, table_code in enumerate(tables):
+            assignments[table_code] = f"GARSON_{floor * waiters_per_floor + i % waiters_per_floor + 1}"
+
+    # Olay akışı önceden üretilir (her bölge sayısında aynı)
+    stream = []
+    for _ in range(events // 2):
+        floor = rng.randrange(floors)
+        tables = floor_tables[floor]
+        stream.append(('qr', [code for code in tables if rng.random() < 0.5], tables))
+        table_code = rng.choice(tables)
+        stream.append(('waiter', assignments[table_code], (100, 100), table_code))
+
+    all_tables = [code for tables in floor_tables for code in tables]
+    print(f"\n📊 Bölge benchmark'ı: {len(all_tables)} masa, {len(stream)} olay, {os.cpu_count()} CPU")
+
+    baseline = None
+    reference = None
+    for zone_count in range(1, (max_zones or floors) + 1):
+        # Masaları kat sırasıyla zone_count eşit parçaya böl
+        zones = {}
+        for index, table_code in enumerate(all_tables):
+            zone_name = f"BOLGE_{index * zone_count // len(all_tables) + 1}"
+            zones.setdefault(zone_name, {})[table_code] = assignments[table_code]
+
+        router = ZoneRouter(zones, quiet=True)
+        coordinator = ZoneCoordinator(router)
+        coordinator.collect()  # Süreçler hazır olsun (spawn maliyetini ölçüme katma)
+
+        start = time.perf_counter()
+        for event in stream:
+            if event[0] == 'qr':
+                router.route_qr(event[1], event[2])
+            else:
+                router.route_waiter(event[1], event[2], event[3])
+        summary = coordinator.collect()
+        elapsed = time.perf_counter() - start
+        router.stop()
+
+        throughput = len(stream) / elapsed
+        baseline = baseline or throughput
+        services = sum(perf['total_services'] for perf in summary['performance'].values())
+        print(f"   bölge={zone_count}: {throughput:8.0f} olay/s (x{throughput / baseline:.2f}), "
+              f"{services} servis, bölge başı olay {summary['processed_events']}")
+
+        # Yanıt süreleri duvar saatine bağlı; sayaçlar ve masa durumları bölünmeden bağımsız olmalı
+        outcome = ({waiter_id: perf['total_services'] for waiter_id, perf in summary['performance'].items()},
+                   sorted((status['table'], status['status'], status['customer_count']) for status in summary['tables']))
+        reference = reference or outcome
+        assert outcome == reference, f"bölge={zone_count} birleşik özeti tek bölgeden farklı"
+
+def check_tableless_waiter_parity(floors=3, tables_per_floor=8, waiters_per_floor=2, events=3000, max_zones=None):
+    """
+    Masa kodu olmayan garson olayları: bölgelere bölünmüş sonuç tek süreçteki TableManager ile aynı olmalı
+    (garson bölge sınırında iki bölgeye yayılsa da bir tespit tek masaya servis yazar)
+    Her masasız olaydan önce özet toplanır - yönlendirme güncel bekleyen masalara göre yapılır
+    """
+    rng = random.Random(1)
+    all_tables = [f"MASA_{i + 1}" for i in range(floors * tables_per_floor)]
+    assignments = {table_code: f"GARSON_{index // tables_per_floor * waiters_per_floor + index % waiters_per_floor + 1}"
+                   for index, table_code in enumerate(all_tables)}
+
+    stream = []
+    for _ in range(events // 2):
+        tables = all_tables[rng.randrange(floors) * tables_per_floor:][:tables_per_floor]
+        stream.append(('qr', [code for code in tables if rng.random() < 0.5], tables))
+        waiter_id = assignments[rng.choice(tables)]
+        stream.append(('waiter', waiter_id, (100, 100), None if rng.random() < 0.5 else rng.choice(
+            [code for code in tables if assignments[code] == waiter_id])))
+
+    # Referans: aynı akış tek süreçte, bölünmemiş TableManager'da (çıktıları bölge süreçleri gibi susturulur)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        reference_manager = TableManager(waiter_assignments={code.replace("MASA_", "table_"): waiter_id
+                                                             for code, waiter_id in assignments.items()})
+        for event in stream:
+            if event[0] == 'qr':
+                reference_manager.update_table_qr_status(event[1], [code.replace("MASA_", "table_") for code in event[2]])
+            else:
+                reference_manager.waiter_detected(event[1], event[2], event[3] and event[3].replace("MASA_", "table_"))
+    reference = ({waiter_id: perf['total_services'] for waiter_id, perf in reference_manager.get_performance_summary().items()},
+                 sorted((status['table'], status['status'], status['customer_count'])
+                        for status in reference_manager.get_table_status_display()))
+
+    for zone_count in range(1, (max_zones or floors) + 1):
+        zones = {}
+        for index, table_code in enumerate(all_tables):
+            zones.setdefault(f"BOLGE_{index * zone_count // len(all_tables) + 1}", {})[table_code] = assignments[table_code]
+
+        router = ZoneRouter(zones, quiet=True)
+        coordinator = ZoneCoordinator(router)
+        coordinator.collect()
+        for event in stream:
+            if event[0] == 'qr':
+                router.route_qr(event[1], event[2])
+            else:
+                if event[3] is None:
+                    coordinator.collect()
+                router.route_waiter(event[1], event[2], event[3])
+        summary = coordinator.collect()
+        router.stop()
+
+        outcome = ({waiter_id: perf['total_services'] for waiter_id, perf in summary['performance'].items()},
+                   sorted((status['table'], status['status'], status['customer_count']) for status in summary['tables']))
+        assert outcome == reference, f"bölge={zone_count} masasız garson olaylarında tek süreçten farklı"
+        print(f"   ✅ bölge={zone_count}: masasız garson olayları tek süreçle aynı "
+              f"({sum(reference[0].values())} servis, yönlendirilemeyen {router.stats['unrouted_waiters']})")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Bölgelere bölünmüş masa durumu benchmark'ı")
+    parser.add_argument("--floors", type=int, default=3)
+    parser.add_argument("--tables-per-floor", type=int, default=8)
+    parser.add_argument("--events", type=int, default=30000)
+    parser.add_argument("--max-zones", type=int, help="Denenecek en fazla bölge sayısı (varsayılan: kat sayısı)")
+    args = parser.parse_args()
+
+    benchmark_zone_sharding(args.floors, args.tables_per_floor, events=args.events, max_zones=args.max_zones)
+    check_tableless_waiter_parity(args.floors, args.tables_per_floor, max_zones=args.max_zones)